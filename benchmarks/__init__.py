@@ -0,0 +1,14 @@
+"""
+Offline benchmarks for the core commerce flows.
+
+The benchmarks run against the test settings, with the LMS, course catalog, CyberSource and PayPal
+replaced by local stand-ins, so that they measure this service in isolation. Run them with:
+
+    make benchmark
+
+The timings and query counts of each benchmark are written, as JSON, to the file named by the
+BENCHMARK_RESULTS environment variable (benchmarks/results.json by default). Results recorded for
+two commits can be compared with:
+
+    python -m benchmarks.compare base.json head.json
+"""
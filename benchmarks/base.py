@@ -0,0 +1,85 @@
+""" Harness used to time benchmarks, and record their results. """
+from __future__ import unicode_literals
+
+import json
+import os
+import subprocess
+
+from ecommerce.core import performance
+
+ITERATIONS = int(os.environ.get('BENCHMARK_ITERATIONS', 10))
+RESULTS_PATH = os.environ.get('BENCHMARK_RESULTS', os.path.join(os.path.dirname(__file__), 'results.json'))
+
+# Results of the benchmarks run by this process, keyed by benchmark name.
+_results = {}
+
+
+def get_commit():
+    """ Returns the commit being benchmarked, or None if it cannot be determined. """
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD']).strip().decode('utf-8')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def record_result(name, runs):
+    """
+    Summarizes the metrics collected by each run of a benchmark, and writes the results of every
+    benchmark run by this process to RESULTS_PATH.
+
+    Arguments:
+        name (str): Name of the benchmark.
+        runs (list): RequestMetrics collected by each timed run.
+    """
+    durations = [metrics.duration for metrics in runs]
+    _results[name] = {
+        'iterations': len(runs),
+        'min': round(min(durations), 6),
+        'median': round(median(durations), 6),
+        'max': round(max(durations), 6),
+        # Counts are the maximum of all runs, so that work done by only some of the runs is still reported.
+        'queries': max(metrics.queries for metrics in runs),
+        'duplicate_queries': max(metrics.duplicate_queries for metrics in runs),
+        'http_calls': max(metrics.http_calls for metrics in runs),
+    }
+
+    with open(RESULTS_PATH, 'w') as f:
+        json.dump({'commit': get_commit(), 'benchmarks': _results}, f, indent=2, sort_keys=True)
+
+
+class BenchmarkMixin(object):
+    """ Mixin for test cases that time code, and record the results. """
+
+    def benchmark(self, name, operation, setup=None, iterations=ITERATIONS):
+        """
+        Runs the operation once to warm caches, then times it over the given number of iterations.
+
+        Arguments:
+            name (str): Name under which the results are recorded. Names must be unique across benchmarks.
+            operation (callable): Code to time. It is passed the value returned by setup, if any.
+            setup (callable): Prepares the data used by a single run of the operation. It is not timed.
+            iterations (int): Number of timed runs.
+
+        Returns:
+            list: RequestMetrics collected by each timed run.
+        """
+        runs = []
+        for iteration in range(iterations + 1):
+            data = setup() if setup else None
+            with performance.instrument() as metrics:
+                operation(data)
+
+            # The first run is a warm-up.
+            if iteration:
+                runs.append(metrics)
+
+        record_result(name, runs)
+        return runs
@@ -0,0 +1,75 @@
+"""
+Compares the benchmark results recorded for two commits.
+
+    python -m benchmarks.compare base.json head.json [--threshold 0.1]
+
+Exits with a non-zero status if any benchmark present in both files makes more queries or HTTP
+calls, or if its median time increased by more than the threshold.
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import json
+import sys
+
+ROW_FORMAT = '{name:<50} {base:>10} {head:>10} {change:>9} {queries:>12} {http_calls:>10}'
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)['benchmarks']
+
+
+def compare(base, head, threshold):
+    """
+    Prints a comparison of each benchmark.
+
+    Returns:
+        list: Names of the benchmarks that regressed.
+    """
+    regressions = []
+    print(ROW_FORMAT.format(
+        name='Benchmark', base='Base (s)', head='Head (s)', change='Change', queries='Queries', http_calls='HTTP'
+    ))
+
+    for name in sorted(set(base) | set(head)):
+        if name not in base or name not in head:
+            print('{name:<50} only in {which}'.format(name=name, which='base' if name in base else 'head'))
+            continue
+
+        before, after = base[name], head[name]
+        change = (after['median'] - before['median']) / before['median'] if before['median'] else 0
+        print(ROW_FORMAT.format(
+            name=name,
+            base='{:.4f}'.format(before['median']),
+            head='{:.4f}'.format(after['median']),
+            change='{:+.1%}'.format(change),
+            queries='{} -> {}'.format(before['queries'], after['queries']),
+            http_calls='{} -> {}'.format(before['http_calls'], after['http_calls']),
+        ))
+
+        if (change > threshold or after['queries'] > before['queries'] or
+                after['http_calls'] > before['http_calls']):
+            regressions.append(name)
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the benchmark results recorded for two commits.')
+    parser.add_argument('base', help='Results of the base commit.')
+    parser.add_argument('head', help='Results of the commit being evaluated.')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='Relative increase in median time above which a benchmark is considered to have regressed.'
+    )
+    args = parser.parse_args()
+
+    regressions = compare(load(args.base), load(args.head), args.threshold)
+    if regressions:
+        print('\nRegressed: {}'.format(', '.join(regressions)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+""" Benchmarks of basket creation. """
+from decimal import Decimal
+
+from django.test import override_settings
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from benchmarks.base import BenchmarkMixin
+from ecommerce.extensions.fulfillment.signals import SHIPPING_EVENT_NAME
+from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.tests.mixins import BasketCreationMixin
+from ecommerce.tests.testcases import TransactionTestCase
+
+ShippingEventType = get_model('order', 'ShippingEventType')
+
+
+@override_settings(
+    FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.modules.FakeFulfillmentModule']
+)
+# Why TransactionTestCase? See http://stackoverflow.com/a/23326971.
+class BasketCreateViewBenchmarks(BenchmarkMixin, BasketCreationMixin, TransactionTestCase):
+    PRODUCT_COUNT = 5
+
+    def setUp(self):
+        super(BasketCreateViewBenchmarks, self).setUp()
+        ShippingEventType.objects.get_or_create(name=SHIPPING_EVENT_NAME)
+
+        self.paid_skus = []
+        for index in range(self.PRODUCT_COUNT):
+            sku = 'PAID-{}'.format(index)
+            factories.ProductFactory(
+                structure='child',
+                parent=self.base_product,
+                stockrecords__partner_sku=sku,
+                stockrecords__price_excl_tax=Decimal('100.00'),
+            )
+            self.paid_skus.append(sku)
+
+    def benchmark_basket_creation(self, name, skus, checkout=None, payment_processor_name=None):
+        def create_basket(_):
+            response = self.create_basket(
+                skus=skus, checkout=checkout, payment_processor_name=payment_processor_name
+            )
+            self.assertEqual(response.status_code, 200)
+
+        runs = self.benchmark(name, create_basket)
+
+        # Guards against metrics that silently stop counting the queries made by the test client.
+        for metrics in runs:
+            self.assertGreater(metrics.queries, 0)
+
+    def test_single_product(self):
+        self.benchmark_basket_creation('basket_create.single_product', self.paid_skus[:1])
+
+    def test_multiple_products(self):
+        self.benchmark_basket_creation('basket_create.multiple_products', self.paid_skus)
+
+    def test_paid_checkout(self):
+        """ Covers the creation of the CyberSource payment form data. """
+        self.benchmark_basket_creation(
+            'basket_create.paid_checkout', self.paid_skus, checkout=True, payment_processor_name=Cybersource.NAME
+        )
+
+    def test_free_checkout(self):
+        """ Covers the placement and fulfillment of the free order. """
+        self.benchmark_basket_creation('basket_create.free_checkout', [self.FREE_SKU], checkout=True)
@@ -0,0 +1,102 @@
+""" Benchmarks of order placement, for paid and free baskets. """
+from __future__ import unicode_literals
+
+from django.core.urlresolvers import reverse
+from django.test.client import RequestFactory
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from benchmarks.base import BenchmarkMixin
+from ecommerce.core.tests.patched_httpretty import httpretty
+from ecommerce.extensions.payment.processors.cybersource import Cybersource
+from ecommerce.extensions.payment.processors.paypal import Paypal
+from ecommerce.extensions.payment.tests.mixins import CybersourceMixin, PaypalMixin
+from ecommerce.tests.testcases import TestCase
+
+Order = get_model('order', 'Order')
+PaymentProcessorResponse = get_model('payment', 'PaymentProcessorResponse')
+
+PRODUCT_COUNT = 3
+
+
+def create_frozen_basket(site, owner, price=100):
+    basket = factories.create_basket(empty=True)
+    basket.owner = owner
+    basket.site = site
+    for __ in range(PRODUCT_COUNT):
+        basket.add_product(factories.create_product(price=price), 1)
+    basket.freeze()
+    return basket
+
+
+class CybersourceCheckoutBenchmarks(BenchmarkMixin, CybersourceMixin, TestCase):
+    def setUp(self):
+        super(CybersourceCheckoutBenchmarks, self).setUp()
+        self.user = factories.UserFactory()
+        self.billing_address = self.make_billing_address()
+        self.processor = Cybersource(self.site)
+
+    def test_accepted_notification(self):
+        """ Covers the recording of the payment, and the placement and fulfillment of the order. """
+        def setup():
+            basket = create_frozen_basket(self.site, self.user)
+            return basket, self.generate_notification(basket, billing_address=self.billing_address)
+
+        def notify(data):
+            basket, notification = data
+            response = self.client.post(reverse('cybersource_notify'), notification)
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(Order.objects.filter(number=basket.order_number).exists())
+
+        self.benchmark('checkout.cybersource_notification', notify, setup=setup)
+
+
+class PaypalCheckoutBenchmarks(BenchmarkMixin, PaypalMixin, TestCase):
+    def setUp(self):
+        super(PaypalCheckoutBenchmarks, self).setUp()
+        self.user = factories.UserFactory()
+        self.processor = Paypal(self.site)
+        self.request = RequestFactory().post('/')
+
+    @httpretty.activate
+    def test_payment_execution(self):
+        """ Covers the execution of the approved payment, and the placement and fulfillment of the order. """
+        self.mock_oauth2_response()
+
+        def setup():
+            # Payments are matched to baskets by the PayPal payment ID, which is the same for all runs.
+            PaymentProcessorResponse.objects.filter(processor_name=self.processor.NAME).delete()
+
+            basket = create_frozen_basket(self.site, self.user)
+            self.mock_payment_creation_response(basket)
+            self.processor.get_transaction_parameters(basket, request=self.request)
+            self.mock_payment_creation_response(basket, find=True)
+            self.mock_payment_execution_response(basket)
+            return basket
+
+        def execute(basket):
+            response = self.client.get(reverse('paypal_execute'), self.RETURN_DATA)
+            self.assertEqual(response.status_code, 302)
+            self.assertTrue(Order.objects.filter(number=basket.order_number).exists())
+
+        self.benchmark('checkout.paypal_execution', execute, setup=setup)
+
+
+class FreeCheckoutBenchmarks(BenchmarkMixin, TestCase):
+    def setUp(self):
+        super(FreeCheckoutBenchmarks, self).setUp()
+        self.user = self.create_user()
+        self.client.login(username=self.user.username, password=self.password)
+
+    @httpretty.activate
+    def test_free_checkout(self):
+        def setup():
+            basket = factories.BasketFactory(owner=self.user, site=self.site)
+            for __ in range(PRODUCT_COUNT):
+                basket.add_product(factories.create_product(price=0), 1)
+
+        def checkout(_):
+            response = self.client.get(reverse('checkout:free-checkout'))
+            self.assertEqual(response.status_code, 302)
+
+        self.benchmark('checkout.free', checkout, setup=setup)
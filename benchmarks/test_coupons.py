@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+""" Benchmarks of coupon creation, reporting and redemption previews. """
+from __future__ import unicode_literals
+
+import datetime
+import itertools
+import json
+
+import httpretty
+from django.core.urlresolvers import reverse
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+from oscar.test.factories import OrderFactory, OrderLineFactory
+
+from benchmarks.base import BenchmarkMixin
+from ecommerce.core.tests.decorators import mock_course_catalog_api_client
+from ecommerce.coupons.tests.mixins import CouponMixin, CourseCatalogMockMixin
+from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
+from ecommerce.extensions.test.factories import prepare_voucher
+from ecommerce.extensions.voucher.utils import generate_coupon_report
+from ecommerce.tests.mixins import LmsApiMockMixin
+from ecommerce.tests.testcases import TestCase
+
+Benefit = get_model('offer', 'Benefit')
+Catalog = get_model('catalogue', 'Catalog')
+CouponVouchers = get_model('voucher', 'CouponVouchers')
+Range = get_model('offer', 'Range')
+StockRecord = get_model('partner', 'StockRecord')
+Voucher = get_model('voucher', 'Voucher')
+
+
+class CouponViewSetBenchmarks(BenchmarkMixin, CouponMixin, CourseCatalogTestMixin, TestCase):
+    VOUCHER_COUNTS = (1, 10, 100)
+
+    def setUp(self):
+        super(CouponViewSetBenchmarks, self).setUp()
+        self.user = self.create_user(is_staff=True)
+        self.client.login(username=self.user.username, password=self.password)
+
+        __, seat = self.create_course_and_seat(price=100, partner=self.partner)
+        self.stock_record_ids = [seat.stockrecords.first().id]
+        self.titles = ('Coupon {}'.format(index) for index in itertools.count())
+
+    def test_create(self):
+        for quantity in self.VOUCHER_COUNTS:
+            def create(_, quantity=quantity):
+                data = {
+                    'benefit_type': Benefit.PERCENTAGE,
+                    'benefit_value': 100,
+                    'category': {'name': self.category.name},
+                    'client': 'Client',
+                    'code': '',
+                    'end_datetime': str(now() + datetime.timedelta(days=10)),
+                    'price': 100,
+                    'quantity': quantity,
+                    'start_datetime': str(now() - datetime.timedelta(days=10)),
+                    'stock_record_ids': self.stock_record_ids,
+                    'title': next(self.titles),
+                    'voucher_type': Voucher.SINGLE_USE,
+                }
+                response = self.client.post(reverse('api:v2:coupons-list'), json.dumps(data), 'application/json')
+                self.assertEqual(response.status_code, 200)
+
+            self.benchmark('coupon_create.{}_vouchers'.format(quantity), create)
+
+
+class CouponReportBenchmarks(BenchmarkMixin, CouponMixin, CourseCatalogTestMixin, LmsApiMockMixin, TestCase):
+    VOUCHER_COUNT = 100
+    REDEEMED_COUNT = 10
+
+    def setUp(self):
+        super(CouponReportBenchmarks, self).setUp()
+        self.user = self.create_user(is_staff=True)
+
+        self.course, seat = self.create_course_and_seat(price=100, partner=self.partner)
+        catalog = Catalog.objects.create(partner=self.partner)
+        catalog.stock_records.add(StockRecord.objects.get(product=seat))
+
+        coupon = self.create_coupon(catalog=catalog, partner=self.partner, quantity=self.VOUCHER_COUNT)
+        coupon.history.all().update(history_user=self.user)
+        self.coupon_vouchers = CouponVouchers.objects.filter(coupon=coupon)
+
+        for voucher in self.coupon_vouchers.first().vouchers.all()[:self.REDEEMED_COUNT]:
+            order = OrderFactory(user=self.create_user())
+            order.lines.add(OrderLineFactory(product=seat))
+            voucher.record_usage(order, order.user)
+
+    @httpretty.activate
+    def test_generate_coupon_report(self):
+        self.mock_course_api_response(course=self.course)
+
+        def generate(_):
+            __, rows = generate_coupon_report(self.coupon_vouchers)
+            self.assertEqual(len(rows), self.VOUCHER_COUNT)
+
+        self.benchmark('coupon_report.{}_vouchers'.format(self.VOUCHER_COUNT), generate)
+
+
+class VoucherOffersBenchmarks(BenchmarkMixin, CourseCatalogMockMixin, CourseCatalogTestMixin, TestCase):
+    COURSE_COUNT = 6
+
+    def setUp(self):
+        super(VoucherOffersBenchmarks, self).setUp()
+        self.user = self.create_user(is_staff=True)
+        self.client.login(username=self.user.username, password=self.password)
+
+    @httpretty.activate
+    @mock_course_catalog_api_client
+    def test_offers(self):
+        course_run_info = {'count': self.COURSE_COUNT, 'next': None, 'results': []}
+        voucher_range, __ = Range.objects.get_or_create(catalog_query='*:*', course_seat_types='verified')
+        for __ in range(self.COURSE_COUNT):
+            course, seat = self.create_course_and_seat(partner=self.partner)
+            course_run_info['results'].append({
+                'image': {'src': 'path/to/the/course/image'},
+                'key': course.id,
+                'start': '2016-05-01T00:00:00Z',
+                'title': course.name,
+                'enrollment_end': None,
+            })
+            voucher_range.add_product(seat)
+
+        self.mock_dynamic_catalog_course_runs_api(query='*:*', course_run_info=course_run_info)
+        voucher, __ = prepare_voucher(_range=voucher_range)
+        path = '{}offers/?code={}'.format(reverse('api:v2:vouchers-list'), voucher.code)
+
+        def get_offers(_):
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(json.loads(response.content)['results']), self.COURSE_COUNT)
+
+        self.benchmark('voucher_offers.{}_courses'.format(self.COURSE_COUNT), get_offers)
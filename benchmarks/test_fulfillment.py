@@ -0,0 +1,43 @@
+""" Benchmarks of order fulfillment. """
+from __future__ import unicode_literals
+
+import httpretty
+from oscar.test import factories
+from oscar.test.newfactories import BasketFactory
+
+from benchmarks.base import BenchmarkMixin
+from ecommerce.core.url_utils import get_lms_enrollment_api_url
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.fulfillment.api import fulfill_order
+from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.tests.testcases import TestCase
+
+JSON = 'application/json'
+
+
+class FulfillOrderBenchmarks(BenchmarkMixin, TestCase):
+    SEAT_COUNT = 5
+
+    def setUp(self):
+        super(FulfillOrderBenchmarks, self).setUp()
+        self.user = self.create_user()
+        self.seats = [
+            CourseFactory().create_or_update_seat('verified', True, 100, self.partner) for __ in range(self.SEAT_COUNT)
+        ]
+
+    @httpretty.activate
+    def test_enrollment_fulfillment(self):
+        """ Covers the enrollment of the user in each course, by the LMS stand-in. """
+        httpretty.register_uri(httpretty.POST, get_lms_enrollment_api_url(), status=200, body='{}', content_type=JSON)
+
+        def setup():
+            basket = BasketFactory(owner=self.user, site=self.site)
+            for seat in self.seats:
+                basket.add_product(seat, 1)
+            return factories.create_order(basket=basket, user=self.user, status=ORDER.OPEN)
+
+        def fulfill(order):
+            fulfill_order(order, order.lines)
+            self.assertEqual(order.status, ORDER.COMPLETE)
+
+        self.benchmark('fulfill_order.enrollments', fulfill, setup=setup)
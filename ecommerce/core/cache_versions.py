@@ -0,0 +1,73 @@
+"""
+Versions, shared by all processes through the cache, of the data that each process holds in memory.
+
+A process records the version of the data it loads, and loads the data again once the shared version has
+changed. Bumping a version therefore signals every process that its copy of the data is stale.
+"""
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import connection
+from django.dispatch import receiver
+
+# Versions to bump again once the request being processed by this thread has finished.
+_pending = threading.local()
+
+
+def get_version(key):
+    """
+    Returns the version stored under the given cache key.
+
+    A version that is missing, for example because it has been evicted, is replaced rather than treated
+    as unchanged.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(keys):
+    """ Returns a dict mapping each of the given cache keys to the version stored under it. """
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            versions[key] = get_version(key)
+    return versions
+
+
+def bump_version(key):
+    """ Signals all processes that the data versioned by the given cache key is stale. """
+    cache.set(key, uuid.uuid4().hex, None)
+
+
+def bump_on_commit(key):
+    """
+    Bumps the given version, and bumps it again once the current transaction, if any, has been committed.
+
+    Other processes may reload the old data before the transaction is committed. Django 1.8 has no hook
+    for the commit itself, so the second bump is made when the request, whose transaction has been committed
+    by then, has finished. request_finished is not sent outside of requests: Celery tasks and management
+    commands that modify versioned data within a transaction must call bump_version after committing.
+    """
+    bump_version(key)
+
+    if connection.in_atomic_block:
+        if not hasattr(_pending, 'keys'):
+            _pending.keys = set()
+        _pending.keys.add(key)
+
+
+@receiver(request_finished, dispatch_uid='core.bump_pending_versions')
+def bump_pending_versions(**kwargs):  # pylint: disable=unused-argument
+    """ Bumps the versions of the data modified within the transaction of the request that has just finished. """
+    keys = getattr(_pending, 'keys', None)
+    if not keys:
+        return
+
+    del _pending.keys
+    for key in keys:
+        bump_version(key)
@@ -17,6 +17,10 @@ ENROLLMENT_CODE_PRODUCT_CLASS_NAME = 'Enrollment Code'
 ENROLLMENT_CODE_SWITCH = 'create_enrollment_codes'
 ENROLLMENT_CODE_SEAT_TYPES = ['verified', 'professional', 'no-id-professional']
 
+# Cache key holding the version of the Site and SiteConfiguration data. Processes compare it to the version of the
+# data they hold in memory in order to detect changes made by other processes.
+SITE_CONFIGURATION_VERSION_CACHE_KEY = 'site_configuration_version'
+
 # Course Catalog constants
 DEFAULT_CATALOG_PAGE_SIZE = 100
 
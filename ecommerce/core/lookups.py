@@ -0,0 +1,21 @@
+from django.db.models import CharField, Lookup
+
+# Upper bound of the range of strings starting with a given prefix.
+PREFIX_RANGE_END = u'\uffff'
+
+
+@CharField.register_lookup
+class Prefix(Lookup):
+    """
+    Matches strings starting with the given value.
+
+    Unlike startswith, which is performed with LIKE (LIKE BINARY on MySQL), this lookup is performed
+    as a range comparison, which can be satisfied by an index scan on every database backend.
+    """
+    lookup_name = 'prefix'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        params = lhs_params + rhs_params + lhs_params + [rhs_params[0] + PREFIX_RANGE_END]
+        return '({lhs} >= {rhs} AND {lhs} < {rhs})'.format(lhs=lhs, rhs=rhs), params
@@ -0,0 +1,85 @@
+""" Reports the time taken by a fresh process to import its modules and serve its first request. """
+
+from __future__ import unicode_literals
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Profile the startup of a new process, reporting the import time of each module.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path',
+                            action='store',
+                            dest='path',
+                            default='/health/',
+                            help='Path of the first request served by the new process.')
+        parser.add_argument('--host',
+                            action='store',
+                            dest='host',
+                            default='localhost',
+                            help='Host header of the first request served by the new process.')
+        parser.add_argument('--limit',
+                            action='store',
+                            dest='limit',
+                            type=int,
+                            default=25,
+                            help='Number of modules and packages to report.')
+        parser.add_argument('--json',
+                            action='store_true',
+                            dest='json',
+                            default=False,
+                            help='Output the full profile as JSON.')
+
+    def handle(self, *args, **options):
+        profile = self.run_profile(options['path'], options['host'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(profile, indent=2, sort_keys=True))
+            return
+
+        limit = options['limit']
+        self_times = profile['imports']['self']
+        package_times = defaultdict(float)
+        for name, elapsed in self_times.items():
+            package_times[name.split('.')[0]] += elapsed
+
+        self.write_times('Slowest packages (self time of all modules)', package_times, limit)
+        self.write_times('Slowest modules (including the modules they import)', profile['imports']['inclusive'],
+                         limit)
+
+        self.stdout.write('Imports:        {:8.3f}s'.format(sum(self_times.values())))
+        self.stdout.write('Django setup:   {:8.3f}s'.format(profile['setup']))
+        self.stdout.write('First request:  {:8.3f}s (status {})'.format(profile['first_request'],
+                                                                       profile['status_code']))
+        self.stdout.write('Total:          {:8.3f}s'.format(profile['total']))
+
+    def run_profile(self, path, host):
+        """ Profiles the startup of a new interpreter, using the settings of this process. """
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        fd, output_path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+
+        try:
+            subprocess.check_call(
+                [sys.executable, '-m', 'ecommerce.core.startup_profile', output_path, path, host], env=env
+            )
+            with open(output_path) as f:
+                return json.load(f)
+        except subprocess.CalledProcessError:
+            raise CommandError('Failed to profile the startup of a new process.')
+        finally:
+            os.remove(output_path)
+
+    def write_times(self, title, times, limit):
+        self.stdout.write(title)
+        for name, elapsed in sorted(times.items(), key=lambda item: item[1], reverse=True)[:limit]:
+            self.stdout.write('  {:8.3f}s  {}'.format(elapsed, name))
+        self.stdout.write('')
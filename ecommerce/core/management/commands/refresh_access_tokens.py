@@ -0,0 +1,45 @@
+""" Refreshes the OAuth access tokens of all sites before they expire. """
+
+from __future__ import unicode_literals
+import logging
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from ecommerce.core.models import SiteConfiguration
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Refresh the access tokens of all sites that are missing or due to expire.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force',
+                            action='store_true',
+                            dest='force',
+                            default=False,
+                            help='Refresh all access tokens, including those that are not due to expire.')
+
+    def handle(self, *args, **options):
+        force = options['force']
+        # Refresh tokens that would otherwise expire before this command next runs, which is expected
+        # to happen well within the refresh margin.
+        threshold = time.time() + settings.OAUTH2_ACCESS_TOKEN_REFRESH_MARGIN * 2
+        failed = 0
+
+        for site_configuration in SiteConfiguration.objects.select_related('site'):
+            expires_at = site_configuration.access_token_expires_at
+            if not force and expires_at and expires_at > threshold:
+                continue
+
+            try:
+                site_configuration.refresh_access_token()
+                logger.info('Refreshed the access token for site [%s].', site_configuration.site.domain)
+            except Exception:  # pylint: disable=broad-except
+                failed += 1
+                logger.exception('Failed to refresh the access token for site [%s].', site_configuration.site.domain)
+
+        if failed:
+            raise CommandError('Failed to refresh [{}] access tokens.'.format(failed))
@@ -0,0 +1,120 @@
+"""
+Middleware for the core app.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+
+from ecommerce.core import performance, routers
+from ecommerce.core.constants import SITE_CONFIGURATION_VERSION_CACHE_KEY
+from ecommerce.extensions.analytics.utils import audit_log
+
+# Version of the site data cached by this process, and the time it was last compared to the shared version.
+_site_cache_state = {
+    'version': None,
+    'checked_at': 0,
+}
+
+
+def refresh_site_cache():
+    """
+    Clears the sites cached by this process if any process has modified a Site or SiteConfiguration.
+
+    Sites, along with their site configurations and the values derived from them, are held in memory for
+    the life of the process. The shared version is read at most once per SITE_CONFIGURATION_CACHE_CHECK_INTERVAL.
+    """
+    now = time.time()
+    if now - _site_cache_state['checked_at'] < settings.SITE_CONFIGURATION_CACHE_CHECK_INTERVAL:
+        return
+
+    _site_cache_state['checked_at'] = now
+    version = cache.get(SITE_CONFIGURATION_VERSION_CACHE_KEY)
+    if version != _site_cache_state['version']:
+        Site.objects.clear_cache()
+        _site_cache_state['version'] = version
+
+
+class SiteConfigurationCacheMiddleware(object):
+    """
+    Middleware that discards stale sites and site configurations cached by this process.
+
+    Note:
+        This middleware MUST be added before "django_sites_extensions.middleware.CurrentSiteWithDefaultMiddleware".
+    """
+
+    def process_request(self, request):  # pylint: disable=unused-argument
+        refresh_site_cache()
+
+
+class PerformanceInstrumentationMiddleware(object):
+    """
+    Middleware that measures the queries, outbound HTTP requests and cache lookups made to serve each request.
+
+    The metrics of each request are logged. They are also returned in X-Perf-* response headers if
+    PERFORMANCE_INSTRUMENTATION_HEADERS is set, which should only be the case in development and staging.
+
+    Note:
+        This middleware SHOULD be added first, so that the work done by all other middleware is measured.
+    """
+
+    def __init__(self):
+        if not settings.PERFORMANCE_INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+
+        performance.install_hooks()
+
+    def process_request(self, request):
+        request.performance_metrics = performance.start_instrumentation()
+
+    def process_response(self, request, response):
+        metrics = getattr(request, 'performance_metrics', None)
+        # Requests short-circuited by an earlier middleware's process_request are not instrumented.
+        if metrics is None:
+            return response
+
+        performance.stop_instrumentation(metrics)
+        data = metrics.as_dict()
+        audit_log(
+            'request_metrics',
+            method=request.method,
+            path=request.path,
+            status_code=response.status_code,
+            **data
+        )
+
+        if settings.PERFORMANCE_INSTRUMENTATION_HEADERS:
+            for name, value in data.items():
+                response['X-Perf-{}'.format(name.replace('_', '-').title())] = value
+
+        return response
+
+
+class ReadReplicaMiddleware(object):
+    """
+    Middleware that keeps the reads of users on the default database for a short time after they write.
+
+    Requests that write set a cookie, which expires after READ_REPLICA_PIN_TIMEOUT seconds. Requests carrying
+    it never read from a replica, so users are not served stale copies of their own writes.
+
+    Note:
+        This middleware MUST appear before SessionMiddleware, so that the session saved once a view has
+        returned is detected as a write.
+    """
+
+    def __init__(self):
+        if not settings.READ_REPLICAS:
+            raise MiddlewareNotUsed
+
+    def process_request(self, request):
+        routers.start_request(pinned=settings.READ_REPLICA_PIN_COOKIE_NAME in request.COOKIES)
+
+    def process_response(self, request, response):  # pylint: disable=unused-argument
+        if routers.finish_request():
+            response.set_cookie(
+                settings.READ_REPLICA_PIN_COOKIE_NAME, '1', max_age=settings.READ_REPLICA_PIN_TIMEOUT, httponly=True
+            )
+
+        return response
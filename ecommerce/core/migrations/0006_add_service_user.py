@@ -2,24 +2,23 @@
 from __future__ import unicode_literals
 
 from django.conf import settings
-from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.db import models, migrations
 
 
-User = get_user_model()
-
-
 class Migration(migrations.Migration):
 
     def add_service_user(apps, schema_editor):
-        service_user = User.objects.create(
+        # The historical model is used, since fields added to User later do not exist yet.
+        User = apps.get_model('core', 'User')
+        User.objects.create(
             username=settings.ECOMMERCE_SERVICE_WORKER_USERNAME,
-            is_superuser=True
+            is_superuser=True,
+            password=make_password(None)
         )
-        service_user.set_unusable_password()
-        service_user.save()
 
     def remove_service_user(apps, schema_editor):
+        User = apps.get_model('core', 'User')
         User.objects.get(username=settings.ECOMMERCE_SERVICE_WORKER_USERNAME).delete()
 
     dependencies = [
@@ -2,15 +2,10 @@
 from __future__ import unicode_literals
 
 from django.conf import settings
-from django.contrib.auth import get_user_model
 from django.contrib.auth.management import create_permissions
-from django.contrib.auth.models import Permission
 from django.db import migrations
 
 
-User = get_user_model()
-
-
 class Migration(migrations.Migration):
 
     def alter_service_user_privileges(apps, schema_editor):
@@ -22,6 +17,9 @@ class Migration(migrations.Migration):
         create_permissions(apps, verbosity=0)
         apps.models_module = None
 
+        # The historical models are used, since fields added to User later do not exist yet.
+        User = apps.get_model('core', 'User')
+        Permission = apps.get_model('auth', 'Permission')
         service_user = User.objects.get(username=settings.ECOMMERCE_SERVICE_WORKER_USERNAME)
 
         # The ecommerce worker service user should have permissions to fulfill orders,
@@ -34,6 +32,8 @@ class Migration(migrations.Migration):
         service_user.save()
 
     def restore_service_user_privileges(apps, schema_editor):
+        User = apps.get_model('core', 'User')
+        Permission = apps.get_model('auth', 'Permission')
         service_user = User.objects.get(username=settings.ECOMMERCE_SERVICE_WORKER_USERNAME)
 
         change_order_permission = Permission.objects.get(codename='change_order')
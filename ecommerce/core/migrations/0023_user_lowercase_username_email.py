@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def populate_lowercase_fields(apps, schema_editor):
+    User = apps.get_model('core', 'User')
+    User.objects.update(username_lower=Lower('username'), email_lower=Lower('email'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_auto_20161108_2101'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='email_lower',
+            field=models.CharField(default=b'', max_length=254, editable=False, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='username_lower',
+            field=models.CharField(default=b'', max_length=30, editable=False, db_index=True),
+        ),
+        migrations.RunPython(populate_lowercase_fields, migrations.RunPython.noop),
+    ]
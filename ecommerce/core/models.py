@@ -1,9 +1,10 @@
 import datetime
 import hashlib
 import logging
+import threading
+import time
 from urlparse import urljoin
 
-from analytics import Client as SegmentClient
 from dateutil.parser import parse
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
@@ -129,6 +130,19 @@ class SiteConfiguration(models.Model):
     class Meta(object):
         unique_together = ('site', 'partner')
 
+    def _memoize(self, key, source, func):
+        """
+        Returns the value computed by func, memoized on this instance for as long as source is unchanged.
+
+        Site configurations are cached in-process along with their sites (see SiteConfigurationCacheMiddleware),
+        so values derived from their fields are only computed once per process.
+        """
+        memo = self.__dict__.setdefault('_memo', {})
+        cached = memo.get(key)
+        if cached is None or cached[0] != source:
+            cached = memo[key] = (source, func())
+        return cached[1]
+
     @property
     def payment_processors_set(self):
         """
@@ -136,7 +150,11 @@ class SiteConfiguration(models.Model):
         Returns:
             set[string]: Returns a set of enabled payment processor keys
         """
-        return {raw_processor_value.strip() for raw_processor_value in self.payment_processors.split(',')}
+        return self._memoize(
+            'payment_processors_set',
+            self.payment_processors,
+            lambda: frozenset(raw_processor_value.strip() for raw_processor_value in self.payment_processors.split(','))
+        )
 
     def _clean_payment_processors(self):
         """
@@ -237,12 +255,10 @@ class SiteConfiguration(models.Model):
 
     @cached_property
     def segment_client(self):
-        return SegmentClient(self.segment_key, debug=settings.DEBUG)
+        # The Segment client is only imported by processes that emit analytics events.
+        from analytics import Client as SegmentClient
 
-    def save(self, *args, **kwargs):
-        # Clear Site cache upon SiteConfiguration changed
-        Site.objects.clear_cache()
-        super(SiteConfiguration, self).save(*args, **kwargs)
+        return SegmentClient(self.segment_key, debug=settings.DEBUG)
 
     def build_ecommerce_url(self, path=''):
         """
@@ -289,6 +305,19 @@ class SiteConfiguration(models.Model):
         """ Returns the URL for the OAuth 2.0 provider. """
         return self.build_lms_url('/oauth2')
 
+    @property
+    def access_token_cache_key(self):
+        # Cached values are (token, expires_at) tuples. The key is versioned, since earlier releases cached
+        # the bare token under 'siteconfiguration_access_token_{id}'.
+        return 'siteconfiguration_access_token_v2_{}'.format(self.id)
+
+    def _get_cached_access_token(self):
+        """ Returns the cached (token, expires_at) tuple, or None if no token is cached in that format. """
+        cached = cache.get(self.access_token_cache_key)
+        if isinstance(cached, tuple) and len(cached) == 2:
+            return cached
+        return None
+
     @property
     def access_token(self):
         """ Returns an access token for this site's service user.
@@ -297,37 +326,88 @@ class SiteConfiguration(models.Model):
         The token is cached for the lifetime of the token, as specified by the OAuth provider's response. The token
         type is JWT.
 
+        Tokens are refreshed before they expire: once a cached token is within OAUTH2_ACCESS_TOKEN_REFRESH_MARGIN of
+        its expiration, it continues to be returned while a background thread fetches its replacement. The token is
+        only fetched in the calling thread if none is cached at all (e.g. because the refresh_access_tokens command
+        has not yet been run for the site).
+
         Returns:
             str: JWT access token
         """
-        key = 'siteconfiguration_access_token_{}'.format(self.id)
-        access_token = cache.get(key)
+        cached = self._get_cached_access_token()
+        if not cached:
+            return self.refresh_access_token()
 
-        # pylint: disable=unsubscriptable-object
-        if not access_token:
-            url = '{root}/access_token'.format(root=self.oauth2_provider_url)
-            access_token, expiration_datetime = EdxRestApiClient.get_oauth_access_token(
-                url,
-                self.oauth_settings['SOCIAL_AUTH_EDX_OIDC_KEY'],
-                self.oauth_settings['SOCIAL_AUTH_EDX_OIDC_SECRET'],
-                token_type='jwt'
-            )
+        access_token, expires_at = cached
+        if expires_at - time.time() < settings.OAUTH2_ACCESS_TOKEN_REFRESH_MARGIN:
+            self.refresh_access_token_async()
 
-            expires = (expiration_datetime - datetime.datetime.utcnow()).seconds
-            cache.set(key, access_token, expires)
+        return access_token
 
+    @property
+    def access_token_expires_at(self):
+        """ Returns the expiration time, as a Unix timestamp, of the cached access token, or None if none is cached. """
+        cached = self._get_cached_access_token()
+        return cached[1] if cached else None
+
+    def refresh_access_token(self):
+        """ Retrieves a new access token from the OAuth provider, and caches it for the lifetime of the token.
+
+        Returns:
+            str: JWT access token
+        """
+        url = '{root}/access_token'.format(root=self.oauth2_provider_url)
+        # pylint: disable=unsubscriptable-object
+        access_token, expiration_datetime = EdxRestApiClient.get_oauth_access_token(
+            url,
+            self.oauth_settings['SOCIAL_AUTH_EDX_OIDC_KEY'],
+            self.oauth_settings['SOCIAL_AUTH_EDX_OIDC_SECRET'],
+            token_type='jwt'
+        )
+
+        expires = (expiration_datetime - datetime.datetime.utcnow()).seconds
+        cache.set(self.access_token_cache_key, (access_token, time.time() + expires), expires)
         return access_token
 
-    @cached_property
+    def refresh_access_token_async(self):
+        """ Refreshes the access token in a background thread, unless another process is already refreshing it.
+
+        Returns:
+            bool: True if a refresh was started; otherwise, False.
+        """
+        lock_key = '{}_refresh'.format(self.access_token_cache_key)
+        if not cache.add(lock_key, True, settings.OAUTH2_ACCESS_TOKEN_REFRESH_LOCK_TIMEOUT):
+            return False
+
+        def refresh():
+            try:
+                self.refresh_access_token()
+            except Exception:  # pylint: disable=broad-except
+                log.exception('Failed to refresh the access token for site [%s].', self.site_id)
+            finally:
+                cache.delete(lock_key)
+
+        thread = threading.Thread(target=refresh, name='refresh-access-token-{}'.format(self.id))
+        thread.daemon = True
+        thread.start()
+        return True
+
+    @property
     def course_catalog_api_client(self):
         """
         Returns an API client to access the Course Catalog service.
 
+        The client is reused until the site's access token is refreshed.
+
         Returns:
             EdxRestApiClient: The client to access the Course Catalog service.
         """
-
-        return EdxRestApiClient(settings.COURSE_CATALOG_API_URL, jwt=self.access_token)
+        access_token = self.access_token
+        return self._memoize(
+            'course_catalog_api_client',
+            (settings.COURSE_CATALOG_API_URL, access_token),
+            lambda: EdxRestApiClient(settings.COURSE_CATALOG_API_URL, jwt=access_token)
+        )
 
 
 class User(AbstractUser):
@@ -337,17 +417,49 @@ class User(AbstractUser):
 
     @property
     def access_token(self):
-        try:
-            return self.social_auth.first().extra_data[u'access_token']  # pylint: disable=no-member
-        except Exception:  # pylint: disable=broad-except
-            return None
+        """ Returns the user's OAuth access token, or None if the user has not authenticated via OAuth.
+
+        The token is memoized on the instance, which lives for the duration of a request.
+        """
+        if '_access_token' not in self.__dict__:
+            try:
+                # pylint: disable=attribute-defined-outside-init,no-member
+                self._access_token = self.social_auth.first().extra_data[u'access_token']
+            except Exception:  # pylint: disable=broad-except
+                return None
+
+        return self._access_token
 
     tracking_context = JSONField(blank=True, null=True)
 
+    # Lowercased copies of the username and email, which allow case-insensitive searches (e.g. those
+    # of the support dashboards) to use an index. These are kept in sync by save().
+    username_lower = models.CharField(max_length=30, db_index=True, editable=False, default='')
+    email_lower = models.CharField(max_length=254, db_index=True, editable=False, default='')
+
     class Meta(object):
         get_latest_by = 'date_joined'
         db_table = 'ecommerce_user'
 
+    def save(self, *args, **kwargs):
+        """ Saves the user, along with the lowercased copies of its username and email.
+
+        Note that bulk updates of usernames or emails bypass this method, and must update the copies themselves.
+        """
+        self.username_lower = (self.username or '').lower()
+        self.email_lower = (self.email or '').lower()
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'username' in update_fields:
+                update_fields.add('username_lower')
+            if 'email' in update_fields:
+                update_fields.add('email_lower')
+            kwargs['update_fields'] = update_fields
+
+        super(User, self).save(*args, **kwargs)
+
     def get_full_name(self):
         return self.full_name or super(User, self).get_full_name()
 
@@ -452,11 +564,18 @@ class User(AbstractUser):
             raise
         return response
 
+    @property
+    def verification_status_cache_key(self):
+        cache_key = 'verification_status_{username}'.format(username=self.username)
+        return hashlib.md5(cache_key).hexdigest()
+
     def is_verified(self, site):
         """
         Check if a user has verified his/her identity.
         Calls the LMS verification status API endpoint and returns the verification status information.
-        The status information is stored in cache, if the user is verified, until the verification expires.
+        The status information is stored in cache for both outcomes. Verified users are cached until the
+        verification expires, for at most VERIFIED_STATUS_CACHE_TIMEOUT, and unverified users for
+        UNVERIFIED_STATUS_CACHE_TIMEOUT.
 
         Args:
             site (Site): The site object from which the LMS account API endpoint is created.
@@ -468,29 +587,40 @@ class User(AbstractUser):
             ConnectionError, SlumberBaseException and Timeout for failures in
             establishing a connection with the LMS verification status API endpoint.
         """
-        try:
-            cache_key = 'verification_status_{username}'.format(username=self.username)
-            cache_key = hashlib.md5(cache_key).hexdigest()
-            verification = cache.get(cache_key)
-            if not verification:
-                api = EdxRestApiClient(
-                    site.siteconfiguration.build_lms_url('api/user/v1/'),
-                    oauth_access_token=self.access_token
-                )
-                response = api.accounts(self.username).verification_status().get()
-
-                verification = response.get('is_verified', False)
-                if verification:
-                    cache_timeout = int((parse(response.get('expiration_datetime')) - now()).total_seconds())
-                    cache.set(cache_key, verification, cache_timeout)
+        verification = cache.get(self.verification_status_cache_key)
+        if verification is not None:
             return verification
+
+        try:
+            api = EdxRestApiClient(
+                site.siteconfiguration.build_lms_url('api/user/v1/'),
+                oauth_access_token=self.access_token
+            )
+            response = api.accounts(self.username).verification_status().get()
         except HttpNotFoundError:
-            return False
+            # The user has never submitted a verification.
+            response = {}
         except (ConnectionError, SlumberBaseException, Timeout):
             msg = 'Failed to retrieve verification status details for [{username}]'.format(username=self.username)
             log.exception(msg)
             raise VerificationStatusError(msg)
 
+        verification = response.get('is_verified', False)
+        cache_timeout = settings.UNVERIFIED_STATUS_CACHE_TIMEOUT
+        if verification:
+            cache_timeout = settings.VERIFIED_STATUS_CACHE_TIMEOUT
+            expiration_datetime = response.get('expiration_datetime')
+            if expiration_datetime:
+                expires_in = int((parse(expiration_datetime) - now()).total_seconds())
+                cache_timeout = max(min(expires_in, cache_timeout), 0)
+
+        cache.set(self.verification_status_cache_key, verification, cache_timeout)
+        return verification
+
+    def clear_verification_status_cache(self):
+        """ Removes the cached verification status, so that it is retrieved from LMS when next checked. """
+        cache.delete(self.verification_status_cache_key)
+
 
 class Client(User):
     pass
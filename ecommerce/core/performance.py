@@ -0,0 +1,204 @@
+"""
+Per-request performance instrumentation.
+
+Metrics are collected for the duration of an instrumented block of code (e.g. a request, when
+PerformanceInstrumentationMiddleware is enabled, or a test asserting a performance budget):
+
+    * the number of SQL queries, how many of them duplicate an earlier query, and the time spent executing them;
+    * the number of outbound HTTP requests (e.g. to the LMS, the course catalog or payment processors), and the
+      time spent waiting for them;
+    * the number of cache hits and misses.
+"""
+from __future__ import unicode_literals
+
+from collections import Counter
+from contextlib import contextmanager
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db.backends.utils import CursorWrapper
+import requests
+
+# Metrics being collected by the current thread. Instrumented blocks may be nested.
+_active = threading.local()
+_hooks_installed = []
+
+
+class RequestMetrics(object):
+    """ Performance metrics collected while a block of code is instrumented. """
+
+    def __init__(self):
+        self.queries = 0
+        self.duplicate_queries = 0
+        self.duplicated_sql = {}
+        self.sql_time = 0.0
+        self.http_calls = 0
+        self.http_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.duration = 0.0
+
+        self._started_at = None
+        # Number of times each statement, with its parameters, has been executed.
+        self._sql = Counter()
+
+    def as_dict(self):
+        """ Returns the metrics, with times in seconds. """
+        return {
+            'queries': self.queries,
+            'duplicate_queries': self.duplicate_queries,
+            'sql_time': round(self.sql_time, 3),
+            'http_calls': self.http_calls,
+            'http_time': round(self.http_time, 3),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'duration': round(self.duration, 3),
+        }
+
+
+def _get_active_metrics():
+    return getattr(_active, 'metrics', [])
+
+
+def start_instrumentation():
+    """
+    Starts collecting metrics for the current thread.
+
+    Returns:
+        RequestMetrics: The metrics, which are complete once passed to stop_instrumentation.
+    """
+    install_hooks()
+
+    metrics = RequestMetrics()
+    _active.metrics = _get_active_metrics() + [metrics]
+    metrics._started_at = time.time()  # pylint: disable=protected-access
+    return metrics
+
+
+def stop_instrumentation(metrics):
+    """ Stops collecting the given metrics, and computes those derived from the queries executed meanwhile. """
+    metrics.duration = time.time() - metrics._started_at  # pylint: disable=protected-access
+    _active.metrics = [active for active in _get_active_metrics() if active is not metrics]
+
+    sql = metrics._sql  # pylint: disable=protected-access
+    metrics.queries = sum(sql.values())
+    metrics.duplicated_sql = dict((statement, count) for statement, count in sql.items() if count > 1)
+    metrics.duplicate_queries = sum(count - 1 for count in metrics.duplicated_sql.values())
+
+
+@contextmanager
+def instrument():
+    """ Collects metrics for the duration of the block, yielding the RequestMetrics. """
+    metrics = start_instrumentation()
+    try:
+        yield metrics
+    finally:
+        stop_instrumentation(metrics)
+
+
+def install_hooks():
+    """
+    Wraps the methods used to execute SQL, make outbound HTTP requests, and read from the caches, so that they
+    are measured.
+
+    Queries are counted as they are executed, rather than read from the query log of each connection, which
+    is bounded, and cleared whenever a request starts.
+
+    Outbound HTTP requests made by the clients used throughout this project (e.g. edx-rest-api-client, suds and
+    the PayPal SDK) are all sent by requests. The hooks are installed once per process, and do nothing while no
+    metrics are being collected.
+    """
+    if _hooks_installed:
+        return
+    _hooks_installed.append(True)
+
+    original_send = requests.Session.send
+
+    def send(self, request, **kwargs):
+        started_at = time.time()
+        try:
+            return original_send(self, request, **kwargs)
+        finally:
+            elapsed = time.time() - started_at
+            for metrics in _get_active_metrics():
+                metrics.http_calls += 1
+                metrics.http_time += elapsed
+
+    requests.Session.send = send
+
+    _wrap_cursor()
+
+    backends = set(type(caches[alias]) for alias in settings.CACHES)
+    for backend in backends:
+        _wrap_cache_backend(backend)
+
+
+def _record_query(sql, params, elapsed):
+    active_metrics = _get_active_metrics()
+    if not active_metrics:
+        # Most queries are made while no metrics are being collected; avoid formatting their parameters.
+        return
+
+    statement = '{sql} {params!r}'.format(sql=sql, params=params) if params else sql
+    for metrics in active_metrics:
+        metrics._sql[statement] += 1  # pylint: disable=protected-access
+        metrics.sql_time += elapsed
+
+
+def _wrap_cursor():
+    # CursorDebugWrapper, used when DEBUG is set, extends CursorWrapper, so queries are measured in either case.
+    original_execute = CursorWrapper.execute
+    original_executemany = CursorWrapper.executemany
+
+    def execute(self, sql, params=None):
+        started_at = time.time()
+        try:
+            return original_execute(self, sql, params)
+        finally:
+            _record_query(sql, params, time.time() - started_at)
+
+    def executemany(self, sql, param_list):
+        started_at = time.time()
+        try:
+            return original_executemany(self, sql, param_list)
+        finally:
+            _record_query(sql, param_list, time.time() - started_at)
+
+    CursorWrapper.execute = execute
+    CursorWrapper.executemany = executemany
+
+
+def _record_cache_lookups(hits, misses):
+    for metrics in _get_active_metrics():
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+def _wrap_cache_backend(backend):
+    original_get = backend.get
+    missing = object()
+
+    def get(self, key, default=None, version=None):
+        value = original_get(self, key, missing, version=version)
+        if value is missing:
+            _record_cache_lookups(0, 1)
+            return default
+
+        _record_cache_lookups(1, 0)
+        return value
+
+    backend.get = get
+
+    # The default implementation of get_many calls get, which is already measured.
+    if backend.get_many != BaseCache.get_many:
+        original_get_many = backend.get_many
+
+        def get_many(self, keys, version=None):
+            values = original_get_many(self, keys, version=version)
+            _record_cache_lookups(len(values), len(keys) - len(values))
+            return values
+
+        backend.get_many = get_many
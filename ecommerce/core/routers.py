@@ -0,0 +1,92 @@
+"""
+Routing of reads to the read replicas of the default database.
+
+Replicas are listed, by database alias, in the READ_REPLICAS setting. Reads are only sent to a replica
+within read_replica(), which wraps the read-only views, reports and commands that declare it. All other
+reads, and every write, use the default database.
+
+Replicas lag behind the default database, so users must be kept from reading stale copies of their own
+writes. Reads stay on the default database after any write made by the same thread. ReadReplicaMiddleware
+extends this to the requests a user makes within READ_REPLICA_PIN_TIMEOUT seconds of a request that wrote.
+"""
+import random
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_state = threading.local()
+
+
+@contextmanager
+def read_replica():
+    """ Sends the reads made within the block to a read replica, unless reads are pinned to the default database. """
+    depth = getattr(_state, 'depth', 0)
+    _state.depth = depth + 1
+    try:
+        yield
+    finally:
+        _state.depth = depth
+
+
+def use_read_replica(func):
+    """ Decorator that sends the reads made by the decorated function to a read replica. """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with read_replica():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def start_request(pinned):
+    """
+    Resets the routing state of this thread for a new request.
+
+    Args:
+        pinned (bool): Whether reads must use the default database, because the user recently wrote.
+    """
+    _state.depth = 0
+    _state.pinned = pinned
+    _state.written = False
+
+
+def finish_request():
+    """
+    Resets the routing state of this thread at the end of a request.
+
+    Returns:
+        bool: True if the request wrote to the database.
+    """
+    written = getattr(_state, 'written', False)
+    start_request(pinned=False)
+    return written
+
+
+class ReadReplicaRouter(object):
+    """ Database router that sends reads made within read_replica() to a randomly chosen read replica. """
+
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        if settings.READ_REPLICAS and getattr(_state, 'depth', 0):
+            if not (getattr(_state, 'pinned', False) or getattr(_state, 'written', False)):
+                return random.choice(settings.READ_REPLICAS)
+
+        # Objects read from a replica would otherwise have their related objects read from it as well.
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):  # pylint: disable=unused-argument
+        _state.written = True
+        # Objects read from a replica would otherwise be saved to it.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        # Replicas hold copies of the same rows as the default database.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):  # pylint: disable=unused-argument
+        # Replicas are migrated by replicating the migrations run on the default database.
+        if db in settings.READ_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,17 @@
+from django.contrib.sites.models import Site
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ecommerce.core.cache_versions import bump_on_commit
+from ecommerce.core.constants import SITE_CONFIGURATION_VERSION_CACHE_KEY
+from ecommerce.core.models import SiteConfiguration
+
+
+@receiver(post_save, sender=Site, dispatch_uid='core.site_saved')
+@receiver(post_delete, sender=Site, dispatch_uid='core.site_deleted')
+@receiver(post_save, sender=SiteConfiguration, dispatch_uid='core.site_configuration_saved')
+@receiver(post_delete, sender=SiteConfiguration, dispatch_uid='core.site_configuration_deleted')
+def invalidate_site_configuration_cache(sender, **kwargs):  # pylint: disable=unused-argument
+    """ Clears the sites cached by this process, and those cached by all other processes. """
+    Site.objects.clear_cache()
+    bump_on_commit(SITE_CONFIGURATION_VERSION_CACHE_KEY)
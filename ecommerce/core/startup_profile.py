@@ -0,0 +1,99 @@
+"""
+Measures the cold start of a process: the time taken to import each module, to set up Django, and to
+serve the first request.
+
+This module is run in a fresh interpreter by the profile_startup management command, since the modules
+loaded by a process that is already running cannot be measured:
+
+    python -m ecommerce.core.startup_profile <output path> <request path> <host>
+
+It is deliberately limited to the standard library until the import hook is installed.
+"""
+import __builtin__
+import json
+import sys
+import time
+
+
+class ImportTimer(object):
+    """
+    Records the time taken to load each module imported while installed.
+
+    The self time of a module excludes the time taken to load the modules it imports, so that the
+    self times of all modules add up to the total time spent importing.
+    """
+
+    def __init__(self):
+        self.inclusive = {}
+        self.self_time = {}
+        self._original_import = None
+        # Time spent loading the modules imported by each import being timed.
+        self._children = [0.0]
+
+    def install(self):
+        self._original_import = __builtin__.__import__
+        __builtin__.__import__ = self._import
+
+    def uninstall(self):
+        __builtin__.__import__ = self._original_import
+
+    def _import(self, name, *args, **kwargs):
+        # Modules that are already loaded, and relative imports that cannot be attributed to a module
+        # name without resolving them, are not timed.
+        if name in sys.modules or not name:
+            return self._original_import(name, *args, **kwargs)
+
+        self._children.append(0.0)
+        started_at = time.time()
+        try:
+            return self._original_import(name, *args, **kwargs)
+        finally:
+            elapsed = time.time() - started_at
+            children = self._children.pop()
+            self._children[-1] += elapsed
+            self.inclusive[name] = self.inclusive.get(name, 0) + elapsed
+            self.self_time[name] = self.self_time.get(name, 0) + elapsed - children
+
+
+def profile(request_path, host):
+    """
+    Sets up Django and serves a single request, timing each step.
+
+    Returns:
+        dict: Import times, in seconds, keyed by module name, and the duration of each step.
+    """
+    started_at = time.time()
+    timer = ImportTimer()
+    timer.install()
+    try:
+        from django.core.wsgi import get_wsgi_application
+        get_wsgi_application()
+        setup_finished_at = time.time()
+
+        from django.test import Client
+        response = Client(HTTP_HOST=host).get(request_path)
+        request_finished_at = time.time()
+    finally:
+        timer.uninstall()
+
+    return {
+        'imports': {
+            'inclusive': timer.inclusive,
+            'self': timer.self_time,
+        },
+        'setup': setup_finished_at - started_at,
+        'first_request': request_finished_at - setup_finished_at,
+        'total': request_finished_at - started_at,
+        'status_code': response.status_code,
+    }
+
+
+def main():
+    output_path, request_path, host = sys.argv[1:4]
+    result = profile(request_path, host)
+    with open(output_path, 'w') as f:
+        json.dump(result, f)
+
+
+if __name__ == '__main__':
+    main()
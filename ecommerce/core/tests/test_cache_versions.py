@@ -0,0 +1,48 @@
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import connection
+
+from ecommerce.core.cache_versions import bump_on_commit, bump_version, get_version, get_versions
+from ecommerce.tests.testcases import TestCase
+
+VERSION_CACHE_KEY = 'test_version'
+OTHER_VERSION_CACHE_KEY = 'other_test_version'
+
+
+class CacheVersionsTests(TestCase):
+    def setUp(self):
+        super(CacheVersionsTests, self).setUp()
+        cache.clear()
+
+    def test_get_version(self):
+        """ Verify a missing version is replaced, and the same version is returned until it is bumped. """
+        version = get_version(VERSION_CACHE_KEY)
+        self.assertIsNotNone(version)
+        self.assertEqual(get_version(VERSION_CACHE_KEY), version)
+
+        bump_version(VERSION_CACHE_KEY)
+        self.assertNotEqual(get_version(VERSION_CACHE_KEY), version)
+
+        cache.delete(VERSION_CACHE_KEY)
+        self.assertIsNotNone(get_version(VERSION_CACHE_KEY))
+
+    def test_get_versions(self):
+        """ Verify the versions of several keys are returned, with missing versions replaced. """
+        version = get_version(VERSION_CACHE_KEY)
+        versions = get_versions([VERSION_CACHE_KEY, OTHER_VERSION_CACHE_KEY])
+        self.assertEqual(versions[VERSION_CACHE_KEY], version)
+        self.assertEqual(versions[OTHER_VERSION_CACHE_KEY], get_version(OTHER_VERSION_CACHE_KEY))
+
+    def test_bump_on_commit(self):
+        """ Verify versions bumped within a transaction are bumped again once the request has finished. """
+        self.assertTrue(connection.in_atomic_block)
+        bump_on_commit(VERSION_CACHE_KEY)
+        version = get_version(VERSION_CACHE_KEY)
+
+        request_finished.send(sender=self.__class__)
+        self.assertNotEqual(get_version(VERSION_CACHE_KEY), version)
+
+        # The version is only bumped again once.
+        version = get_version(VERSION_CACHE_KEY)
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(get_version(VERSION_CACHE_KEY), version)
@@ -1,10 +1,19 @@
 from __future__ import unicode_literals
+import json
+import subprocess
+import time
+from StringIO import StringIO
 
+import httpretty
+import mock
 from ddt import ddt, data
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.management import call_command, CommandError
 from oscar.core.loading import get_model
+from requests.exceptions import ConnectionError
 
+from ecommerce.core.models import SiteConfiguration
 from ecommerce.tests.testcases import TestCase
 
 Partner = get_model('partner', 'Partner')
@@ -159,3 +168,89 @@ class CreateOrUpdateSiteCommandTests(TestCase):
         """ Verify CommandError is raised when required arguments are missing """
         with self.assertRaises(CommandError):
             call_command(self.command_name, *command_args)
+
+
+class RefreshAccessTokensCommandTests(TestCase):
+
+    command_name = 'refresh_access_tokens'
+
+    def setUp(self):
+        super(RefreshAccessTokensCommandTests, self).setUp()
+        self.site_configuration = self.site.siteconfiguration
+        cache.clear()
+
+    @httpretty.activate
+    def test_refresh_missing_token(self):
+        """ Verify the command retrieves tokens for sites that have none cached. """
+        token = self.mock_access_token_response()
+        call_command(self.command_name)
+        self.assertTrue(httpretty.has_request())
+        self.assertEqual(cache.get(self.site_configuration.access_token_cache_key)[0], token)
+
+    @httpretty.activate
+    def test_refresh_expiring_token(self):
+        """ Verify the command only refreshes tokens that are due to expire, unless forced. """
+        token = self.mock_access_token_response()
+        cache.set(self.site_configuration.access_token_cache_key, ('valid', time.time() + 3600), 3600)
+
+        call_command(self.command_name)
+        self.assertFalse(httpretty.has_request())
+
+        call_command(self.command_name, force=True)
+        self.assertEqual(self.site_configuration.access_token, token)
+
+        cache.set(self.site_configuration.access_token_cache_key, ('expiring', time.time() + 60), 60)
+        httpretty.reset()
+        self.mock_access_token_response()
+        call_command(self.command_name)
+        self.assertTrue(httpretty.has_request())
+
+    def test_refresh_failure(self):
+        """ Verify the command reports failures. """
+        with mock.patch.object(SiteConfiguration, 'refresh_access_token', side_effect=ConnectionError):
+            with self.assertRaises(CommandError):
+                call_command(self.command_name)
+
+
+class ProfileStartupCommandTests(TestCase):
+
+    command_name = 'profile_startup'
+    profile = {
+        'imports': {
+            'inclusive': {'oscar': 0.5, 'oscar.apps': 0.25, 'suds.client': 0.125},
+            'self': {'oscar': 0.25, 'oscar.apps': 0.25, 'suds.client': 0.125},
+        },
+        'setup': 1.0,
+        'first_request': 0.5,
+        'total': 1.5,
+        'status_code': 200,
+    }
+
+    def call_command(self, **kwargs):
+        stdout = StringIO()
+        with mock.patch('subprocess.check_call') as mock_check_call:
+            with mock.patch('json.load', return_value=self.profile):
+                call_command(self.command_name, stdout=stdout, **kwargs)
+
+        args = mock_check_call.call_args[0][0]
+        self.assertEqual(args[1:3], ['-m', 'ecommerce.core.startup_profile'])
+        self.assertEqual(args[4:], ['/health/', 'localhost'])
+        return stdout.getvalue()
+
+    def test_report(self):
+        """ Verify the import times are reported per package and module, along with the time to first request. """
+        output = self.call_command(limit=1)
+        self.assertIn('   0.500s  oscar\n', output)
+        self.assertNotIn('suds', output)
+        self.assertIn('First request:     0.500s (status 200)', output)
+        self.assertIn('Total:             1.500s', output)
+
+    def test_json(self):
+        """ Verify the full profile can be output as JSON. """
+        self.assertEqual(json.loads(self.call_command(json=True)), self.profile)
+
+    def test_failure(self):
+        """ Verify the command reports failures of the profiled process. """
+        with mock.patch('subprocess.check_call', side_effect=subprocess.CalledProcessError(1, 'python')):
+            with self.assertRaises(CommandError):
+                call_command(self.command_name)
@@ -0,0 +1,182 @@
+""" Tests for the core middleware and the site configuration cache invalidation signals. """
+import mock
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.signals import request_finished
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from testfixtures import LogCapture
+
+from ecommerce.core import middleware, routers
+from ecommerce.core.cache_versions import bump_version
+from ecommerce.core.constants import SITE_CONFIGURATION_VERSION_CACHE_KEY
+from ecommerce.core.models import SiteConfiguration
+from ecommerce.tests.factories import SiteConfigurationFactory
+from ecommerce.tests.testcases import TestCase
+
+AUDIT_LOGGER_NAME = 'ecommerce.extensions.analytics.utils'
+CLEAR_CACHE_PATH = 'django.contrib.sites.models.SiteManager.clear_cache'
+
+
+class SiteConfigurationCacheMiddlewareTests(TestCase):
+    def setUp(self):
+        super(SiteConfigurationCacheMiddlewareTests, self).setUp()
+        cache.clear()
+        # pylint: disable=protected-access
+        patcher = mock.patch.dict(middleware._site_cache_state, {'version': None, 'checked_at': 0})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assert_cache_cleared(self, expected):
+        with mock.patch(CLEAR_CACHE_PATH) as mock_clear_cache:
+            middleware.SiteConfigurationCacheMiddleware().process_request(mock.Mock())
+            self.assertEqual(mock_clear_cache.called, expected)
+
+    @override_settings(SITE_CONFIGURATION_CACHE_CHECK_INTERVAL=0)
+    def test_cache_cleared_when_version_changes(self):
+        """ Verify the sites cached by the process are cleared only if the shared version has changed. """
+        self.assert_cache_cleared(False)
+
+        bump_version(SITE_CONFIGURATION_VERSION_CACHE_KEY)
+        self.assert_cache_cleared(True)
+        self.assert_cache_cleared(False)
+
+    @override_settings(SITE_CONFIGURATION_CACHE_CHECK_INTERVAL=60)
+    def test_check_interval(self):
+        """ Verify the shared version is only read once per check interval. """
+        with mock.patch.object(cache, 'get', return_value=None) as mock_get:
+            self.assert_cache_cleared(False)
+            bump_version(SITE_CONFIGURATION_VERSION_CACHE_KEY)
+            self.assert_cache_cleared(False)
+            self.assertEqual(mock_get.call_count, 1)
+
+
+class SiteConfigurationSignalTests(TestCase):
+    def setUp(self):
+        super(SiteConfigurationSignalTests, self).setUp()
+        cache.clear()
+
+    def test_save_bumps_version(self):
+        """ Verify saving or deleting a Site or SiteConfiguration changes the shared version. """
+        site_configuration = SiteConfigurationFactory()
+        version = cache.get(SITE_CONFIGURATION_VERSION_CACHE_KEY)
+        self.assertIsNotNone(version)
+
+        site_configuration.site.name = 'Updated'
+        site_configuration.site.save()
+        self.assertNotEqual(cache.get(SITE_CONFIGURATION_VERSION_CACHE_KEY), version)
+
+        version = cache.get(SITE_CONFIGURATION_VERSION_CACHE_KEY)
+        site_configuration.delete()
+        self.assertNotEqual(cache.get(SITE_CONFIGURATION_VERSION_CACHE_KEY), version)
+
+    def test_save_clears_local_cache(self):
+        """ Verify the updated SiteConfiguration is returned by the sites cached by this process. """
+        site_configuration = SiteConfiguration.objects.get(site=self.site)
+        site_configuration.payment_processors = 'cybersource'
+        site_configuration.save()
+        self.assertEqual(Site.objects.get_current().siteconfiguration.payment_processors_set, {'cybersource'})
+
+        site_configuration.payment_processors = 'paypal'
+        site_configuration.save()
+        self.assertEqual(Site.objects.get_current().siteconfiguration.payment_processors_set, {'paypal'})
+
+    def test_version_bumped_after_request_in_transaction(self):
+        """ Verify changes made within a transaction change the version again once the request has finished. """
+        with transaction.atomic():
+            SiteConfigurationFactory()
+        version = cache.get(SITE_CONFIGURATION_VERSION_CACHE_KEY)
+
+        request_finished.send(sender=self.__class__)
+        self.assertNotEqual(cache.get(SITE_CONFIGURATION_VERSION_CACHE_KEY), version)
+
+        # The receiver only runs once.
+        version = cache.get(SITE_CONFIGURATION_VERSION_CACHE_KEY)
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(cache.get(SITE_CONFIGURATION_VERSION_CACHE_KEY), version)
+
+
+class PerformanceInstrumentationMiddlewareTests(TestCase):
+    def setUp(self):
+        super(PerformanceInstrumentationMiddlewareTests, self).setUp()
+        self.request = RequestFactory().get('/dashboard/')
+
+    def process(self):
+        instance = middleware.PerformanceInstrumentationMiddleware()
+        instance.process_request(self.request)
+        Site.objects.count()
+        Site.objects.count()
+        return instance.process_response(self.request, HttpResponse())
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION_ENABLED=False)
+    def test_disabled(self):
+        """ Verify the middleware is not used unless enabled. """
+        with self.assertRaises(MiddlewareNotUsed):
+            middleware.PerformanceInstrumentationMiddleware()
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION_ENABLED=True, PERFORMANCE_INSTRUMENTATION_HEADERS=False)
+    def test_metrics_logged(self):
+        """ Verify the metrics of each request are logged, but not returned in headers. """
+        with LogCapture(AUDIT_LOGGER_NAME) as l:
+            response = self.process()
+
+        self.assertNotIn('X-Perf-Queries', response)
+        message = l.records[0].getMessage()
+        self.assertTrue(message.startswith('request_metrics: '))
+        for expected in ('duplicate_queries="1"', 'method="GET"', 'path="/dashboard/"', 'queries="2"',
+                         'status_code="200"'):
+            self.assertIn(expected, message)
+
+    @override_settings(PERFORMANCE_INSTRUMENTATION_ENABLED=True, PERFORMANCE_INSTRUMENTATION_HEADERS=True)
+    def test_metrics_headers(self):
+        """ Verify the metrics are returned in response headers, if enabled. """
+        response = self.process()
+        self.assertEqual(response['X-Perf-Queries'], '2')
+        self.assertEqual(response['X-Perf-Duplicate-Queries'], '1')
+        self.assertEqual(response['X-Perf-Http-Calls'], '0')
+        self.assertIn('X-Perf-Sql-Time', response)
+        self.assertIn('X-Perf-Cache-Misses', response)
+
+
+@override_settings(READ_REPLICAS=['replica'], READ_REPLICA_PIN_TIMEOUT=15)
+class ReadReplicaMiddlewareTests(TestCase):
+    def setUp(self):
+        super(ReadReplicaMiddlewareTests, self).setUp()
+        self.middleware = middleware.ReadReplicaMiddleware()
+        self.router = routers.ReadReplicaRouter()
+        self.addCleanup(routers.finish_request)
+
+    @override_settings(READ_REPLICAS=[])
+    def test_no_replicas(self):
+        """ Verify the middleware is not used unless replicas are configured. """
+        with self.assertRaises(MiddlewareNotUsed):
+            middleware.ReadReplicaMiddleware()
+
+    def test_write_pins_reads(self):
+        """ Verify requests that write pin the user's subsequent reads to the default database. """
+        request = RequestFactory().post('/')
+        self.middleware.process_request(request)
+        Site.objects.create(domain='replica.example.com', name='replica')
+        response = self.middleware.process_response(request, HttpResponse())
+
+        cookie = response.cookies[settings.READ_REPLICA_PIN_COOKIE_NAME]
+        self.assertEqual(cookie['max-age'], 15)
+
+        request = RequestFactory().get('/')
+        request.COOKIES[settings.READ_REPLICA_PIN_COOKIE_NAME] = cookie.value
+        self.middleware.process_request(request)
+        with routers.read_replica():
+            self.assertEqual(self.router.db_for_read(Site), DEFAULT_DB_ALIAS)
+
+    def test_read_not_pinned(self):
+        """ Verify requests that only read are served from a replica, and do not pin reads. """
+        request = RequestFactory().get('/')
+        self.middleware.process_request(request)
+        with routers.read_replica():
+            self.assertEqual(self.router.db_for_read(Site), 'replica')
+
+        response = self.middleware.process_response(request, HttpResponse())
+        self.assertNotIn(settings.READ_REPLICA_PIN_COOKIE_NAME, response.cookies)
@@ -1,8 +1,11 @@
+import time
+
 import ddt
 import httpretty
 import mock
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.test import override_settings
 from edx_rest_api_client.auth import SuppliedJwtAuth
@@ -41,6 +44,15 @@ class UserTests(CourseCatalogTestMixin, LmsApiMockMixin, TestCase):
         self.create_access_token(user)
         self.assertEqual(user.access_token, self.access_token)
 
+    def test_access_token_memoized(self):
+        """ Verify the access token is only retrieved from the database once per User instance. """
+        user = self.create_user()
+        self.create_access_token(user)
+        self.assertEqual(user.access_token, self.access_token)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(user.access_token, self.access_token)
+
     def test_tracking_context(self):
         """ Ensures that the tracking_context dictionary is written / read
         correctly by the User model. """
@@ -53,6 +65,30 @@ class UserTests(CourseCatalogTestMixin, LmsApiMockMixin, TestCase):
         same_user = User.objects.get(id=user.id)
         self.assertEqual(same_user.tracking_context, self.TEST_CONTEXT)
 
+    def test_lowercase_fields(self):
+        """ Verify the lowercased copies of the username and email are kept in sync when the user is saved. """
+        user = self.create_user(username='Hacker.Man', email='Hacker.Man@Example.com')
+        self.assertEqual(user.username_lower, 'hacker.man')
+        self.assertEqual(user.email_lower, 'hacker.man@example.com')
+
+        user.username = 'HackerWoman'
+        user.email = 'Hacker.Woman@Example.com'
+        user.save(update_fields=['username', 'email'])
+
+        user = User.objects.get(id=user.id)
+        self.assertEqual(user.username_lower, 'hackerwoman')
+        self.assertEqual(user.email_lower, 'hacker.woman@example.com')
+
+    def test_prefix_lookup(self):
+        """ Verify the prefix lookup matches the strings starting with the given value. """
+        user = self.create_user(username='abc')
+        self.create_user(username='abd')
+        self.create_user(username='ab')
+
+        self.assertEqual(list(User.objects.filter(username__prefix='abc')), [user])
+        self.assertEqual(User.objects.filter(username__prefix='ab').count(), 3)
+        self.assertFalse(User.objects.filter(username__prefix='abcd').exists())
+
     def test_get_full_name(self):
         """ Test that the user model concatenates first and last name if the full name is not set. """
         full_name = "George Costanza"
@@ -153,15 +189,42 @@ class UserTests(CourseCatalogTestMixin, LmsApiMockMixin, TestCase):
         self.assertTrue(user.is_verified(self.site))
 
     @httpretty.activate
-    def test_user_verification_status_not_cached(self):
-        """ Verify the user verification status values is not cached when user is not verified. """
+    def test_user_verification_status_unverified_cached(self):
+        """ Verify the user verification status values is cached when user is not verified. """
         user = self.create_user()
         self.mock_verification_status_api(self.site, user, is_verified=False)
         self.assertFalse(user.is_verified(self.site))
 
         httpretty.disable()
-        with self.assertRaises(VerificationStatusError):
-            user.is_verified(self.site)
+        self.assertFalse(user.is_verified(self.site))
+
+    @httpretty.activate
+    @ddt.data(
+        (True, 'VERIFIED_STATUS_CACHE_TIMEOUT'),
+        (False, 'UNVERIFIED_STATUS_CACHE_TIMEOUT'),
+    )
+    @ddt.unpack
+    def test_user_verification_status_cache_timeout(self, is_verified, setting):
+        """ Verify each verification status is cached for its configured time. """
+        user = self.create_user()
+        self.mock_verification_status_api(self.site, user, is_verified=is_verified)
+
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            with self.settings(**{setting: 60}):
+                user.is_verified(self.site)
+        cache_set.assert_called_once_with(user.verification_status_cache_key, is_verified, 60)
+
+    @httpretty.activate
+    def test_clear_verification_status_cache(self):
+        """ Verify the verification status is retrieved from LMS again, once the cached status is cleared. """
+        user = self.create_user()
+        self.mock_verification_status_api(self.site, user, is_verified=False)
+        self.assertFalse(user.is_verified(self.site))
+
+        self.mock_verification_status_api(self.site, user, is_verified=True)
+        self.assertFalse(user.is_verified(self.site))
+        user.clear_verification_status_cache()
+        self.assertTrue(user.is_verified(self.site))
 
 
 class BusinessClientTests(TestCase):
@@ -172,6 +235,10 @@ class BusinessClientTests(TestCase):
 
 @ddt.ddt
 class SiteConfigurationTests(TestCase):
+    def setUp(self):
+        super(SiteConfigurationTests, self).setUp()
+        cache.clear()
+
     @ddt.data(
         ("paypal", {"paypal"}),
         ("paypal ", {"paypal"}),
@@ -190,6 +257,14 @@ class SiteConfigurationTests(TestCase):
         site_config = _make_site_config(payment_processors_str)
         self.assertEqual(site_config.payment_processors_set, expected_result)
 
+    def test_payment_processors_set_follows_field_changes(self):
+        """ Verify the parsed payment processors are recomputed when the payment_processors field changes. """
+        site_config = _make_site_config('paypal')
+        self.assertEqual(site_config.payment_processors_set, {'paypal'})
+
+        site_config.payment_processors = 'paypal,cybersource'
+        self.assertEqual(site_config.payment_processors_set, {'paypal', 'cybersource'})
+
     @ddt.data("paypal", "paypal, cybersource", "paypal , cybersource")
     def test_clean_fields_valid_values_pass_validation(self, payment_processors_str):
         """
@@ -348,6 +423,51 @@ class SiteConfigurationTests(TestCase):
         httpretty.disable()
         self.assertEqual(self.site.siteconfiguration.access_token, token)
 
+    @httpretty.activate
+    def test_access_token_unexpected_cached_value(self):
+        """ Verify a cached value that is not a (token, expires_at) tuple is treated as a cache miss. """
+        site_configuration = self.site.siteconfiguration
+        cache.set(site_configuration.access_token_cache_key, 'bare-token', 60)
+        token = self.mock_access_token_response()
+
+        self.assertIsNone(site_configuration.access_token_expires_at)
+        self.assertEqual(site_configuration.access_token, token)
+
+    @httpretty.activate
+    def test_access_token_refreshed_before_expiration(self):
+        """ Verify a token that is about to expire is returned while its replacement is fetched in the background. """
+        site_configuration = self.site.siteconfiguration
+        cache.set(site_configuration.access_token_cache_key, ('old-token', time.time() + 10), 10)
+        token = self.mock_access_token_response()
+
+        with mock.patch('ecommerce.core.models.threading') as mock_threading:
+            self.assertEqual(site_configuration.access_token, 'old-token')
+            self.assertFalse(httpretty.has_request())
+
+            # Only one refresher is started until the first has finished.
+            self.assertEqual(site_configuration.access_token, 'old-token')
+            self.assertEqual(mock_threading.Thread.call_count, 1)
+
+            mock_threading.Thread.call_args[1]['target']()
+
+        self.assertEqual(site_configuration.access_token, token)
+        self.assertTrue(site_configuration.refresh_access_token_async())
+
+    def test_access_token_refresh_failure(self):
+        """ Verify a failed background refresh is logged, and allows the refresh to be retried. """
+        site_configuration = self.site.siteconfiguration
+        cache.set(site_configuration.access_token_cache_key, ('old-token', time.time() + 10), 10)
+
+        with mock.patch('ecommerce.core.models.threading') as mock_threading:
+            self.assertTrue(site_configuration.refresh_access_token_async())
+            with mock.patch.object(SiteConfiguration, 'refresh_access_token', side_effect=ConnectionError):
+                with mock.patch('ecommerce.core.models.log') as mock_log:
+                    mock_threading.Thread.call_args[1]['target']()
+                    self.assertTrue(mock_log.exception.called)
+
+            self.assertEqual(site_configuration.access_token, 'old-token')
+            self.assertEqual(mock_threading.Thread.call_count, 2)
+
     @httpretty.activate
     @override_settings(COURSE_CATALOG_API_URL=COURSE_CATALOG_API_URL)
     def test_course_catalog_api_client(self):
@@ -0,0 +1,103 @@
+""" Tests for the performance instrumentation. """
+import httpretty
+import requests
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ecommerce.core import performance
+from ecommerce.tests.mixins import PerformanceBudgetMixin
+from ecommerce.tests.testcases import TestCase
+
+
+class InstrumentTests(PerformanceBudgetMixin, TestCase):
+    def setUp(self):
+        super(InstrumentTests, self).setUp()
+        cache.clear()
+
+    def test_queries(self):
+        """ Verify queries, and those duplicating an earlier query, are counted. """
+        with performance.instrument() as metrics:
+            Site.objects.filter(pk=1).exists()
+            Site.objects.filter(pk=1).exists()
+            Site.objects.filter(pk=1).exists()
+            Site.objects.count()
+
+        self.assertEqual(metrics.queries, 4)
+        self.assertEqual(metrics.duplicate_queries, 2)
+        self.assertEqual(list(metrics.duplicated_sql.values()), [3])
+        self.assertGreaterEqual(metrics.sql_time, 0)
+
+    def test_queries_outside_block_ignored(self):
+        """ Verify only the queries executed within the block are counted, including in nested blocks. """
+        Site.objects.count()
+        with performance.instrument() as outer:
+            Site.objects.count()
+            with performance.instrument() as inner:
+                Site.objects.exists()
+        Site.objects.count()
+
+        self.assertEqual(outer.queries, 2)
+        self.assertEqual(inner.queries, 1)
+        self.assertEqual(outer.duplicate_queries, 0)
+
+    def test_queries_across_requests(self):
+        """ Verify the queries of every request made within the block are counted, although each request
+        clears the query log of the connection. """
+        user = self.create_user(is_staff=True)
+        self.client.login(username=user.username, password=self.password)
+        path = reverse('api:v2:orders-list')
+
+        with CaptureQueriesContext(connection) as captured:
+            with self.assert_performance_budget(queries=100) as metrics:
+                self.assertEqual(self.client.get(path).status_code, 200)
+                self.assertEqual(self.client.get(path).status_code, 200)
+
+        self.assertGreater(metrics.queries, 0)
+        self.assertEqual(metrics.queries, len(captured))
+
+    @httpretty.activate
+    def test_http_calls(self):
+        """ Verify outbound HTTP requests are counted. """
+        url = 'http://example.com/api/'
+        httpretty.register_uri(httpretty.GET, url, body='{}')
+
+        requests.get(url)
+        with performance.instrument() as metrics:
+            requests.get(url)
+            requests.get(url)
+
+        self.assertEqual(metrics.http_calls, 2)
+        self.assertGreaterEqual(metrics.http_time, 0)
+
+    def test_cache_lookups(self):
+        """ Verify cache hits and misses are counted, and cached values are unaffected. """
+        cache.set('present', 'value')
+        with performance.instrument() as metrics:
+            self.assertEqual(cache.get('present'), 'value')
+            self.assertEqual(cache.get('absent', 'default'), 'default')
+            self.assertEqual(cache.get_many(['present', 'absent']), {'present': 'value'})
+
+        self.assertEqual(metrics.cache_hits, 2)
+        self.assertEqual(metrics.cache_misses, 2)
+
+    def test_budget_met(self):
+        """ Verify no assertion is raised when the budget is met. """
+        with self.assert_performance_budget(queries=1, duplicate_queries=0, http_calls=0, cache_misses=1):
+            Site.objects.count()
+            cache.get('absent')
+
+    def test_budget_exceeded(self):
+        """ Verify an assertion listing the exceeded limits and the duplicate queries is raised. """
+        with self.assertRaises(AssertionError) as context:
+            with self.assert_performance_budget(queries=1, duplicate_queries=0):
+                Site.objects.count()
+                Site.objects.count()
+
+        message = str(context.exception)
+        self.assertIn('queries: 2 > 1', message)
+        self.assertIn('duplicate_queries: 1 > 0', message)
+        self.assertIn('2x ', message)
+        self.assertIn('SELECT COUNT(*)', message)
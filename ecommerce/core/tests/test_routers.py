@@ -0,0 +1,57 @@
+from django.contrib.sites.models import Site
+from django.db import DEFAULT_DB_ALIAS
+from django.test import SimpleTestCase, override_settings
+
+from ecommerce.core import routers
+
+
+@override_settings(READ_REPLICAS=['replica'])
+class ReadReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        super(ReadReplicaRouterTests, self).setUp()
+        self.router = routers.ReadReplicaRouter()
+        routers.start_request(pinned=False)
+        self.addCleanup(routers.finish_request)
+
+    def test_read_replica(self):
+        """ Verify reads are only sent to a replica within read_replica(). """
+        self.assertEqual(self.router.db_for_read(Site), DEFAULT_DB_ALIAS)
+
+        with routers.read_replica():
+            self.assertEqual(self.router.db_for_read(Site), 'replica')
+
+        self.assertEqual(self.router.db_for_read(Site), DEFAULT_DB_ALIAS)
+
+    def test_use_read_replica(self):
+        """ Verify the reads of decorated functions are sent to a replica. """
+        @routers.use_read_replica
+        def read():
+            return self.router.db_for_read(Site)
+
+        self.assertEqual(read(), 'replica')
+
+    @override_settings(READ_REPLICAS=[])
+    def test_no_replicas(self):
+        """ Verify reads use the default database if no replicas are configured. """
+        with routers.read_replica():
+            self.assertEqual(self.router.db_for_read(Site), DEFAULT_DB_ALIAS)
+
+    def test_read_your_writes(self):
+        """ Verify reads use the default database after a write. """
+        with routers.read_replica():
+            self.assertEqual(self.router.db_for_write(Site), DEFAULT_DB_ALIAS)
+            self.assertEqual(self.router.db_for_read(Site), DEFAULT_DB_ALIAS)
+
+        self.assertTrue(routers.finish_request())
+        self.assertFalse(routers.finish_request())
+
+    def test_pinned(self):
+        """ Verify reads use the default database when pinned to it. """
+        routers.start_request(pinned=True)
+        with routers.read_replica():
+            self.assertEqual(self.router.db_for_read(Site), DEFAULT_DB_ALIAS)
+
+    def test_allow_migrate(self):
+        """ Verify replicas are never migrated. """
+        self.assertFalse(self.router.allow_migrate('replica', 'sites'))
+        self.assertIsNone(self.router.allow_migrate(DEFAULT_DB_ALIAS, 'sites'))
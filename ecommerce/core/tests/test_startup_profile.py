@@ -0,0 +1,28 @@
+""" Tests for the startup profiling of new processes. """
+import sys
+
+from django.test import SimpleTestCase
+
+from ecommerce.core.startup_profile import ImportTimer
+
+
+class ImportTimerTests(SimpleTestCase):
+    def setUp(self):
+        super(ImportTimerTests, self).setUp()
+        sys.modules.pop('colorsys', None)
+        self.timer = ImportTimer()
+        self.timer.install()
+        self.addCleanup(self.timer.uninstall)
+
+    def test_new_modules_timed(self):
+        """ Verify modules are timed when first loaded, but not when imported again. """
+        import colorsys  # pylint: disable=unused-variable
+        self.timer.uninstall()
+
+        self.assertIn('colorsys', self.timer.inclusive)
+        self.assertLessEqual(self.timer.self_time['colorsys'], self.timer.inclusive['colorsys'])
+
+        elapsed = self.timer.inclusive['colorsys']
+        self.timer.install()
+        import colorsys  # pylint: disable=reimported,redefined-outer-name
+        self.assertEqual(self.timer.inclusive['colorsys'], elapsed)
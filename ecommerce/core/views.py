@@ -14,6 +14,7 @@ from django.utils.decorators import method_decorator
 from django.views.generic import View
 
 from ecommerce.core.constants import Status, UnavailabilityMessage
+from ecommerce.core.routers import read_replica
 from ecommerce.core.url_utils import get_lms_heartbeat_url
 
 logger = logging.getLogger(__name__)
@@ -113,6 +114,19 @@ class StaffOnlyMixin(object):
         return super(StaffOnlyMixin, self).dispatch(request, *args, **kwargs)
 
 
+class ReadReplicaMixin(object):
+    """ Serves GET (and HEAD) requests from a read replica, including the rendering of their responses. """
+
+    def get(self, request, *args, **kwargs):
+        with read_replica():
+            response = super(ReadReplicaMixin, self).get(request, *args, **kwargs)
+            # Template responses are otherwise rendered, evaluating their querysets, once the view has returned.
+            if callable(getattr(response, 'render', None)):
+                response.render()
+
+        return response
+
+
 class LogoutView(EdxOpenIdConnectLogoutView):
     """ Logout view that redirects the user to the LMS logout page. """
 
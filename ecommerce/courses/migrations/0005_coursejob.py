@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+from django.conf import settings
+import django_extensions.db.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('courses', '0004_auto_20150803_1406'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseJob',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('created', django_extensions.db.fields.CreationDateTimeField(default=django.utils.timezone.now, verbose_name='created', editable=False, blank=True)),
+                ('modified', django_extensions.db.fields.ModificationDateTimeField(default=django.utils.timezone.now, verbose_name='modified', editable=False, blank=True)),
+                ('command', models.CharField(max_length=255, choices=[('migrate_course', 'Migrate course'), ('convert_course', 'Convert course')])),
+                ('course_ids', models.TextField(help_text='Comma-separated IDs of the courses to which the command is applied.')),
+                ('options', models.TextField(default='{}', help_text='JSON-encoded options passed to the command.')),
+                ('status', models.CharField(default='Pending', max_length=255, choices=[('Pending', 'Pending'), ('Running', 'Running'), ('Succeeded', 'Succeeded'), ('Failed', 'Failed'), ('Cancelled', 'Cancelled')])),
+                ('output', models.TextField(default='', blank=True)),
+                ('requested_by', models.ForeignKey(related_name='course_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-created',),
+            },
+        ),
+    ]
@@ -5,6 +5,7 @@ from django.conf import settings
 from django.db import models, transaction
 from django.db.models import Q, Count
 from django.utils.translation import ugettext_lazy as _
+from django_extensions.db.models import TimeStampedModel
 from oscar.core.loading import get_model
 from simple_history.models import HistoricalRecords
 import waffle
@@ -15,6 +16,7 @@ from ecommerce.core.constants import (
     ENROLLMENT_CODE_SWITCH
 )
 from ecommerce.courses.publishers import LMSPublisher
+from ecommerce.extensions.catalogue.product_classes import get_product_class_by_name, get_product_class_by_slug
 from ecommerce.extensions.catalogue.utils import generate_sku
 
 logger = logging.getLogger(__name__)
@@ -22,7 +24,6 @@ Category = get_model('catalogue', 'Category')
 Partner = get_model('partner', 'Partner')
 Product = get_model('catalogue', 'Product')
 ProductCategory = get_model('catalogue', 'ProductCategory')
-ProductClass = get_model('catalogue', 'ProductClass')
 StockRecord = get_model('partner', 'StockRecord')
 
 
@@ -45,7 +46,7 @@ class Course(models.Model):
         parent, created = self.products.get_or_create(
             course=self,
             structure=Product.PARENT,
-            product_class=ProductClass.objects.get(slug='seat'),
+            product_class=get_product_class_by_slug('seat'),
         )
         ProductCategory.objects.get_or_create(category=Category.objects.get(name='Seats'), product=parent)
         parent.title = 'Seat in {}'.format(self.name)
@@ -154,37 +155,19 @@ class Course(models.Model):
         course_id = unicode(self.id)
 
         if certificate_type == self.certificate_type_for_mode('audit'):
-            # Yields a match if attribute names do not include 'certificate_type'.
-            certificate_type_query = ~Q(attributes__name='certificate_type')
+            # Seats derived from an "audit" mode have no certificate_type attribute.
+            certificate_type_query = Q(certificate_type__isnull=True)
         else:
-            # Yields a match if attribute with name 'certificate_type' matches provided value.
-            certificate_type_query = Q(
-                attributes__name='certificate_type',
-                attribute_values__value_text=certificate_type
-            )
-
-        id_verification_required_query = Q(
-            attributes__name='id_verification_required',
-            attribute_values__value_boolean=id_verification_required
-        )
+            certificate_type_query = Q(certificate_type=certificate_type)
 
         if credit_provider is None:
-            # Yields a match if attribute names do not include 'credit_provider'.
-            credit_provider_query = ~Q(attributes__name='credit_provider')
+            credit_provider_query = Q(credit_provider__isnull=True)
         else:
-            # Yields a match if attribute with name 'credit_provider' matches provided value.
-            credit_provider_query = Q(
-                attributes__name='credit_provider',
-                attribute_values__value_text=credit_provider
-            )
+            credit_provider_query = Q(credit_provider=credit_provider)
 
         seats = self.seat_products.filter(certificate_type_query)
         try:
-            seat = seats.filter(
-                id_verification_required_query
-            ).get(
-                credit_provider_query
-            )
+            seat = seats.get(credit_provider_query, id_verification_required=id_verification_required)
 
             logger.info(
                 'Retrieved course seat child product with certificate type [%s] for [%s] from database.',
@@ -246,15 +229,10 @@ class Course(models.Model):
         stock_record.save()
 
         if remove_stale_modes and self.certificate_type_for_mode(certificate_type) == 'professional':
-            id_verification_required_query = Q(
-                attributes__name='id_verification_required',
-                attribute_values__value_boolean=not id_verification_required
-            )
-
             # Delete seats with a different verification requirement, assuming the seats
             # have not been purchased.
             seats.annotate(orders=Count('line')).filter(
-                id_verification_required_query,
+                id_verification_required=not id_verification_required,
                 orders=0
             ).delete()
 
@@ -285,7 +263,7 @@ class Course(models.Model):
         Returns:
             Enrollment code product.
         """
-        enrollment_code_product_class = ProductClass.objects.get(name=ENROLLMENT_CODE_PRODUCT_CLASS_NAME)
+        enrollment_code_product_class = get_product_class_by_name(ENROLLMENT_CODE_PRODUCT_CLASS_NAME)
         enrollment_code = self.enrollment_code_product
         if not enrollment_code:
             title = 'Enrollment code for {seat_type} seat in {course_name}'.format(
@@ -317,3 +295,60 @@ class Course(models.Model):
         stock_record.save()
 
         return enrollment_code
+
+
+class CourseJob(TimeStampedModel):
+    """ A course management command, run in the background on behalf of a user. """
+    PENDING, RUNNING, SUCCEEDED, FAILED, CANCELLED = 'Pending', 'Running', 'Succeeded', 'Failed', 'Cancelled'
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (RUNNING, _('Running')),
+        (SUCCEEDED, _('Succeeded')),
+        (FAILED, _('Failed')),
+        (CANCELLED, _('Cancelled')),
+    )
+    FINAL_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+    MIGRATE_COURSE, CONVERT_COURSE = 'migrate_course', 'convert_course'
+    COMMAND_CHOICES = (
+        (MIGRATE_COURSE, _('Migrate course')),
+        (CONVERT_COURSE, _('Convert course')),
+    )
+
+    command = models.CharField(max_length=255, choices=COMMAND_CHOICES)
+    course_ids = models.TextField(help_text=_('Comma-separated IDs of the courses to which the command is applied.'))
+    options = models.TextField(default='{}', help_text=_('JSON-encoded options passed to the command.'))
+    status = models.CharField(max_length=255, choices=STATUS_CHOICES, default=PENDING)
+    output = models.TextField(blank=True, default='')
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='course_jobs')
+
+    class Meta(object):
+        ordering = ('-created',)
+
+    def __unicode__(self):
+        return '{command} of [{course_ids}]: {status}'.format(
+            command=self.command, course_ids=self.course_ids, status=self.status
+        )
+
+    @property
+    def course_id_list(self):
+        return [course_id for course_id in self.course_ids.split(',') if course_id]
+
+    def cancel(self):
+        """
+        Cancels the job, unless it has already finished.
+
+        Running jobs stop before processing their next batch of courses.
+
+        Returns:
+            bool: True if the job was cancelled; otherwise, False.
+        """
+        cancelled = bool(
+            CourseJob.objects.filter(pk=self.pk).exclude(status__in=self.FINAL_STATUSES).update(status=self.CANCELLED)
+        )
+        if cancelled:
+            self.status = self.CANCELLED
+        return cancelled
+
+    def is_cancelled(self):
+        """ Returns True if the job has been cancelled, possibly by another process. """
+        return CourseJob.objects.filter(pk=self.pk, status=self.CANCELLED).exists()
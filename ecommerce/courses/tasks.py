@@ -0,0 +1,77 @@
+""" Celery tasks for running course management commands in the background. """
+from __future__ import unicode_literals
+
+from io import StringIO
+import json
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.core.management import call_command
+
+from ecommerce.courses.models import CourseJob
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def run_course_job(job_id):
+    """
+    Runs the management command of the given course job.
+
+    The command is run for batches of courses, of up to COURSE_JOB_BATCH_SIZE courses each. The output and
+    logs captured so far are stored on the job after each batch, and the job stops if it has been cancelled.
+
+    Arguments:
+        job_id (int): ID of the CourseJob to run.
+    """
+    updated = CourseJob.objects.filter(pk=job_id, status=CourseJob.PENDING).update(status=CourseJob.RUNNING)
+    if not updated:
+        logger.info('Course job [%d] is no longer pending, and will not be run.', job_id)
+        return
+
+    job = CourseJob.objects.select_related('requested_by').get(pk=job_id)
+    options = json.loads(job.options)
+    options['access_token'] = job.requested_by.access_token
+    course_ids = job.course_id_list
+    batch_size = settings.COURSE_JOB_BATCH_SIZE
+
+    # Capture all output and logging
+    out = StringIO()
+    err = StringIO()
+    log = StringIO()
+
+    root_logger = logging.getLogger()
+    log_handler = logging.StreamHandler(log)
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    log_handler.setFormatter(formatter)
+    root_logger.addHandler(log_handler)
+
+    def save_output(**kwargs):
+        # Format the output for display
+        output = u'STDOUT\n{out}\n\nSTDERR\n{err}\n\nLOG\n{log}'.format(out=out.getvalue(), err=err.getvalue(),
+                                                                        log=log.getvalue())
+        CourseJob.objects.filter(pk=job_id).update(output=output)
+        if kwargs:
+            # Only update the status of jobs which have not been cancelled in the meantime.
+            CourseJob.objects.filter(pk=job_id, status=CourseJob.RUNNING).update(**kwargs)
+
+    try:
+        for start in range(0, len(course_ids), batch_size):
+            if job.is_cancelled():
+                logger.info('Course job [%d] was cancelled.', job_id)
+                break
+
+            call_command(job.command, *course_ids[start:start + batch_size], stdout=out, stderr=err, **options)
+            save_output()
+
+        save_output(status=CourseJob.SUCCEEDED)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('Course job [%d] failed.', job_id)
+        save_output(status=CourseJob.FAILED)
+    finally:
+        # Remove the log capture handler and close all streams
+        root_logger.removeHandler(log_handler)
+        log.close()
+        out.close()
+        err.close()
@@ -0,0 +1,80 @@
+import json
+
+from django.test import override_settings
+import mock
+
+from ecommerce.courses.models import CourseJob
+from ecommerce.courses.tasks import run_course_job
+from ecommerce.tests.testcases import TestCase
+
+CALL_COMMAND_PATH = 'ecommerce.courses.tasks.call_command'
+
+
+@override_settings(COURSE_JOB_BATCH_SIZE=2)
+class RunCourseJobTests(TestCase):
+    def setUp(self):
+        super(RunCourseJobTests, self).setUp()
+        self.user = self.create_user(is_superuser=True)
+        self.job = CourseJob.objects.create(
+            command=CourseJob.MIGRATE_COURSE,
+            course_ids='a,b,c',
+            options=json.dumps({'commit': True, 'site_domain': self.site.domain}),
+            requested_by=self.user
+        )
+
+    def get_job(self):
+        return CourseJob.objects.get(id=self.job.id)
+
+    def test_run(self):
+        """ Verify the command is run for each batch of courses, and its output stored. """
+        def call_command(command, *course_ids, **options):
+            options['stdout'].write(u'Migrated {}.'.format(', '.join(course_ids)))
+
+        with mock.patch(CALL_COMMAND_PATH, side_effect=call_command) as mock_call_command:
+            run_course_job(self.job.id)
+
+        self.assertEqual(
+            [call[0] for call in mock_call_command.call_args_list],
+            [(CourseJob.MIGRATE_COURSE, 'a', 'b'), (CourseJob.MIGRATE_COURSE, 'c')]
+        )
+        options = mock_call_command.call_args[1]
+        self.assertTrue(options['commit'])
+        self.assertEqual(options['site_domain'], self.site.domain)
+        self.assertIn('access_token', options)
+
+        job = self.get_job()
+        self.assertEqual(job.status, CourseJob.SUCCEEDED)
+        self.assertTrue(job.output.startswith(u'STDOUT\nMigrated a, b.Migrated c.\n\nSTDERR\n'))
+
+    def test_failure(self):
+        """ Verify the job is marked as failed, and the error logged in its output, if the command fails. """
+        with mock.patch(CALL_COMMAND_PATH, side_effect=ValueError('Oops')):
+            run_course_job(self.job.id)
+
+        job = self.get_job()
+        self.assertEqual(job.status, CourseJob.FAILED)
+        self.assertIn('Course job [{}] failed.'.format(job.id), job.output)
+        self.assertIn('ValueError: Oops', job.output)
+
+    def test_cancelled_before_start(self):
+        """ Verify jobs cancelled before they start are not run. """
+        self.job.cancel()
+        with mock.patch(CALL_COMMAND_PATH) as mock_call_command:
+            run_course_job(self.job.id)
+
+        self.assertFalse(mock_call_command.called)
+        self.assertEqual(self.get_job().status, CourseJob.CANCELLED)
+
+    def test_cancelled_while_running(self):
+        """ Verify running jobs stop once they are cancelled, and the output gathered so far is stored. """
+        def call_command(command, *course_ids, **options):
+            options['stdout'].write(u'Migrated {}.'.format(', '.join(course_ids)))
+            self.job.cancel()
+
+        with mock.patch(CALL_COMMAND_PATH, side_effect=call_command) as mock_call_command:
+            run_course_job(self.job.id)
+
+        self.assertEqual(mock_call_command.call_count, 1)
+        job = self.get_job()
+        self.assertEqual(job.status, CourseJob.CANCELLED)
+        self.assertIn(u'Migrated a, b.', job.output)
@@ -1,8 +1,10 @@
 import hashlib
+import json
 
 import ddt
 import httpretty
 
+from django.conf import settings
 from django.core.cache import cache
 
 from ecommerce.core.constants import ENROLLMENT_CODE_SWITCH
@@ -12,7 +14,7 @@ from ecommerce.coupons.tests.mixins import CourseCatalogMockMixin
 from ecommerce.courses.models import Course
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.courses.utils import (
-    get_certificate_type_display_value, get_course_info_from_catalog, mode_for_seat
+    get_certificate_type_display_value, get_course_info_from_catalog, get_courses_info_from_catalog, mode_for_seat
 )
 from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
 from ecommerce.tests.testcases import TestCase
@@ -60,6 +62,36 @@ class UtilsTests(CourseCatalogTestMixin, CourseCatalogMockMixin, TestCase):
         cached_course = cache.get(cache_key)
         self.assertEqual(cached_course, response)
 
+    @mock_course_catalog_api_client
+    def test_get_courses_info_from_catalog(self):
+        """ Verify the information for multiple courses is retrieved with a single request, and cached. """
+        cached_course, course, other_course = CourseFactory(), CourseFactory(), CourseFactory()
+        self.mock_dynamic_catalog_single_course_runs_api(cached_course)
+        get_course_info_from_catalog(self.request.site, cached_course.id)
+
+        course_runs = [{'key': course.id, 'title': course.name}, {'key': other_course.id, 'title': other_course.name}]
+        httpretty.reset()
+        httpretty.register_uri(
+            httpretty.GET,
+            '{}course_runs/'.format(settings.COURSE_CATALOG_API_URL),
+            body=json.dumps({'count': 2, 'next': None, 'results': course_runs}),
+            content_type='application/json'
+        )
+
+        course_ids = [cached_course.id, course.id, other_course.id]
+        response = get_courses_info_from_catalog(self.request.site, course_ids)
+        self.assertEqual({key: info['title'] for key, info in response.items()},
+                         {cached_course.id: cached_course.name, course.id: course.name,
+                          other_course.id: other_course.name})
+
+        # httpretty decodes the plus signs of the course keys as spaces.
+        keys = httpretty.last_request().querystring['keys'][0].replace(' ', '+')
+        self.assertEqual(keys.split(','), sorted([course.id, other_course.id]))
+
+        httpretty.disable()
+        self.assertEqual(get_courses_info_from_catalog(self.request.site, course_ids), response)
+        httpretty.enable()
+
     @ddt.data(
         ('honor', 'Honor'),
         ('verified', 'Verified'),
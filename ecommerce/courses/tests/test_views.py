@@ -3,9 +3,11 @@ import json
 import httpretty
 from django.conf import settings
 from django.core.urlresolvers import reverse
+import mock
 from testfixtures import LogCapture
 
 from ecommerce.core.url_utils import get_lms_url
+from ecommerce.courses.models import CourseJob
 from ecommerce.tests.testcases import TestCase
 
 LOGGER_NAME = 'ecommerce.courses.views'
@@ -14,39 +16,128 @@ LOGGER_NAME = 'ecommerce.courses.views'
 class ManagementCommandViewMixin(object):
     def test_superuser_required(self):
         """ Verify the view is only accessible to superusers. """
-        response = self.client.get(self.path)
+        response = self.client.post(self.path)
         self.assertEqual(response.status_code, 404)
 
         user = self.create_user(is_superuser=False)
         self.client.login(username=user.username, password=self.password)
-        response = self.client.get(self.path)
+        response = self.client.post(self.path)
         self.assertEqual(response.status_code, 404)
 
+        user = self.create_user(is_superuser=True)
+        self.client.login(username=user.username, password=self.password)
+        response = self.client.post(self.path, {'course_ids': 'foo'})
+        self.assertEqual(response.status_code, 202)
+
+    def test_post_required(self):
+        """ Verify jobs cannot be submitted with GET requests. """
         user = self.create_user(is_superuser=True)
         self.client.login(username=user.username, password=self.password)
         response = self.client.get(self.path + '?course_ids=foo')
-        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.status_code, 405)
+        self.assertFalse(CourseJob.objects.exists())
 
     def test_course_ids_required(self):
         """ The view should return HTTP status 400 if no course IDs are provided. """
         user = self.create_user(is_superuser=True)
         self.client.login(username=user.username, password=self.password)
-        response = self.client.get(self.path)
+        response = self.client.post(self.path)
         self.assertEqual(response.status_code, 400)
 
-        response = self.client.get(self.path + '?course_ids=')
+        response = self.client.post(self.path, {'course_ids': ''})
         self.assertEqual(response.status_code, 400)
 
-        response = self.client.get(self.path + '?course_ids=foo')
-        self.assertEqual(response.status_code, 200)
+        response = self.client.post(self.path, {'course_ids': 'foo'})
+        self.assertEqual(response.status_code, 202)
+
+    def test_job_submitted(self):
+        """ Verify the view queues a job running the command, and returns the URL at which it can be polled. """
+        user = self.create_user(is_superuser=True)
+        self.client.login(username=user.username, password=self.password)
+
+        with mock.patch('ecommerce.courses.views.run_course_job.delay') as mock_delay:
+            response = self.client.post(self.path, dict(self.data, course_ids='foo,bar', commit='1'))
+
+        self.assertEqual(response.status_code, 202)
+        job = CourseJob.objects.get()
+        mock_delay.assert_called_once_with(job.id)
+        self.assertEqual(job.command, self.command)
+        self.assertEqual(job.course_id_list, ['foo', 'bar'])
+        self.assertEqual(job.requested_by, user)
+        self.assertEqual(json.loads(job.options), dict(self.expected_options, commit=True))
+
+        data = json.loads(response.content)
+        self.assertEqual(data['id'], job.id)
+        self.assertEqual(data['status'], CourseJob.PENDING)
+        self.assertEqual(data['url'], reverse('courses:job', kwargs={'pk': job.id}))
 
 
 class CourseMigrationViewTests(ManagementCommandViewMixin, TestCase):
     path = reverse('courses:migrate')
+    command = CourseJob.MIGRATE_COURSE
+    data = {}
+
+    @property
+    def expected_options(self):
+        return {'site_domain': self.site.domain}
 
 
 class ConvertCourseView(ManagementCommandViewMixin, TestCase):
     path = reverse('courses:convert_course')
+    command = CourseJob.CONVERT_COURSE
+    data = {'direction': 'audit_to_honor', 'partner': 'edX'}
+    expected_options = {'direction': 'audit_to_honor', 'partner': 'edX'}
+
+
+class CourseJobViewTests(TestCase):
+    def setUp(self):
+        super(CourseJobViewTests, self).setUp()
+        self.user = self.create_user(is_superuser=True)
+        self.client.login(username=self.user.username, password=self.password)
+        self.job = CourseJob.objects.create(
+            command=CourseJob.MIGRATE_COURSE,
+            course_ids='foo,bar',
+            output='Migrated.',
+            requested_by=self.user
+        )
+        self.path = reverse('courses:job', kwargs={'pk': self.job.id})
+        self.cancel_path = reverse('courses:cancel_job', kwargs={'pk': self.job.id})
+
+    def test_superuser_required(self):
+        """ Verify the views are only accessible to superusers. """
+        user = self.create_user(is_superuser=False)
+        self.client.login(username=user.username, password=self.password)
+        self.assertEqual(self.client.get(self.path).status_code, 404)
+        self.assertEqual(self.client.post(self.cancel_path).status_code, 404)
+        self.assertEqual(CourseJob.objects.get(id=self.job.id).status, CourseJob.PENDING)
+
+    def test_get(self):
+        """ Verify the view returns the status and output of the job. """
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+
+        data = json.loads(response.content)
+        self.assertEqual(data['status'], CourseJob.PENDING)
+        self.assertEqual(data['course_ids'], ['foo', 'bar'])
+        self.assertEqual(data['output'], 'Migrated.')
+
+        response = self.client.get(reverse('courses:job', kwargs={'pk': self.job.id + 1}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_cancel(self):
+        """ Verify unfinished jobs can be cancelled. """
+        response = self.client.post(self.cancel_path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['status'], CourseJob.CANCELLED)
+        self.assertEqual(CourseJob.objects.get(id=self.job.id).status, CourseJob.CANCELLED)
+
+    def test_cancel_finished_job(self):
+        """ Verify jobs which have already finished cannot be cancelled. """
+        CourseJob.objects.filter(id=self.job.id).update(status=CourseJob.SUCCEEDED)
+        response = self.client.post(self.cancel_path)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(json.loads(response.content)['status'], CourseJob.SUCCEEDED)
+        self.assertEqual(CourseJob.objects.get(id=self.job.id).status, CourseJob.SUCCEEDED)
 
 
 class CourseAppViewTests(TestCase):
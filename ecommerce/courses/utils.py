@@ -20,12 +20,16 @@ def mode_for_seat(product):
     return mode
 
 
+def _get_course_info_cache_key(course_key, partner_short_code):
+    cache_key = 'courses_api_detail_{}{}'.format(course_key, partner_short_code)
+    return hashlib.md5(cache_key).hexdigest()
+
+
 def get_course_info_from_catalog(site, course_key):
     """ Get course information from catalog service and cache """
     api = site.siteconfiguration.course_catalog_api_client
     partner_short_code = site.siteconfiguration.partner.short_code
-    cache_key = 'courses_api_detail_{}{}'.format(course_key, partner_short_code)
-    cache_key = hashlib.md5(cache_key).hexdigest()
+    cache_key = _get_course_info_cache_key(course_key, partner_short_code)
     course_run = cache.get(cache_key)
     if not course_run:  # pragma: no cover
         course_run = api.course_runs(course_key).get(partner=partner_short_code)
@@ -33,6 +37,39 @@ def get_course_info_from_catalog(site, course_key):
     return course_run
 
 
+def get_courses_info_from_catalog(site, course_keys):
+    """ Get information for multiple courses from catalog service and cache.
+
+    Cached course information is retrieved with a single cache lookup, and the information for
+    the remaining courses with a single request to the catalog service.
+
+    Returns:
+        dict: Course information keyed by course key. Courses unknown to the catalog service are omitted.
+    """
+    course_keys = [unicode(course_key) for course_key in course_keys]
+    partner_short_code = site.siteconfiguration.partner.short_code
+    cache_keys = {course_key: _get_course_info_cache_key(course_key, partner_short_code) for course_key in course_keys}
+    cached = cache.get_many(cache_keys.values())
+    courses = {course_key: cached[cache_key] for course_key, cache_key in cache_keys.items() if cached.get(cache_key)}
+
+    missing = sorted(set(course_keys) - set(courses))
+    if len(missing) == 1:
+        courses[missing[0]] = get_course_info_from_catalog(site, missing[0])
+    elif missing:
+        api = site.siteconfiguration.course_catalog_api_client
+        response = api.course_runs.get(keys=','.join(missing), partner=partner_short_code, page_size=len(missing))
+        fetched = {
+            course_run['key']: course_run for course_run in response.get('results', []) if course_run['key'] in cache_keys
+        }
+        cache.set_many(
+            {cache_keys[course_key]: course_run for course_key, course_run in fetched.items()},
+            settings.COURSES_API_CACHE_TIMEOUT
+        )
+        courses.update(fetched)
+
+    return courses
+
+
 def get_certificate_type_display_value(certificate_type):
     display_values = {
         'audit': _('Audit'),
@@ -1,20 +1,23 @@
-from io import StringIO
 import json
 import logging
-import os
 
 from django.conf import settings
 from django.core.cache import cache
-from django.core.management import call_command
-from django.http import Http404, HttpResponse
+from django.core.urlresolvers import reverse
+from django.db import transaction
+from django.http import Http404, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
 from django.views.generic import View, TemplateView
 from edx_rest_api_client.client import EdxRestApiClient
 from requests import Timeout
 from slumber.exceptions import SlumberBaseException
 
+from ecommerce.core.constants import ISO_8601_FORMAT
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.core.views import StaffOnlyMixin
-from ecommerce.extensions.partner.shortcuts import get_partner_for_site
+from ecommerce.courses.models import CourseJob
+from ecommerce.courses.tasks import run_course_job
 
 
 logger = logging.getLogger(__name__)
@@ -62,119 +65,120 @@ class CourseAppView(StaffOnlyMixin, TemplateView):
         return credit_providers
 
 
-class CourseMigrationView(View):
+class SuperuserOnlyMixin(object):
+    """ Makes sure only superusers can access the view. """
+
     def dispatch(self, request, *args, **kwargs):
         if not request.user.is_superuser:
             raise Http404
 
-        return super(CourseMigrationView, self).dispatch(request, *args, **kwargs)
+        return super(SuperuserOnlyMixin, self).dispatch(request, *args, **kwargs)
+
+
+def serialize_course_job(job):
+    """ Returns a dict representing the status, and output, of the given CourseJob. """
+    return {
+        'id': job.id,
+        'command': job.command,
+        'course_ids': job.course_id_list,
+        'status': job.status,
+        'output': job.output,
+        'created': job.created.strftime(ISO_8601_FORMAT),
+        'modified': job.modified.strftime(ISO_8601_FORMAT),
+        'url': reverse('courses:job', kwargs={'pk': job.id}),
+        'cancel_url': reverse('courses:cancel_job', kwargs={'pk': job.id}),
+    }
+
+
+class CourseJobSubmissionView(SuperuserOnlyMixin, View):
+    """
+    Submits a CourseJob, which runs a management command in the background.
+
+    Jobs are submitted with POST requests, whose course_ids and commit parameters, along with any options
+    returned by get_options, are passed to the command. The response, returned once the job has been queued,
+    contains the URL at which the status and output of the job can be polled.
+    """
+    command = None
+    log_message = None
+
+    # The job must be committed before it is queued, so that the worker can retrieve it.
+    @method_decorator(transaction.non_atomic_requests)
+    def dispatch(self, request, *args, **kwargs):
+        return super(CourseJobSubmissionView, self).dispatch(request, *args, **kwargs)
+
+    def get_options(self, request):  # pylint: disable=unused-argument
+        """ Returns the command options, other than commit, specified by the request. """
+        return {}
 
-    def get(self, request, *_args, **_kwargs):
-        course_ids = request.GET.get('course_ids')
-        commit = request.GET.get('commit', False)
+    def post(self, request, *_args, **_kwargs):
+        course_ids = request.POST.get('course_ids')
+        commit = request.POST.get('commit', False)
         commit = commit in ('1', 'true')
-        partner = get_partner_for_site(request)
 
-        # Capture all output and logging
-        out = StringIO()
-        err = StringIO()
-        log = StringIO()
+        # Log who ran this request
+        msg = self.log_message
+        if commit:
+            msg += u'The changes will be committed to the database.'
+        else:
+            msg += u'The changes will NOT be committed to the database.'
 
-        root_logger = logging.getLogger()
-        log_handler = logging.StreamHandler(log)
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        log_handler.setFormatter(formatter)
-        root_logger.addHandler(log_handler)
+        user = request.user
+        logger.info(msg, user.username, course_ids)
 
-        try:
-            # Log who ran this request
-            msg = u'User [%s] requested course migration for [%s]. '
-            if commit:
-                msg += u'The changes will be committed to the database.'
-            else:
-                msg += u'The changes will NOT be committed to the database.'
+        if not course_ids:
+            return HttpResponse('No course_ids specified.', status=400)
 
-            user = request.user
-            logger.info(msg, user.username, course_ids)
+        options = self.get_options(request)
+        options['commit'] = commit
+        job = CourseJob.objects.create(
+            command=self.command,
+            course_ids=course_ids,
+            options=json.dumps(options),
+            requested_by=user
+        )
+        run_course_job.delay(job.id)
 
-            if not course_ids:
-                return HttpResponse('No course_ids specified.', status=400)
+        return JsonResponse(serialize_course_job(job), status=202)
 
-            course_ids = course_ids.split(',')
 
-            call_command('migrate_course', *course_ids, access_token=user.access_token, commit=commit,
-                         partner_short_code=partner.short_code, settings=os.environ['DJANGO_SETTINGS_MODULE'],
-                         stdout=out, stderr=err)
+class CourseMigrationView(CourseJobSubmissionView):
+    command = CourseJob.MIGRATE_COURSE
+    log_message = u'User [%s] requested course migration for [%s]. '
 
-            # Format the output for display
-            output = u'STDOUT\n{out}\n\nSTDERR\n{err}\n\nLOG\n{log}'.format(out=out.getvalue(), err=err.getvalue(),
-                                                                            log=log.getvalue())
+    def get_options(self, request):
+        return {'site_domain': request.site.domain}
 
-            return HttpResponse(output, content_type='text/plain')
-        finally:
-            # Remove the log capture handler and close all streams
-            root_logger.removeHandler(log_handler)
-            log.close()
-            out.close()
-            err.close()
 
+class ConvertCourseView(CourseJobSubmissionView):
+    # TODO If this is not immediately deleted after we convert courses, make sure this is updated to support
+    # multi-tenancy.
+    command = CourseJob.CONVERT_COURSE
+    log_message = u'User [%s] requested conversion of honor seats to audit seats for [%s]. '
 
-class ConvertCourseView(View):
-    def dispatch(self, request, *args, **kwargs):
-        if not request.user.is_superuser:
-            raise Http404
+    def get_options(self, request):
+        return {
+            'direction': request.POST.get('direction', 'honor_to_audit'),
+            'partner': request.POST.get('partner'),
+        }
 
-        return super(ConvertCourseView, self).dispatch(request, *args, **kwargs)
 
-    def get(self, request, *_args, **_kwargs):
-        # TODO If this is not immediately deleted after we convert courses, make sure this is updated to support
-        # multi-tenancy.
-        course_ids = request.GET.get('course_ids')
-        commit = request.GET.get('commit', False)
-        commit = commit in ('1', 'true')
-        direction = request.GET.get('direction', 'honor_to_audit')
-        partner = request.GET.get('partner')
-
-        # Capture all output and logging
-        out = StringIO()
-        err = StringIO()
-        log = StringIO()
-
-        root_logger = logging.getLogger()
-        log_handler = logging.StreamHandler(log)
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        log_handler.setFormatter(formatter)
-        root_logger.addHandler(log_handler)
-
-        try:
-            # Log who ran this request
-            msg = u'User [%s] requested conversion of honor seats to audit seats for [%s]. '
-            if commit:  # pragma: no cover
-                msg += u'The changes will be committed to the database.'
-            else:
-                msg += u'The changes will NOT be committed to the database.'
-
-            user = request.user
-            logger.info(msg, user.username, course_ids)
-
-            if not course_ids:
-                return HttpResponse('No course_ids specified.', status=400)
-
-            course_ids = course_ids.split(',')
-
-            call_command(
-                'convert_course', *course_ids, access_token=user.access_token, commit=commit, partner=partner,
-                settings=os.environ['DJANGO_SETTINGS_MODULE'], stdout=out, stderr=err, direction=direction
-            )
-
-            # Format the output for display
-            output = u'STDOUT\n{out}\n\nSTDERR\n{err}\n\nLOG\n{log}'.format(out=out.getvalue(), err=err.getvalue(),
-                                                                            log=log.getvalue())
-
-            return HttpResponse(output, content_type='text/plain')
-        finally:
-            # Remove the log capture handler and close all streams
-            root_logger.removeHandler(log_handler)
-            log.close()
-            out.close()
-            err.close()
+class CourseJobView(SuperuserOnlyMixin, View):
+    """ Returns the status, and output, of a CourseJob. """
+
+    def get(self, request, pk, *_args, **_kwargs):
+        job = get_object_or_404(CourseJob, pk=pk)
+        return JsonResponse(serialize_course_job(job))
+
+
+class CancelCourseJobView(SuperuserOnlyMixin, View):
+    """ Cancels a CourseJob that has not yet finished. """
+
+    def post(self, request, pk, *_args, **_kwargs):
+        job = get_object_or_404(CourseJob, pk=pk)
+        if job.cancel():
+            logger.info(u'User [%s] cancelled course job [%d].', request.user.username, job.id)
+            status = 200
+        else:
+            status = 409
+
+        return JsonResponse(serialize_course_job(job), status=status)
@@ -9,6 +9,7 @@ from datetime import timedelta
 import ddt
 import httpretty
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.utils import timezone
 from oscar.core.loading import get_model
@@ -34,6 +35,7 @@ class CheckoutPageTest(CourseCatalogTestMixin, TestCase, JwtMixin):
 
     def setUp(self):
         super(CheckoutPageTest, self).setUp()
+        cache.clear()
 
         user = self.create_user(is_superuser=False)
         self.create_access_token(user)
@@ -207,6 +209,28 @@ class CheckoutPageTest(CourseCatalogTestMixin, TestCase, JwtMixin):
 
         self._assert_success_checkout_page()
 
+    @httpretty.activate
+    def test_credit_api_responses_cached(self):
+        """ Verify eligibility and provider details are cached, so that reloading the page does not call LMS. """
+        self._mock_eligibility_api(body=self.eligibilities)
+        self._mock_providers_api(body=self.provider_data)
+        self._assert_success_checkout_page()
+
+        httpretty.reset()
+        self._mock_eligibility_api(body=[], status=500)
+        self._mock_providers_api(body=[], status=500)
+        self._assert_success_checkout_page()
+
+    @httpretty.activate
+    def test_eligibility_api_failure_not_cached(self):
+        """ Verify a failure to retrieve eligibility is not cached. """
+        self._mock_eligibility_api(body=[], status=500)
+        self._assert_error_without_deadline()
+
+        self._mock_eligibility_api(body=self.eligibilities)
+        self._mock_providers_api(body=self.provider_data)
+        self._assert_success_checkout_page()
+
     @httpretty.activate
     def test_get_checkout_page_with_audit_seats(self):
         """ Verify the page loads with the proper context, if all Credit API
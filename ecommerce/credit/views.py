@@ -1,9 +1,12 @@
 from __future__ import unicode_literals
 
+import hashlib
 import logging
 
 from dateutil.parser import parse
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.utils.functional import cached_property
@@ -16,6 +19,7 @@ from slumber.exceptions import SlumberHttpBaseException
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.models import Course
 from ecommerce.extensions.analytics.utils import prepare_analytics_data
+from ecommerce.extensions.checkout.utils import get_credit_providers
 from ecommerce.extensions.offer.utils import format_benefit_value
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
 
@@ -48,6 +52,7 @@ class Checkout(TemplateView):
         strategy = self.request.strategy
         # Audit seats do not have a `certificate_type` attribute, so
         # we use getattr to avoid an exception.
+        # Each seat is paired with the stock record of the site's partner, which is used to price it.
         credit_seats = []
 
         for seat in course.seat_products:
@@ -55,8 +60,12 @@ class Checkout(TemplateView):
                 continue
 
             purchase_info = strategy.fetch_for_product(seat)
-            if purchase_info.availability.is_available_to_buy and seat.stockrecords.filter(partner=partner).exists():
-                credit_seats.append(seat)
+            if not purchase_info.availability.is_available_to_buy:
+                continue
+
+            stockrecord = seat.stockrecords.filter(partner=partner).first()
+            if stockrecord:
+                credit_seats.append((seat, stockrecord))
 
         if not credit_seats:
             msg = _(
@@ -99,6 +108,8 @@ class Checkout(TemplateView):
     def _check_credit_eligibility(self, user, course_key):
         """ Check that the user is eligible for credit.
 
+        Eligibility is cached briefly, so that reloading the page does not query LMS again.
+
         Arguments:
             user(User): User object for which checking the eligibility.
             course_key(string): The course identifier.
@@ -106,8 +117,19 @@ class Checkout(TemplateView):
         Returns:
             Eligibility deadline date or None if user is not eligible.
         """
+        cache_key = 'credit_eligibility_{site_id}_{username}_{course_key}'.format(
+            site_id=self.request.site.id,
+            username=user.username,
+            course_key=course_key
+        )
+        cache_key = hashlib.md5(cache_key.encode('utf-8')).hexdigest()
+
         try:
-            eligibilities = self.credit_api_client.eligibility.get(username=user.username, course_key=course_key)
+            eligibilities = cache.get(cache_key)
+            if eligibilities is None:
+                eligibilities = self.credit_api_client.eligibility.get(username=user.username, course_key=course_key)
+                cache.set(cache_key, eligibilities, settings.CREDIT_ELIGIBILITY_CACHE_TIMEOUT)
+
             if not eligibilities:
                 return None
 
@@ -126,7 +148,7 @@ class Checkout(TemplateView):
         """ Get details for the credit providers for the given credit seats.
 
         Arguments:
-            credit_seats (Products[]): List of credit_seats objects.
+            credit_seats (list): List of (seat, stockrecord) tuples.
 
         Returns:
             A list of dictionaries with provider(s) detail.
@@ -141,13 +163,12 @@ class Checkout(TemplateView):
         if not providers:
             return None
 
+        # Copy the provider details, so that the pricing of this request is never shared with others.
         providers_dict = {}
         for provider in providers:
-            providers_dict[provider['id']] = provider
+            providers_dict[provider['id']] = dict(provider)
 
-        partner = get_partner_for_site(self.request)
-        for seat in credit_seats:
-            stockrecord = seat.stockrecords.filter(partner=partner).first()
+        for seat, stockrecord in credit_seats:
             new_price = None
             discount = None
             if code:
@@ -170,20 +191,20 @@ class Checkout(TemplateView):
     def _get_providers_from_lms(self, credit_seats):
         """ Helper method for getting provider info from LMS.
 
+        Provider details are cached per site, so LMS is only queried for providers that are not cached.
+
         Arguments:
-            credit_seats (Products): List of credit_seats objects.
+            credit_seats (list): List of (seat, stockrecord) tuples.
 
         Returns:
-            Response from LMS as json, containing list of providers.
+            List of providers, or None if they could not be retrieved.
         """
+        provider_ids = []
+        for seat, __ in credit_seats:
+            if seat.attr.credit_provider and seat.attr.credit_provider not in provider_ids:
+                provider_ids.append(seat.attr.credit_provider)
 
-        provider_ids = ",".join([seat.attr.credit_provider for seat in credit_seats if seat.attr.credit_provider])
-
-        try:
-            return self.credit_api_client.providers.get(provider_ids=provider_ids)
-        except SlumberHttpBaseException:
-            logger.exception('An error occurred while retrieving credit provider details.')
-            return None
+        return get_credit_providers(self.request.user.access_token, provider_ids, self.request.site.siteconfiguration)
 
     @cached_property
     def credit_api_client(self):
@@ -0,0 +1,117 @@
+"""
+Management command that rolls up the orders placed on each site into hourly statistics, and counts the
+orders on each site with each status.
+
+The command is meant to be run on a schedule (e.g. every few minutes, by cron). Each run only recomputes
+the hours since the previous run, so the dashboard can report on orders without scanning the order table.
+"""
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+from datetime import timedelta
+from decimal import Decimal
+import logging
+
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+
+from ecommerce.core.routers import use_read_replica
+from ecommerce.extensions.analytics.utils import truncate_to_hour
+
+HourlyOrderStatistics = get_model('analytics', 'HourlyOrderStatistics')
+Order = get_model('order', 'Order')
+OrderStatusStatistics = get_model('analytics', 'OrderStatusStatistics')
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Update the hourly order statistics displayed on the dashboard.'
+
+    # Number of hours, before the latest hour already rolled up, which are recomputed on every run. This picks
+    # up orders whose transactions were committed after the previous run rolled up the hour they were placed in.
+    overlap_hours = 1
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours',
+                            action='store',
+                            dest='hours',
+                            default=None,
+                            type=int,
+                            help='Recompute the statistics of this many hours, up to and including the current '
+                                 'one, rather than those of the hours since the previous run.')
+
+    def handle(self, *args, **options):
+        start = self.get_start(options['hours'])
+        statistics = self.compute_statistics(start)
+        status_statistics = self.compute_status_statistics()
+
+        with transaction.atomic():
+            HourlyOrderStatistics.objects.filter(hour__gte=start).delete()
+            HourlyOrderStatistics.objects.bulk_create(statistics)
+            OrderStatusStatistics.objects.all().delete()
+            OrderStatusStatistics.objects.bulk_create(status_statistics)
+
+        logger.info('Updated [%d] hourly order statistics, starting at [%s].', len(statistics), start)
+
+    def get_start(self, hours):
+        """ Returns the start of the first hour whose statistics should be recomputed. """
+        current_hour = truncate_to_hour(now())
+        if hours:
+            return current_hour - timedelta(hours=hours - 1)
+
+        latest = HourlyOrderStatistics.objects.aggregate(Max('hour'))['hour__max']
+        if latest:
+            return min(latest, current_hour) - timedelta(hours=self.overlap_hours)
+
+        # Nothing has been rolled up yet. Start with the first order ever placed.
+        first = Order.objects.aggregate(Min('date_placed'))['date_placed__min']
+        return truncate_to_hour(first) if first else current_hour
+
+    @use_read_replica
+    def compute_statistics(self, start):
+        """
+        Computes the statistics of the orders placed on each site, during each hour since the given start.
+
+        Orders are read from a read replica, if one is configured. Orders the replica has not received yet
+        are picked up by the next run, which recomputes the overlapping hours.
+
+        Returns:
+            list: Unsaved HourlyOrderStatistics.
+        """
+        orders = Order.objects.filter(date_placed__gte=start).order_by().annotate(num_lines=Count('lines'))
+
+        statistics = OrderedDict()
+        for site_id, date_placed, total, num_lines in orders.values_list(
+                'site_id', 'date_placed', 'total_incl_tax', 'num_lines').iterator():
+            hour = truncate_to_hour(date_placed)
+            stats = statistics.get((site_id, hour))
+            if stats is None:
+                stats = statistics[(site_id, hour)] = HourlyOrderStatistics(
+                    site_id=site_id, hour=hour, revenue=Decimal(0), paid_revenue=Decimal(0)
+                )
+
+            stats.num_orders += 1
+            stats.num_lines += num_lines
+            stats.revenue += total
+            if total > 0:
+                stats.num_paid_orders += 1
+                stats.paid_revenue += total
+
+        return statistics.values()
+
+    @use_read_replica
+    def compute_status_statistics(self):
+        """
+        Counts the orders on each site with each status, with a single aggregate query.
+
+        Returns:
+            list: Unsaved OrderStatusStatistics.
+        """
+        return [
+            OrderStatusStatistics(site_id=row['site_id'], status=row['status'], num_orders=row['num_orders'])
+            for row in Order.objects.order_by().values('site_id', 'status').annotate(num_orders=Count('id'))
+        ]
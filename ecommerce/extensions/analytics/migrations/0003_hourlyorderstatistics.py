@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0001_initial'),
+        ('analytics', '0002_auto_20140827_1705'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HourlyOrderStatistics',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('hour', models.DateTimeField(help_text='Start of the hour during which the orders were placed.', verbose_name='Hour')),
+                ('num_orders', models.PositiveIntegerField(default=0, verbose_name='Number of Orders')),
+                ('num_lines', models.PositiveIntegerField(default=0, verbose_name='Number of Lines')),
+                ('revenue', models.DecimalField(default=0, verbose_name='Revenue (inc. tax)', max_digits=12, decimal_places=2)),
+                ('num_paid_orders', models.PositiveIntegerField(default=0, verbose_name='Number of Paid Orders')),
+                ('paid_revenue', models.DecimalField(default=0, verbose_name='Paid Revenue (inc. tax)', max_digits=12, decimal_places=2)),
+                ('site', models.ForeignKey(verbose_name='Site', blank=True, to='sites.Site', null=True)),
+            ],
+            options={
+                'ordering': ('hour',),
+                'verbose_name_plural': 'Hourly order statistics',
+            },
+        ),
+        migrations.AlterIndexTogether(
+            name='hourlyorderstatistics',
+            index_together=set([('site', 'hour')]),
+        ),
+    ]
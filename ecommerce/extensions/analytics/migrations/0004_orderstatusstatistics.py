@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sites', '0001_initial'),
+        ('analytics', '0003_hourlyorderstatistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderStatusStatistics',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('status', models.CharField(max_length=100, verbose_name='Status', blank=True)),
+                ('num_orders', models.PositiveIntegerField(default=0, verbose_name='Number of Orders')),
+                ('site', models.ForeignKey(verbose_name='Site', blank=True, to='sites.Site', null=True)),
+            ],
+            options={
+                'ordering': ('status',),
+                'verbose_name_plural': 'Order status statistics',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='orderstatusstatistics',
+            unique_together=set([('site', 'status')]),
+        ),
+    ]
@@ -1 +1,50 @@
-from oscar.apps.analytics.models import *  # pragma: no cover pylint: disable=wildcard-import,unused-wildcard-import
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+
+
+class HourlyOrderStatistics(models.Model):
+    """
+    Statistics of the orders placed on a site during an hour.
+
+    These are maintained by the update_order_statistics management command, and allow the dashboard to
+    report on orders without scanning the order table.
+    """
+    site = models.ForeignKey('sites.Site', verbose_name=_('Site'), null=True, blank=True, on_delete=models.CASCADE)
+    hour = models.DateTimeField(_('Hour'), help_text=_('Start of the hour during which the orders were placed.'))
+    num_orders = models.PositiveIntegerField(_('Number of Orders'), default=0)
+    num_lines = models.PositiveIntegerField(_('Number of Lines'), default=0)
+    revenue = models.DecimalField(_('Revenue (inc. tax)'), decimal_places=2, max_digits=12, default=0)
+    num_paid_orders = models.PositiveIntegerField(_('Number of Paid Orders'), default=0)
+    paid_revenue = models.DecimalField(_('Paid Revenue (inc. tax)'), decimal_places=2, max_digits=12, default=0)
+
+    class Meta(object):
+        index_together = ('site', 'hour')
+        ordering = ('hour',)
+        verbose_name_plural = 'Hourly order statistics'
+
+    def __unicode__(self):
+        return u'{site} - {hour}'.format(site=self.site_id, hour=self.hour)
+
+
+class OrderStatusStatistics(models.Model):
+    """
+    Number of orders on a site with each status.
+
+    These are maintained by the update_order_statistics management command. Since the status of an order
+    changes after it is placed, they are recomputed in full by every run.
+    """
+    site = models.ForeignKey('sites.Site', verbose_name=_('Site'), null=True, blank=True, on_delete=models.CASCADE)
+    status = models.CharField(_('Status'), max_length=100, blank=True)
+    num_orders = models.PositiveIntegerField(_('Number of Orders'), default=0)
+
+    class Meta(object):
+        ordering = ('status',)
+        unique_together = ('site', 'status')
+        verbose_name_plural = 'Order status statistics'
+
+    def __unicode__(self):
+        return u'{site} - {status}'.format(site=self.site_id, status=self.status)
+
+
+# noinspection PyUnresolvedReferences
+from oscar.apps.analytics.models import *  # noqa pylint: disable=wildcard-import,unused-wildcard-import,wrong-import-position
@@ -0,0 +1,117 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+from oscar.test.factories import OrderFactory, OrderLineFactory
+
+from ecommerce.extensions.analytics.utils import truncate_to_hour
+from ecommerce.tests.factories import SiteFactory
+from ecommerce.tests.testcases import TestCase
+
+HourlyOrderStatistics = get_model('analytics', 'HourlyOrderStatistics')
+Order = get_model('order', 'Order')
+OrderStatusStatistics = get_model('analytics', 'OrderStatusStatistics')
+
+
+class UpdateOrderStatisticsTests(TestCase):
+    command = 'update_order_statistics'
+
+    def setUp(self):
+        super(UpdateOrderStatisticsTests, self).setUp()
+        self.current_hour = truncate_to_hour(now())
+
+    def create_order(self, total, hours_ago=0, site=None):
+        """ Creates an order, placed on the given site the given number of hours ago. """
+        order = OrderFactory(site_id=(site or self.site).id, total_incl_tax=total, total_excl_tax=total)
+        Order.objects.filter(pk=order.pk).update(date_placed=now() - timedelta(hours=hours_ago))
+        return order
+
+    def assert_statistics(self, expected):
+        """ Verifies the rolled up statistics, given as tuples of site, hours ago, orders, paid orders and revenue. """
+        actual = [
+            (stats.site, stats.hour, stats.num_orders, stats.num_paid_orders, stats.revenue)
+            for stats in HourlyOrderStatistics.objects.order_by('hour', 'site_id')
+        ]
+        expected = [
+            (site, self.current_hour - timedelta(hours=hours_ago), num_orders, num_paid_orders, Decimal(revenue))
+            for site, hours_ago, num_orders, num_paid_orders, revenue in expected
+        ]
+        self.assertEqual(actual, expected)
+
+    def test_statistics(self):
+        """ Verify the orders are rolled up per site and per hour. """
+        other_site = SiteFactory()
+        self.create_order(10, hours_ago=5)
+        self.create_order(0, hours_ago=5)
+        self.create_order(20, hours_ago=5, site=other_site)
+        order = self.create_order(30)
+        OrderLineFactory(order=order)
+
+        call_command(self.command)
+
+        self.assert_statistics([
+            (self.site, 5, 2, 1, '10.00'),
+            (other_site, 5, 1, 1, '20.00'),
+            (self.site, 0, 1, 1, '30.00'),
+        ])
+        self.assertEqual(HourlyOrderStatistics.objects.get(hour=self.current_hour).num_lines, 1)
+        self.assertEqual(HourlyOrderStatistics.objects.get(hour=self.current_hour).paid_revenue, Decimal('30.00'))
+
+    def test_incremental_update(self):
+        """ Verify only the hours since the previous run are recomputed. """
+        self.create_order(10, hours_ago=5)
+        self.create_order(20, hours_ago=1)
+        call_command(self.command)
+
+        # Orders which were placed long ago, but not yet rolled up, are not picked up.
+        self.create_order(30, hours_ago=5)
+        self.create_order(40, hours_ago=1)
+        self.create_order(50)
+        call_command(self.command)
+
+        self.assert_statistics([
+            (self.site, 5, 1, 1, '10.00'),
+            (self.site, 1, 2, 2, '60.00'),
+            (self.site, 0, 1, 1, '50.00'),
+        ])
+
+        # The statistics of all hours can be recomputed on demand.
+        call_command(self.command, hours=24)
+        self.assert_statistics([
+            (self.site, 5, 2, 2, '40.00'),
+            (self.site, 1, 2, 2, '60.00'),
+            (self.site, 0, 1, 1, '50.00'),
+        ])
+
+    def test_status_statistics(self):
+        """ Verify the orders on each site with each status are counted, including those placed long ago. """
+        other_site = SiteFactory()
+        self.create_order(10, hours_ago=48)
+        self.create_order(20)
+        self.create_order(30, site=other_site)
+        Order.objects.filter(total_incl_tax=10).update(status='Complete')
+        Order.objects.exclude(total_incl_tax=10).update(status='Open')
+
+        call_command(self.command, hours=1)
+
+        actual = [
+            (stats.site, stats.status, stats.num_orders)
+            for stats in OrderStatusStatistics.objects.order_by('site_id', 'status')
+        ]
+        self.assertEqual(actual, [(self.site, 'Complete', 1), (self.site, 'Open', 1), (other_site, 'Open', 1)])
+
+        # Counts are recomputed in full, as statuses change after orders are placed.
+        Order.objects.update(status='Complete')
+        call_command(self.command)
+        self.assertEqual(
+            list(OrderStatusStatistics.objects.filter(site=self.site).values_list('status', 'num_orders')),
+            [('Complete', 2)]
+        )
+
+    def test_no_orders(self):
+        """ Verify the command succeeds when no orders have been placed. """
+        call_command(self.command)
+        self.assertFalse(HourlyOrderStatistics.objects.exists())
+        self.assertFalse(OrderStatusStatistics.objects.exists())
@@ -122,3 +122,8 @@ def prepare_analytics_data(user, segment_key, course_id=None):
         }
     data.update(user_data)
     return json.dumps(data)
+
+
+def truncate_to_hour(value):
+    """ Returns the start of the hour containing the given datetime. """
+    return value.replace(minute=0, second=0, microsecond=0)
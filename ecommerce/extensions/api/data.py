@@ -23,6 +23,40 @@ def get_product(sku):
         )
 
 
+def get_products(skus):
+    """Retrieve the products corresponding to the provided SKUs.
+
+    The products, and their stock records, are retrieved with a constant number of queries,
+    regardless of the number of SKUs.
+
+    Arguments:
+        skus (list): SKUs of the products to retrieve.
+
+    Returns:
+        list: Products corresponding to the SKUs, in the same order.
+
+    Raises:
+        ProductNotFoundError: If no product corresponds to one of the SKUs.
+    """
+    products = Product.objects.filter(
+        stockrecords__partner_sku__in=set(skus)
+    ).distinct().select_related(
+        'product_class', 'parent__product_class'
+    ).prefetch_related('stockrecords')
+
+    products_by_sku = {}
+    for product in products:
+        for stockrecord in product.stockrecords.all():
+            products_by_sku[stockrecord.partner_sku] = product
+
+    try:
+        return [products_by_sku[sku] for sku in skus]
+    except KeyError as error:
+        raise exceptions.ProductNotFoundError(
+            exceptions.PRODUCT_NOT_FOUND_DEVELOPER_MESSAGE.format(sku=error.args[0])
+        )
+
+
 def get_order_metadata(basket):
     """Retrieve information required to place an order.
 
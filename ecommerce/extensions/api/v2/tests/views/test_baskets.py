@@ -5,8 +5,11 @@ import json
 
 import ddt
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 import mock
 from oscar.core.loading import get_model
 from oscar.test import factories
@@ -147,6 +150,28 @@ class BasketCreateViewTests(BasketCreationMixin, ThrottlingMixin, TransactionTes
             )
         )
 
+    # Prevent the cached sites from being refreshed between the requests being compared.
+    @override_settings(SITE_CONFIGURATION_CACHE_CHECK_INTERVAL=3600)
+    def test_query_count_independent_of_sku_count(self):
+        """ Verify the number of queries made to create a basket does not depend on the number of SKUs. """
+        def count_queries(skus):
+            with CaptureQueriesContext(connection) as context:
+                response = self.create_basket(skus=skus)
+                self.assertEqual(response.status_code, 200)
+            return len(context)
+
+        # Feature switches toggled by earlier tests may otherwise not be cached by the requests being compared.
+        cache.clear()
+
+        # The first request also creates the user.
+        count_queries([self.FREE_SKU])
+
+        single = count_queries([self.PAID_SKU])
+        multiple = count_queries([self.PAID_SKU, self.ALTERNATE_PAID_SKU, self.FREE_SKU])
+        self.assertEqual(single, multiple)
+
+        self.assertEqual(Basket.objects.latest('id').lines.count(), 3)
+
     def test_sku_missing(self):
         """Test that requests without a SKU fail with appropriate messaging."""
         request_data = {'products': [{'not-sku': 'foo'}]}
@@ -9,7 +9,9 @@ import ddt
 import httpretty
 import pytz
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.utils.timezone import now
 from oscar.apps.catalogue.categories import create_from_breadcrumbs
 from oscar.core.loading import get_class, get_model
@@ -32,6 +34,7 @@ Basket = get_model('basket', 'Basket')
 Benefit = get_model('offer', 'Benefit')
 Catalog = get_model('catalogue', 'Catalog')
 Category = get_model('catalogue', 'Category')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
 Course = get_model('courses', 'Course')
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
@@ -696,6 +699,36 @@ class CouponViewSetFunctionalTest(CouponMixin, CourseCatalogTestMixin, CourseCat
         self.get_response_json('PUT', path, self.data)
         self.assertEqual(offer.email_domains, email_domains)
 
+    def test_update_multiple_multi_use_vouchers(self):
+        """ Verify coupon-wide edits apply to the individual offers of all vouchers, with a constant number of queries. """
+        self.data.update({'title': 'Multi-use coupon', 'voucher_type': Voucher.MULTI_USE, 'quantity': 5})
+        self.client.post(COUPONS_LINK, json.dumps(self.data), 'application/json')
+        coupon = Product.objects.get(title=self.data['title'])
+        vouchers = coupon.attr.coupon_vouchers.vouchers.all()
+        self.assertEqual(ConditionalOffer.objects.filter(vouchers__in=vouchers).distinct().count(), 5)
+
+        email_domains = 'example.com'
+        path = reverse('api:v2:coupons-detail', args=[coupon.id])
+        self.get_response_json('PUT', path, {'email_domains': email_domains})
+        offers = ConditionalOffer.objects.filter(vouchers__in=vouchers).distinct()
+        self.assertEqual([offer.email_domains for offer in offers], [email_domains] * 5)
+
+        def update_benefit_value(coupon, benefit_value):
+            with CaptureQueriesContext(connection) as queries:
+                CouponViewSet().update_coupon_benefit_value(
+                    benefit_value=benefit_value,
+                    vouchers=coupon.attr.coupon_vouchers.vouchers,
+                    coupon=coupon
+                )
+            return len(queries)
+
+        # The first update of each coupon creates the new offer.
+        update_benefit_value(coupon, 60)
+        update_benefit_value(self.coupon, 60)
+        self.assertEqual(update_benefit_value(coupon, 60), update_benefit_value(self.coupon, 60))
+        for voucher in vouchers:
+            self.assertEqual(voucher.offers.get().benefit.value, 60)
+
 
 class CouponCategoriesListViewTests(TestCase):
     """ Tests for the coupon category list view. """
@@ -8,6 +8,7 @@ from waffle.models import Switch
 
 from ecommerce.core.models import SiteConfiguration
 from ecommerce.extensions.payment.tests.processors import DummyProcessor, AnotherDummyProcessor
+from ecommerce.tests.factories import SiteConfigurationFactory
 from ecommerce.tests.testcases import TestCase
 
 
@@ -42,9 +43,10 @@ class PaymentProcessorListViewTests(TestCase):
         switch.active = active
         switch.save()
 
-    def assert_processor_list_matches(self, expected):
+    def assert_processor_list_matches(self, expected, domain=None):
         """ DRY helper. """
-        response = self.client.get(reverse('api:v2:payment:list_processors'), HTTP_AUTHORIZATION=self.token)
+        extra = {'SERVER_NAME': domain} if domain else {}
+        response = self.client.get(reverse('api:v2:payment:list_processors'), HTTP_AUTHORIZATION=self.token, **extra)
         self.assertEqual(response.status_code, 200)
         self.assertSetEqual(set(json.loads(response.content)), set(expected))
 
@@ -83,3 +85,29 @@ class PaymentProcessorListViewTests(TestCase):
         self.assert_processor_list_matches([DummyProcessor.NAME, AnotherDummyProcessor.NAME])
         self.toggle_payment_processor(DummyProcessor.NAME, False)
         self.assert_processor_list_matches([AnotherDummyProcessor.NAME])
+
+    @override_settings(PAYMENT_PROCESSORS=[
+        'ecommerce.extensions.payment.tests.processors.DummyProcessor',
+        'ecommerce.extensions.payment.tests.processors.AnotherDummyProcessor',
+    ])
+    def test_cache_per_site(self):
+        """ Verify each site is served the processors enabled for it, rather than those cached for another site. """
+        SiteConfigurationFactory(
+            site__domain='other.fake', partner__name='Other', payment_processors=AnotherDummyProcessor.NAME
+        )
+
+        self.assert_processor_list_matches([DummyProcessor.NAME, AnotherDummyProcessor.NAME])
+        self.assert_processor_list_matches([AnotherDummyProcessor.NAME], domain='other.fake')
+
+    @override_settings(PAYMENT_PROCESSORS=[
+        'ecommerce.extensions.payment.tests.processors.DummyProcessor',
+        'ecommerce.extensions.payment.tests.processors.AnotherDummyProcessor',
+    ])
+    def test_site_configuration_change_clears_cache(self):
+        """ Verify the cached list is no longer served once the site configuration has changed. """
+        self.assert_processor_list_matches([DummyProcessor.NAME, AnotherDummyProcessor.NAME])
+
+        site_config = SiteConfiguration.objects.get(site__id=1)
+        site_config.payment_processors = DummyProcessor.NAME
+        site_config.save()
+        self.assert_processor_list_matches([DummyProcessor.NAME])
@@ -243,3 +243,50 @@ class RefundProcessViewTests(ThrottlingMixin, TestCase):
             response = self.put(decision)
             self.assertEqual(response.status_code, 500)
             self.assertEqual(response.data, RefundSerializer(self.refund).data)
+
+
+@ddt.ddt
+class RefundBulkProcessViewTests(ThrottlingMixin, TestCase):
+    path = reverse('api:v2:refunds:bulk_process')
+
+    def setUp(self):
+        super(RefundBulkProcessViewTests, self).setUp()
+
+        self.user = self.create_user(is_staff=True)
+        self.client.login(username=self.user.username, password=self.password)
+        self.refunds = [RefundFactory(user=self.user), RefundFactory(user=self.user)]
+        self.refund_ids = [refund.id for refund in self.refunds]
+
+    def post(self, action, refund_ids=None):
+        data = json.dumps({'action': action, 'refund_ids': refund_ids or self.refund_ids})
+        return self.client.post(self.path, data, JSON_CONTENT_TYPE)
+
+    def test_staff_only(self):
+        """ The view should only be accessible to staff users. """
+        user = self.create_user(is_staff=False)
+        self.client.login(username=user.username, password=self.password)
+        response = self.post('approve')
+        self.assertEqual(response.status_code, 403)
+
+    @ddt.data(('deny', None), ('approve', ['foo']))
+    @ddt.unpack
+    def test_invalid_data(self, action, refund_ids):
+        """ If the action is not an approval, or the refund IDs are not valid, the view should return HTTP 400. """
+        response = self.post(action, refund_ids)
+        self.assertEqual(response.status_code, 400)
+
+    @ddt.data(
+        ('approve', True, True, 200),
+        ('approve_payment_only', False, True, 200),
+        ('approve', True, False, 500),
+    )
+    @ddt.unpack
+    def test_process(self, action, revoke_fulfillment, result, expected_status):
+        """ The view should approve the refunds in bulk, and return the serialized refunds. """
+        with mock.patch('ecommerce.extensions.api.v2.views.refunds.approve_refunds') as mock_approve:
+            mock_approve.return_value = {self.refund_ids[0]: True, self.refund_ids[1]: result}
+            response = self.post(action, self.refund_ids + [self.refund_ids[0]])
+
+        mock_approve.assert_called_once_with(set(self.refund_ids), revoke_fulfillment=revoke_fulfillment)
+        self.assertEqual(response.status_code, expected_status)
+        self.assertEqual(response.data, RefundSerializer(self.refunds, many=True).data)
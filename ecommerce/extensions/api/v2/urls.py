@@ -45,6 +45,7 @@ PAYMENT_URLS = [
 
 REFUND_URLS = [
     url(r'^$', refund_views.RefundCreateView.as_view(), name='create'),
+    url(r'^process/$', refund_views.RefundBulkProcessView.as_view(), name='bulk_process'),
     url(r'^(?P<pk>[\d]+)/process/$', refund_views.RefundProcessView.as_view(), name='process'),
 ]
 
@@ -138,24 +138,24 @@ class BasketCreateView(EdxOrderPlacementMixin, generics.CreateAPIView):
 
             requested_products = request.data.get('products')
             if requested_products:
-                for requested_product in requested_products:
-                    # Ensure the requested products exist
-                    sku = requested_product.get('sku')
-                    if sku:
-                        try:
-                            product = data_api.get_product(sku)
-                        except api_exceptions.ProductNotFoundError as error:
-                            return self._report_bad_request(
-                                error.message,
-                                api_exceptions.PRODUCT_NOT_FOUND_USER_MESSAGE
-                            )
-                    else:
-                        return self._report_bad_request(
-                            api_exceptions.SKU_NOT_FOUND_DEVELOPER_MESSAGE,
-                            api_exceptions.SKU_NOT_FOUND_USER_MESSAGE
-                        )
+                skus = [requested_product.get('sku') for requested_product in requested_products]
+                if not all(skus):
+                    return self._report_bad_request(
+                        api_exceptions.SKU_NOT_FOUND_DEVELOPER_MESSAGE,
+                        api_exceptions.SKU_NOT_FOUND_USER_MESSAGE
+                    )
+
+                # Ensure the requested products exist. All of them are retrieved at once.
+                try:
+                    products = data_api.get_products(skus)
+                except api_exceptions.ProductNotFoundError as error:
+                    return self._report_bad_request(
+                        error.message,
+                        api_exceptions.PRODUCT_NOT_FOUND_USER_MESSAGE
+                    )
 
-                    # Ensure the requested products are available for purchase before adding them to the basket
+                # Ensure the requested products are available for purchase before adding them to the basket
+                for sku, product in zip(skus, products):
                     availability = basket.strategy.fetch_for_product(product).availability
                     if not availability.is_available_to_buy:
                         return self._report_bad_request(
@@ -166,11 +166,12 @@ class BasketCreateView(EdxOrderPlacementMixin, generics.CreateAPIView):
                             api_exceptions.PRODUCT_UNAVAILABLE_USER_MESSAGE
                         )
 
-                    basket.add_product(product)
-                    logger.info('Added product with SKU [%s] to basket [%d]', sku, basket_id)
+                basket.add_products(products)
+                logger.info('Added products with SKUs [%s] to basket [%d]', ', '.join(skus), basket_id)
 
-                    # Call signal handler to notify listeners that something has been added to the basket
-                    basket_addition = get_class('basket.signals', 'basket_addition')
+                # Call signal handler to notify listeners that something has been added to the basket
+                basket_addition = get_class('basket.signals', 'basket_addition')
+                for product in products:
                     basket_addition.send(sender=basket_addition, product=product, user=request.user,
                                          request=request, basket=basket)
             else:
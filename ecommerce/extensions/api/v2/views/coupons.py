@@ -14,6 +14,7 @@ from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
 from ecommerce.core.models import BusinessClient
+from ecommerce.core.routers import read_replica
 from ecommerce.coupons.utils import prepare_course_seat_types
 from ecommerce.extensions.api import data as data_api
 from ecommerce.extensions.api.filters import ProductFilter
@@ -29,6 +30,7 @@ from ecommerce.invoice.models import Invoice
 Basket = get_model('basket', 'Basket')
 Catalog = get_model('catalogue', 'Catalog')
 Category = get_model('catalogue', 'Category')
+ConditionalOffer = get_model('offer', 'ConditionalOffer')
 logger = logging.getLogger(__name__)
 Order = get_model('order', 'Order')
 Product = get_model('catalogue', 'Product')
@@ -37,6 +39,10 @@ ProductClass = get_model('catalogue', 'ProductClass')
 Range = get_model('offer', 'Range')
 StockRecord = get_model('partner', 'StockRecord')
 Voucher = get_model('voucher', 'Voucher')
+VoucherOffer = Voucher.offers.through
+
+# Number of voucher-offer links inserted by each query, when the offers of a coupon's vouchers are replaced.
+VOUCHER_OFFER_BATCH_SIZE = 1000
 
 
 class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
@@ -51,6 +57,10 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
             return CouponListSerializer
         return CouponSerializer
 
+    def list(self, request, *args, **kwargs):
+        with read_replica():
+            return super(CouponViewSet, self).list(request, *args, **kwargs)
+
     def create(self, request, *args, **kwargs):
         """Adds coupon to the user's basket.
 
@@ -255,10 +265,12 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
 
         if 'email_domains' in request.data:
             email_domains = request.data.get('email_domains')
-            # Need to update for individual vouchers because in case of multiple
-            # multi-use voucher each voucher will have individual offer.
-            for voucher in vouchers.all():
-                voucher.offers.update(email_domains=email_domains)
+            # In case of multiple multi-use vouchers each voucher has an individual offer,
+            # so the offers of all of the vouchers are updated.
+            offer_ids = VoucherOffer.objects.filter(
+                voucher_id__in=vouchers.values('id')
+            ).values('conditionaloffer_id')
+            ConditionalOffer.objects.filter(id__in=offer_ids).update(email_domains=email_domains)
 
         self.update_invoice_data(coupon, request.data)
 
@@ -287,13 +299,16 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
     def update_coupon_benefit_value(self, benefit_value, coupon, vouchers):
         """
         Remove all offers from the vouchers and add a new offer
+
+        The offers of all of the vouchers are replaced with a single delete, and batched inserts,
+        rather than with queries for each voucher.
+
         Arguments:
             benefit_value (Decimal): Benefit value associated with a new offer
             coupon (Product): Coupon product associated with vouchers
             vouchers (ManyRelatedManager): Vouchers associated with the coupon to be updated
         """
-        voucher_offers = vouchers.first().offers
-        voucher_offer = voucher_offers.first()
+        voucher_offer = vouchers.first().offers.first()
 
         new_offer = update_voucher_offer(
             offer=voucher_offer,
@@ -302,9 +317,12 @@ class CouponViewSet(EdxOrderPlacementMixin, viewsets.ModelViewSet):
             coupon=coupon,
             max_uses=voucher_offer.max_global_applications
         )
-        for voucher in vouchers.all():
-            voucher.offers.clear()
-            voucher.offers.add(new_offer)
+        voucher_ids = list(vouchers.values_list('id', flat=True))
+        VoucherOffer.objects.filter(voucher_id__in=vouchers.values('id')).delete()
+        VoucherOffer.objects.bulk_create(
+            [VoucherOffer(voucher_id=voucher_id, conditionaloffer_id=new_offer.id) for voucher_id in voucher_ids],
+            batch_size=VOUCHER_OFFER_BATCH_SIZE
+        )
 
     def update_coupon_client(self, baskets, client_username):
         """
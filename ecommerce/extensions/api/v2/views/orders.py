@@ -8,6 +8,7 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated, DjangoModelPermissions
 from rest_framework.response import Response
 
+from ecommerce.core.routers import read_replica
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.filters import OrderFilter
 from ecommerce.extensions.api.permissions import IsStaffOrOwner
@@ -43,6 +44,12 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
 
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        # Orders are listed from a read replica. Single orders, which are often retrieved right after
+        # they are placed, are always retrieved from the default database.
+        with read_replica():
+            return super(OrderViewSet, self).list(request, *args, **kwargs)
+
     @detail_route(methods=['put', 'patch'])
     def fulfill(self, request, number=None):  # pylint: disable=unused-argument
         """ Fulfill order """
@@ -3,11 +3,32 @@ from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_extensions.cache.decorators import cache_response
 
+from ecommerce.core.cache_versions import get_versions
+from ecommerce.core.constants import SITE_CONFIGURATION_VERSION_CACHE_KEY
 from ecommerce.extensions.api import serializers
 
 
 PAYMENT_PROCESSOR_CACHE_KEY = 'PAYMENT_PROCESSOR_LIST'
 PAYMENT_PROCESSOR_CACHE_TIMEOUT = 60 * 30
+# Changed whenever a payment processor switch is toggled, invalidating the lists cached for all sites.
+PAYMENT_PROCESSOR_VERSION_CACHE_KEY = 'PAYMENT_PROCESSOR_LIST_VERSION'
+
+
+def get_payment_processor_cache_key(request, **kwargs):  # pylint: disable=unused-argument
+    """
+    Returns the key of the payment processor list cached for the request's site.
+
+    The key includes the versions of the site configurations and payment processor switches, so that
+    lists are no longer served once either has changed.
+    """
+    versions = get_versions([SITE_CONFIGURATION_VERSION_CACHE_KEY, PAYMENT_PROCESSOR_VERSION_CACHE_KEY])
+
+    return '{prefix}.{site_id}.{site_version}.{processor_version}'.format(
+        prefix=PAYMENT_PROCESSOR_CACHE_KEY,
+        site_id=request.site.id,
+        site_version=versions[SITE_CONFIGURATION_VERSION_CACHE_KEY],
+        processor_version=versions[PAYMENT_PROCESSOR_VERSION_CACHE_KEY]
+    )
 
 
 class PaymentProcessorListView(generics.ListAPIView):
@@ -24,7 +45,7 @@ class PaymentProcessorListView(generics.ListAPIView):
 
     @cache_response(
         PAYMENT_PROCESSOR_CACHE_TIMEOUT,
-        key_func=lambda *args, **kwargs: PAYMENT_PROCESSOR_CACHE_KEY,
+        key_func=get_payment_processor_cache_key,
         cache_errors=False,
     )
     def get(self, request):
@@ -1,4 +1,6 @@
 """HTTP endpoints for interacting with refunds."""
+import logging
+
 from django.contrib.auth import get_user_model
 from oscar.core.loading import get_model
 from rest_framework import status, generics
@@ -9,8 +11,10 @@ from rest_framework.response import Response
 from ecommerce.extensions.api import serializers
 from ecommerce.extensions.api.exceptions import BadRequestException
 from ecommerce.extensions.api.permissions import CanActForUser
-from ecommerce.extensions.refund.api import find_orders_associated_with_course, create_refunds
+from ecommerce.extensions.refund.api import approve_refunds, find_orders_associated_with_course, create_refunds
+
 
+logger = logging.getLogger(__name__)
 
 Refund = get_model('refund', 'Refund')
 User = get_user_model()
@@ -105,3 +109,46 @@ class RefundProcessView(generics.UpdateAPIView):
         http_status = status.HTTP_200_OK if result else status.HTTP_500_INTERNAL_SERVER_ERROR
         serializer = self.get_serializer(refund)
         return Response(serializer.data, status=http_status)
+
+
+class RefundBulkProcessView(generics.GenericAPIView):
+    """Approve many refunds at once.
+
+    The request body should contain the IDs of the refunds (refund_ids), and the action (approve or
+    approve_payment_only) to take. Credits are issued in bulk, as described by approve_refunds. The view
+    returns the serialized refunds, with HTTP status 200 if all of them were approved, and 500 otherwise.
+
+    Only staff users are permitted to use this view.
+    """
+    permission_classes = (IsAuthenticated, IsAdminUser,)
+    queryset = Refund.objects.all()
+    serializer_class = serializers.RefundSerializer
+
+    def post(self, request, *args, **kwargs):
+        APPROVE = 'approve'
+        APPROVE_PAYMENT_ONLY = 'approve_payment_only'
+
+        action = request.data.get('action', '').lower()
+
+        if action not in (APPROVE, APPROVE_PAYMENT_ONLY):
+            raise ParseError('The action [{}] is not valid.'.format(action))
+
+        refund_ids = request.data.get('refund_ids')
+        if not refund_ids or not isinstance(refund_ids, list):
+            raise ParseError('No refund_ids specified.')
+
+        try:
+            refund_ids = set(int(refund_id) for refund_id in refund_ids)
+        except (TypeError, ValueError):
+            raise ParseError('The refund_ids must be integers.')
+
+        results = approve_refunds(refund_ids, revoke_fulfillment=action == APPROVE)
+
+        missing = refund_ids.difference(results)
+        if missing:
+            logger.warning('Refunds %s do not exist, and were not approved.', sorted(missing))
+
+        refunds = self.get_queryset().filter(id__in=results.keys()).order_by('id')
+        http_status = status.HTTP_200_OK if results and all(results.values()) else status.HTTP_500_INTERNAL_SERVER_ERROR
+        serializer = self.get_serializer(refunds, many=True)
+        return Response(serializer.data, status=http_status)
@@ -116,8 +116,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
         for seat_type in course_seat_types.split(','):
             products.extend(Product.objects.filter(
                 course_id__in=nonexpired_course_ids if seat_type == 'professional' else all_course_ids,
-                attributes__name='certificate_type',
-                attribute_values__value_text=seat_type
+                certificate_type=seat_type
             ))
         stock_records = StockRecord.objects.filter(product__in=products)
         return products, stock_records
@@ -168,7 +167,7 @@ class VoucherViewSet(NonDestroyableModelViewSet):
                         continue
                 else:
                     continue
-                credit_seats = Product.objects.filter(parent=product.parent, attributes__name='credit_provider')
+                credit_seats = Product.objects.filter(parent=product.parent, credit_provider__isnull=False)
 
                 if credit_seats.count() > 1:
                     multiple_credit_providers = True
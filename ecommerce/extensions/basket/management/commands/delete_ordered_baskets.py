@@ -7,16 +7,29 @@ from __future__ import unicode_literals
 
 import time
 
-from django.core.management import BaseCommand
-from django.db import transaction
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.db.utils import OperationalError
 from oscar.core.loading import get_model
 
 Basket = get_model('basket', 'Basket')
+BasketAttribute = get_model('basket', 'BasketAttribute')
+Line = get_model('basket', 'Line')
+LineAttribute = get_model('basket', 'LineAttribute')
 
 
 class Command(BaseCommand):
     help = 'Delete baskets for which orders have been placed.'
 
+    # Bounds within which the batch size is adjusted.
+    min_batch_size = 10
+    max_batch_size = 10000
+
+    # MySQL errors raised by batches blocked by other connections: lock wait timeouts and deadlocks.
+    # Batches failing with these errors are retried. All other errors abort the command.
+    retryable_error_codes = (1205, 1213)
+
     def add_arguments(self, parser):
         # Batched deletion prevents the entire table from locking up as the command executes.
         parser.add_argument('-b', '--batch-size',
@@ -24,14 +37,47 @@ class Command(BaseCommand):
                             dest='batch_size',
                             default=1000,
                             type=int,
-                            help='Size of each batch of baskets to be deleted.')
+                            help='Size of the first batch of baskets to be deleted. The size of subsequent batches '
+                                 'is adjusted so that each batch takes roughly --target-seconds to delete.')
+        parser.add_argument('-t', '--target-seconds',
+                            action='store',
+                            dest='target_seconds',
+                            default=1.0,
+                            type=float,
+                            help='Target duration, in seconds, of each batch deletion.')
         # Sleeping between each batch deletion gives MySQL time to process other connections.
         parser.add_argument('-s', '--sleep-seconds',
                             action='store',
                             dest='sleep_seconds',
-                            default=3,
+                            default=1.0,
+                            type=float,
+                            help='Minimum seconds to sleep between each batch deletion. The command sleeps for at '
+                                 'least as long as the previous batch took to delete.')
+        parser.add_argument('--lock-wait-timeout',
+                            action='store',
+                            dest='lock_wait_timeout',
+                            default=2,
+                            type=int,
+                            help='Seconds a MySQL batch deletion may wait for row locks held by other connections. '
+                                 'Batches that time out are retried, with a smaller size, after sleeping.')
+        parser.add_argument('--max-retries',
+                            action='store',
+                            dest='max_retries',
+                            default=5,
+                            type=int,
+                            help='Number of times a batch that times out, or deadlocks, is retried before the '
+                                 'command fails.')
+        parser.add_argument('--replica',
+                            action='store',
+                            dest='replica',
+                            default=None,
+                            help='Alias of a MySQL replica database whose replication lag should be monitored.')
+        parser.add_argument('--max-replication-lag',
+                            action='store',
+                            dest='max_replication_lag',
+                            default=5,
                             type=int,
-                            help='Seconds to sleep between each batch deletion.')
+                            help='Seconds of replication lag above which deletion is paused.')
         parser.add_argument('--commit',
                             action='store_true',
                             dest='commit',
@@ -39,6 +85,10 @@ class Command(BaseCommand):
                             help='Actually delete the baskets.')
 
     def handle(self, *args, **options):
+        replica = options['replica']
+        if replica and replica not in settings.DATABASES:
+            raise CommandError('No database is configured with the alias [{}].'.format(replica))
+
         # Only select those baskets linked to an order, and those not linked to an invoice.
         # TODO: Simplify this query when the foreign key to Basket is removed from Invoice.
         queryset = Basket.objects.filter(order__isnull=False, invoice__isnull=True)
@@ -47,20 +97,7 @@ class Command(BaseCommand):
         if options['commit']:
             if count:
                 self.stderr.write('Deleting [{}] baskets.'.format(count))
-
-                batch_size = options['batch_size']
-                sleep_seconds = options['sleep_seconds']
-
-                max_id = queryset.order_by('-id')[0].id
-                for start in range(0, max_id, batch_size):
-                    end = min(start + batch_size, max_id)
-                    self.stderr.write('Deleting baskets [{start}] through [{end}].'.format(start=start, end=end))
-                    with transaction.atomic():
-                        queryset.filter(pk__gte=start, pk__lte=end).delete()
-
-                    self.stderr.write('Complete. Sleeping.'.format(start=start, end=end))
-                    time.sleep(sleep_seconds)
-
+                self.delete_baskets(queryset, options)
                 self.stderr.write('All baskets deleted.')
             else:
                 self.stderr.write('No baskets to delete.')
@@ -68,3 +105,115 @@ class Command(BaseCommand):
             msg = 'This has been an example operation. If the --commit flag had been included, the command ' \
                   'would have deleted [{}] baskets.'.format(count)
             self.stderr.write(msg)
+
+    def delete_baskets(self, queryset, options):
+        """
+        Deletes the baskets matching the given queryset, one batch at a time.
+
+        Baskets are walked in ID order, each batch starting after the last ID of the previous one, so gaps
+        in the IDs never produce empty or oversized batches. Each batch is deleted by primary key, in its
+        own short transaction, so that only the deleted rows are locked, rather than ranges of the table
+        which may include live baskets.
+        """
+        batch_size = options['batch_size']
+        target_seconds = options['target_seconds']
+        last_id = 0
+        retries = 0
+
+        if connection.vendor == 'mysql':
+            # Give up on batches blocked by other connections quickly, rather than queueing behind them.
+            with connection.cursor() as cursor:
+                cursor.execute('SET SESSION innodb_lock_wait_timeout = %s', [options['lock_wait_timeout']])
+
+        while True:
+            basket_ids = list(
+                queryset.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True).distinct()[:batch_size]
+            )
+            if not basket_ids:
+                break
+
+            self.stderr.write(
+                'Deleting baskets [{start}] through [{end}].'.format(start=basket_ids[0], end=basket_ids[-1])
+            )
+
+            start = time.time()
+            try:
+                self.delete_batch(basket_ids)
+            except OperationalError as exc:
+                if not self.is_retryable(exc) or retries >= options['max_retries']:
+                    raise
+
+                retries += 1
+                batch_size = max(self.min_batch_size, batch_size // 2)
+                self.stderr.write('Failed to acquire locks. Retrying with a batch size of [{}].'.format(batch_size))
+                time.sleep(options['sleep_seconds'])
+                continue
+            elapsed = time.time() - start
+            last_id = basket_ids[-1]
+            retries = 0
+
+            batch_size = self.get_next_batch_size(batch_size, elapsed, target_seconds)
+            self.stderr.write('Complete. Sleeping.')
+            time.sleep(max(options['sleep_seconds'], elapsed))
+
+            batch_size = self.wait_for_replication(options['replica'], options['max_replication_lag'], batch_size)
+
+    def is_retryable(self, exc):
+        """ Returns True if the given error was raised because the batch was blocked by another connection. """
+        return bool(exc.args) and exc.args[0] in self.retryable_error_codes
+
+    def delete_batch(self, basket_ids):
+        """ Deletes the baskets with the given IDs, along with their lines and attributes. """
+        with transaction.atomic():
+            # Deleting the dependent rows directly avoids loading them, which the cascade performed
+            # when deleting the baskets would otherwise do.
+            LineAttribute.objects.filter(line__basket_id__in=basket_ids).delete()
+            Line.objects.filter(basket_id__in=basket_ids).delete()
+            BasketAttribute.objects.filter(basket_id__in=basket_ids).delete()
+            Basket.objects.filter(pk__in=basket_ids).delete()
+
+    def get_next_batch_size(self, batch_size, elapsed, target_seconds):
+        """ Returns the size of the next batch, scaled so that it should take roughly the target time to delete. """
+        if elapsed > 0:
+            # Limit the growth of each step, so that a single unusually fast batch does not result in a huge one.
+            batch_size = int(batch_size * min(float(target_seconds) / elapsed, 2))
+        else:
+            batch_size *= 2
+
+        return max(self.min_batch_size, min(batch_size, self.max_batch_size))
+
+    def wait_for_replication(self, replica, max_replication_lag, batch_size):
+        """
+        Waits for the replication lag of the given replica, if any, to fall below the maximum.
+
+        The batch size is halved every time the replica is found to be lagging.
+
+        Returns:
+            int: Size of the next batch.
+        """
+        if not replica:
+            return batch_size
+
+        lag = self.get_replication_lag(replica)
+        while lag is not None and lag > max_replication_lag:
+            batch_size = max(self.min_batch_size, batch_size // 2)
+            self.stderr.write('Replication lag is [{}] seconds. Waiting for the replica to catch up.'.format(lag))
+            time.sleep(lag)
+            lag = self.get_replication_lag(replica)
+
+        return batch_size
+
+    def get_replication_lag(self, replica):
+        """ Returns the replication lag, in seconds, of the given MySQL replica, or None if it is unknown. """
+        replica_connection = connections[replica]
+        if replica_connection.vendor != 'mysql':
+            return None
+
+        with replica_connection.cursor() as cursor:
+            cursor.execute('SHOW SLAVE STATUS')
+            row = cursor.fetchone()
+            if not row:
+                return None
+            columns = [column[0] for column in cursor.description]
+
+        return dict(zip(columns, row)).get('Seconds_Behind_Master')
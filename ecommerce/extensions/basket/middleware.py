@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.core.cache import cache
 from oscar.apps.basket.middleware import BasketMiddleware as OscarBasketMiddleware
 from oscar.core.loading import get_model
 
@@ -19,8 +21,25 @@ class BasketMiddleware(OscarBasketMiddleware):
         key = '{base}_{site_id}'.format(base=key, site_id=request.site.id)
         return key
 
+    def get_basket_cache_key(self, request):
+        """
+        Returns the cache key used to store the ID of the signed-in user's open basket.
+
+        Parameters:
+            request (Request) -- current request being processed
+
+        Returns:
+            str - cache key
+        """
+        return 'open_basket_id_{site_id}_{user_id}'.format(site_id=request.site.id, user_id=request.user.id)
+
     def get_basket(self, request):
-        """ Return the open basket for this request """
+        """ Return the open basket for this request.
+
+        This is only called when the lazily-loaded request.basket is first accessed. The ID of a signed-in
+        user's open basket is cached, so that it can be retrieved by primary key without searching for (and
+        merging) the user's other open baskets. Baskets are not saved until they are first written to.
+        """
         # pylint: disable=protected-access
         if request._basket_cache is not None:
             return request._basket_cache
@@ -30,24 +49,15 @@ class BasketMiddleware(OscarBasketMiddleware):
         cookie_basket = self.get_cookie_basket(cookie_key, request, manager)
 
         if hasattr(request, 'user') and request.user.is_authenticated():
+            basket = self.get_user_basket(request, manager)
+
             # Signed-in user: if they have a cookie basket too, it means
             # that they have just signed in and we need to merge their cookie
             # basket into their user basket, then delete the cookie.
-            try:
-                basket, __ = manager.get_or_create(owner=request.user, site=request.site)
-            except Basket.MultipleObjectsReturned:
-                # Not sure quite how we end up here with multiple baskets.
-                # We merge them and create a fresh one
-                old_baskets = list(manager.filter(owner=request.user, site=request.site))
-                basket = old_baskets[0]
-                for other_basket in old_baskets[1:]:
-                    self.merge_baskets(basket, other_basket)
-
-            # Assign user onto basket to prevent further SQL queries when
-            # basket.owner is accessed.
-            basket.owner = request.user
-
             if cookie_basket:
+                if not basket.id:
+                    basket.save()
+                    self.cache_basket_id(request, basket)
                 self.merge_baskets(basket, cookie_basket)
                 request.cookies_to_delete.append(cookie_key)
 
@@ -62,3 +72,34 @@ class BasketMiddleware(OscarBasketMiddleware):
         request._basket_cache = basket
 
         return basket
+
+    def get_user_basket(self, request, manager):
+        """
+        Returns the open basket of the signed-in user.
+
+        If the user has no open basket, a new, unsaved, basket is returned. If the user has multiple open
+        baskets, they are merged into the oldest one.
+        """
+        basket = None
+        basket_id = cache.get(self.get_basket_cache_key(request))
+        if basket_id:
+            basket = manager.filter(id=basket_id, owner=request.user, site=request.site).first()
+
+        if basket is None:
+            baskets = list(manager.filter(owner=request.user, site=request.site).order_by('id'))
+            if baskets:
+                basket = baskets[0]
+                for other_basket in baskets[1:]:
+                    self.merge_baskets(basket, other_basket)
+                self.cache_basket_id(request, basket)
+            else:
+                basket = Basket(owner=request.user, site=request.site)
+
+        # Assign user onto basket to prevent further SQL queries when
+        # basket.owner is accessed.
+        basket.owner = request.user
+        return basket
+
+    def cache_basket_id(self, request, basket):
+        """ Caches the ID of the signed-in user's open basket. """
+        cache.set(self.get_basket_cache_key(request), basket.id, settings.OPEN_BASKET_ID_CACHE_TIMEOUT)
@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.basket.abstract_models import AbstractBasket
@@ -45,6 +47,83 @@ class Basket(AbstractBasket):
 
         return basket
 
+    def add_products(self, products):
+        """Add a single unit of each of the given products to the basket.
+
+        This is equivalent to calling add_product for each product, but inserts all new lines
+        with a single query. A product appearing multiple times is added with a matching quantity.
+
+        Arguments:
+            products (list): Products to add to the basket.
+
+        Returns:
+            list: The basket lines that were created or updated.
+        """
+        if not self.id:
+            self.save()
+
+        quantities = OrderedDict()
+        for product in products:
+            quantities.setdefault(product.id, [product, 0])[1] += 1
+
+        Line = self.lines.model
+        existing_lines = {line.line_reference: line for line in self.lines.all()}
+        # Since all lines should have the same currency, use the currency of any existing line.
+        price_currency = next((line.price_currency for line in existing_lines.values()), None)
+        new_lines = []
+        updated_lines = []
+
+        for product, quantity in quantities.values():
+            stock_info = self.strategy.fetch_for_product(product)
+            if price_currency and stock_info.price.currency != price_currency:
+                raise ValueError((
+                    "Basket lines must all have the same currency. Proposed "
+                    "line has currency %s, while basket has currency %s")
+                    % (stock_info.price.currency, price_currency))
+            price_currency = stock_info.price.currency
+
+            if stock_info.stockrecord is None:
+                raise ValueError((
+                    "Basket lines must all have stock records. Strategy hasn't "
+                    "found any stock record for product %s") % product)
+
+            line_ref = self._create_line_reference(product, stock_info.stockrecord, [])
+            line = existing_lines.get(line_ref)
+            if line:
+                line.quantity += quantity
+                line.save()
+                updated_lines.append(line)
+            else:
+                line = Line(
+                    basket=self,
+                    line_reference=line_ref,
+                    product=product,
+                    stockrecord=stock_info.stockrecord,
+                    quantity=quantity,
+                    price_excl_tax=stock_info.price.excl_tax,
+                    price_currency=stock_info.price.currency,
+                )
+                if stock_info.price.is_tax_known:
+                    line.price_incl_tax = stock_info.price.incl_tax
+                new_lines.append(line)
+
+        Line.objects.bulk_create(new_lines)
+        self.reset_offer_applications()
+        return updated_lines + new_lines
+    add_products.alters_data = True
+
+    def all_lines(self):
+        """Return a cached set of basket lines.
+
+        In addition to the relations loaded by Oscar, the product classes, parent products and stock records
+        used when pricing and rendering each line are loaded up front, rather than with queries for every line.
+        """
+        if self.id is not None and self._lines is None:
+            self._lines = super(Basket, self).all_lines().select_related(
+                'product__product_class', 'product__parent__product_class'
+            ).prefetch_related('product__stockrecords')
+        return super(Basket, self).all_lines()
+
     def clear_vouchers(self):
         """Remove all vouchers applied to the basket."""
         for v in self.vouchers.all():
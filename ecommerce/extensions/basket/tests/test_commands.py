@@ -3,13 +3,19 @@ from StringIO import StringIO
 
 from django.contrib.sites.models import Site
 from django.core.management import call_command, CommandError
+from django.db.utils import OperationalError
+import mock
 from oscar.core.loading import get_model
 from oscar.test import factories
 
+from ecommerce.extensions.basket.management.commands.delete_ordered_baskets import Command as DeleteOrderedBaskets
 from ecommerce.invoice.models import Invoice
 from ecommerce.tests.testcases import TestCase
 
 Basket = get_model('basket', 'Basket')
+BasketAttribute = get_model('basket', 'BasketAttribute')
+BasketAttributeType = get_model('basket', 'BasketAttributeType')
+Line = get_model('basket', 'Line')
 
 
 class DeleteOrderedBasketsCommandTests(TestCase):
@@ -17,6 +23,9 @@ class DeleteOrderedBasketsCommandTests(TestCase):
 
     def setUp(self):
         super(DeleteOrderedBasketsCommandTests, self).setUp()
+        patcher = mock.patch('time.sleep')
+        self.mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
 
         # Create baskets with and without orders
         self.orders = [factories.create_order() for __ in range(0, 2)]
@@ -75,6 +84,93 @@ class DeleteOrderedBasketsCommandTests(TestCase):
 
         self.assertEqual(out.getvalue().strip(), 'No baskets to delete.')
 
+    def test_batches(self):
+        """ Verify baskets are deleted one batch at a time, along with their lines and attributes. """
+        attribute_type = BasketAttributeType.objects.create(name='test')
+        for order in self.orders:
+            BasketAttribute.objects.create(basket=order.basket, attribute_type=attribute_type, value_text='test')
+        self.assertTrue(Line.objects.filter(basket__in=[order.basket for order in self.orders]).exists())
+
+        out = StringIO()
+        call_command(self.command, commit=True, batch_size=1, stderr=out)
+
+        self.assertEqual(list(Basket.objects.all()), self.unordered_baskets + self.invoiced_baskets)
+        self.assertFalse(Line.objects.filter(basket_id__in=[order.basket_id for order in self.orders]).exists())
+        self.assertFalse(BasketAttribute.objects.exists())
+
+        for order in self.orders:
+            self.assertIn(
+                'Deleting baskets [{id}] through [{id}].'.format(id=order.basket_id),
+                out.getvalue()
+            )
+        self.assertEqual(self.mock_sleep.call_count, len(self.orders))
+
+    def test_lock_wait_timeout(self):
+        """ Verify batches that fail to acquire locks are retried with a smaller batch size. """
+        delete_batch = DeleteOrderedBaskets.delete_batch
+        errors = [OperationalError(1205, 'Lock wait timeout exceeded; try restarting transaction')]
+
+        def side_effect(command, basket_ids):
+            if errors:
+                raise errors.pop()
+            delete_batch(command, basket_ids)
+
+        with mock.patch.object(DeleteOrderedBaskets, 'delete_batch', autospec=True,
+                               side_effect=side_effect) as mock_delete_batch:
+            out = StringIO()
+            call_command(self.command, commit=True, batch_size=100, stderr=out)
+
+        self.assertEqual(list(Basket.objects.all()), self.unordered_baskets + self.invoiced_baskets)
+        self.assertEqual(mock_delete_batch.call_count, 2)
+        self.assertIn('Failed to acquire locks. Retrying with a batch size of [50].', out.getvalue())
+
+    def test_retries_limited(self):
+        """ Verify a batch that keeps failing to acquire locks is only retried a limited number of times. """
+        error = OperationalError(1213, 'Deadlock found when trying to get lock; try restarting transaction')
+        with mock.patch.object(DeleteOrderedBaskets, 'delete_batch', side_effect=error) as mock_delete_batch:
+            with self.assertRaises(OperationalError):
+                call_command(self.command, commit=True, max_retries=2, stderr=StringIO())
+
+        self.assertEqual(mock_delete_batch.call_count, 3)
+
+    def test_other_errors_not_retried(self):
+        """ Verify errors other than lock wait timeouts and deadlocks are raised without retrying the batch. """
+        error = OperationalError(2006, 'MySQL server has gone away')
+        with mock.patch.object(DeleteOrderedBaskets, 'delete_batch', side_effect=error) as mock_delete_batch:
+            with self.assertRaises(OperationalError):
+                call_command(self.command, commit=True, stderr=StringIO())
+
+        self.assertEqual(mock_delete_batch.call_count, 1)
+
+    def test_unknown_replica(self):
+        """ Verify an error is raised if the replica is not a configured database. """
+        with self.assertRaises(CommandError):
+            call_command(self.command, commit=True, replica='does-not-exist', stderr=StringIO())
+
+    def test_get_next_batch_size(self):
+        """ Verify the batch size is scaled towards the target duration, within bounds. """
+        command = DeleteOrderedBaskets()
+        self.assertEqual(command.get_next_batch_size(1000, 2, 1), 500)
+        self.assertEqual(command.get_next_batch_size(1000, 0.8, 1), 1250)
+        self.assertEqual(command.get_next_batch_size(1000, 0.01, 1), 2000)
+        self.assertEqual(command.get_next_batch_size(1000, 0, 1), 2000)
+        self.assertEqual(command.get_next_batch_size(20, 100, 1), command.min_batch_size)
+        self.assertEqual(command.get_next_batch_size(command.max_batch_size, 0.1, 1), command.max_batch_size)
+
+    def test_wait_for_replication(self):
+        """ Verify deletion pauses, and the batch size is reduced, while the replica is lagging. """
+        command = DeleteOrderedBaskets()
+        command.stderr = StringIO()
+        self.assertEqual(command.wait_for_replication(None, 5, 1000), 1000)
+
+        with mock.patch.object(DeleteOrderedBaskets, 'get_replication_lag', side_effect=[30, 10, 2]):
+            self.assertEqual(command.wait_for_replication('replica', 5, 1000), 250)
+        self.assertEqual([call[0][0] for call in self.mock_sleep.call_args_list], [30, 10])
+
+    def test_replication_lag_unknown(self):
+        """ Verify the replication lag of databases other than MySQL is not checked. """
+        self.assertIsNone(DeleteOrderedBaskets().get_replication_lag('default'))
+
 
 class AddSiteToBasketsBasketsCommandTests(TestCase):
     command = 'add_site_to_baskets'
@@ -1,8 +1,10 @@
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
 from django.test.client import RequestFactory
 from oscar.core.loading import get_model
-from oscar.test.factories import BasketFactory
+from oscar.test.factories import BasketFactory, ProductFactory
 
 from ecommerce.extensions.basket import middleware
 from ecommerce.tests.testcases import TestCase
@@ -18,6 +20,7 @@ class BasketMiddlewareTests(TestCase):
         self.request.user = AnonymousUser()
         self.request.site = self.site
         self.middleware.process_request(self.request)
+        cache.clear()
 
     def test_basket_is_attached_to_request(self):
         self.assertTrue(hasattr(self.request, 'basket'))
@@ -89,3 +92,66 @@ class BasketMiddlewareTests(TestCase):
         """ Verify the method returns a site-specific key. """
         expected = '{base}_{site_id}'.format(base=settings.OSCAR_BASKET_COOKIE_OPEN, site_id=self.site.id)
         self.assertEqual(self.middleware.get_cookie_key(self.request), expected)
+
+    def test_basket_not_loaded_unless_accessed(self):
+        """ Verify no queries are made for the basket if the request never accesses it. """
+        request = RequestFactory().get('/')
+        request.user = self.create_user()
+        request.site = self.site
+        BasketFactory(owner=request.user, site=self.site)
+
+        with self.assertNumQueries(0):
+            self.middleware.process_request(request)
+            self.middleware.process_response(request, HttpResponse())
+
+    def test_get_basket_without_existing_basket(self):
+        """ Verify signed-in users without an open basket are given a new basket, which is not saved until needed. """
+        self.request.user = self.create_user()
+        basket = self.middleware.get_basket(self.request)
+        self.assertIsNone(basket.id)
+        self.assertEqual(basket.owner, self.request.user)
+        self.assertEqual(basket.site, self.site)
+        self.assertFalse(Basket.objects.filter(owner=self.request.user).exists())
+
+    def test_get_basket_cached_id(self):
+        """ Verify the basket is retrieved by its cached ID on subsequent requests. """
+        self.request.user = self.create_user()
+        basket = BasketFactory(owner=self.request.user, site=self.site)
+        self.assertEqual(self.middleware.get_basket(self.request), basket)
+        self.assertEqual(cache.get(self.middleware.get_basket_cache_key(self.request)), basket.id)
+
+        self.request._basket_cache = None  # pylint: disable=protected-access
+        with self.assertNumQueries(1):
+            self.assertEqual(self.middleware.get_basket(self.request), basket)
+
+    def test_get_basket_stale_cached_id(self):
+        """ Verify a cached ID is ignored if the basket is no longer open. """
+        self.request.user = self.create_user()
+        basket = BasketFactory(owner=self.request.user, site=self.site)
+        self.middleware.get_basket(self.request)
+        basket.submit()
+
+        self.request._basket_cache = None  # pylint: disable=protected-access
+        basket2 = BasketFactory(owner=self.request.user, site=self.site)
+        self.assertEqual(self.middleware.get_basket(self.request), basket2)
+        self.assertEqual(cache.get(self.middleware.get_basket_cache_key(self.request)), basket2.id)
+
+    def test_get_basket_merges_cookie_basket(self):
+        """ Verify the cookie basket of a user who has just signed in is merged into a new user basket. """
+        cookie_basket = BasketFactory(site=self.site)
+        cookie_basket.add_product(ProductFactory(), 1)
+        cookie_key = self.middleware.get_cookie_key(self.request)
+
+        request_factory = RequestFactory()
+        request_factory.cookies[cookie_key] = self.middleware.get_basket_hash(cookie_basket.id)
+        request = request_factory.get('/')
+        request.site = self.site
+        request.user = self.create_user()
+        self.middleware.process_request(request)
+
+        basket = self.middleware.get_basket(request)
+        self.assertIsNotNone(basket.id)
+        self.assertEqual(basket.owner, request.user)
+        self.assertEqual(basket.num_items, 1)
+        self.assertIn(cookie_key, request.cookies_to_delete)
+        self.assertEqual(Basket.objects.get(id=cookie_basket.id).status, Basket.MERGED)
@@ -7,6 +7,7 @@ from oscar.test import factories
 from ecommerce.tests.testcases import TestCase
 
 Basket = get_model('basket', 'Basket')
+Product = get_model('catalogue', 'Product')
 OrderNumberGenerator = get_class('order.utils', 'OrderNumberGenerator')
 
 
@@ -113,3 +114,41 @@ class BasketTests(TestCase):
         basket = Basket.create_basket(self.site1, user)
         self.assertEqual(basket.site, self.site1)
         self.assertEqual(basket.owner, user)
+
+    def test_add_products(self):
+        """ Verify the method adds the products to the basket, with the same result as add_product. """
+        product = factories.ProductFactory(stockrecords__partner=self.partner, stockrecords__price_currency='USD')
+        other_product = factories.ProductFactory(stockrecords__partner=self.partner, stockrecords__price_currency='USD')
+        basket = factories.create_basket(empty=True)
+        basket.add_product(product)
+
+        # Stock records are usually prefetched, see ecommerce.extensions.api.data.get_products.
+        product, other_product = Product.objects.filter(
+            id__in=[product.id, other_product.id]
+        ).order_by('id').select_related('product_class').prefetch_related('stockrecords')
+
+        with self.assertNumQueries(3):
+            basket.add_products([product, other_product, other_product])
+
+        quantities = {line.product: line.quantity for line in basket.all_lines()}
+        self.assertEqual(quantities, {product: 2, other_product: 2})
+
+        expected = factories.create_basket(empty=True)
+        for __ in range(2):
+            expected.add_product(product)
+            expected.add_product(other_product)
+        self.assertEqual(
+            [(line.line_reference, line.price_excl_tax, line.price_currency) for line in basket.all_lines()],
+            [(line.line_reference, line.price_excl_tax, line.price_currency) for line in expected.all_lines()]
+        )
+
+    def test_add_products_currency_mismatch(self):
+        """ Verify the method refuses to add products whose currencies differ. """
+        basket = factories.create_basket(empty=True)
+        products = [
+            factories.ProductFactory(stockrecords__partner=self.partner, stockrecords__price_currency='USD'),
+            factories.ProductFactory(stockrecords__partner=self.partner, stockrecords__price_currency='EUR'),
+        ]
+
+        with self.assertRaises(ValueError):
+            basket.add_products(products)
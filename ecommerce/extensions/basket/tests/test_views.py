@@ -10,7 +10,9 @@ from django.contrib.messages import get_messages
 from django.contrib.messages.storage.fallback import FallbackStorage  # Messages don't work without fallback
 from django.core.cache import cache
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import override_settings, RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.utils.translation import ugettext_lazy as _
 from oscar.apps.basket.forms import BasketVoucherForm
 from oscar.core.loading import get_class, get_model
@@ -414,6 +416,46 @@ class BasketSummaryViewTests(CourseCatalogTestMixin, CourseCatalogMockMixin, Lms
         cached_course_after = cache.get(cache_key)
         self.assertEqual(cached_course_after['title'], self.course.name)
 
+    # Prevent the cached sites from being refreshed between the requests being compared.
+    @override_settings(SITE_CONFIGURATION_CACHE_CHECK_INTERVAL=3600)
+    @mock_course_catalog_api_client
+    def test_multiple_lines(self):
+        """ Verify the context of a basket with multiple lines is built with a single catalog request, and with
+        the same number of queries as a basket with a single line. """
+        courses = [CourseFactory() for __ in range(3)]
+        basket = self.create_basket_and_add_product(self.create_seat(courses[0]))
+        self.mock_dynamic_catalog_single_course_runs_api(courses[0])
+        httpretty.register_uri(
+            httpretty.GET,
+            '{}course_runs/'.format(settings.COURSE_CATALOG_API_URL),
+            body=json.dumps({'results': [{'key': course.id, 'title': course.name} for course in courses]}),
+            content_type='application/json'
+        )
+
+        # Warm up the caches populated by the first request, so that they are not counted below.
+        self.client.get(self.path)
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as single_line_queries:
+            response = self.client.get(self.path)
+            self.assertEqual(response.status_code, 200)
+
+        for course in courses[1:]:
+            basket.add_product(self.create_seat(course))
+        cache.clear()
+        httpretty.httpretty.latest_requests = []
+
+        with CaptureQueriesContext(connection) as multiple_line_queries:
+            response = self.client.get(self.path)
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(len(httpretty.httpretty.latest_requests), 1)
+        self.assertEqual(len(multiple_line_queries), len(single_line_queries))
+        self.assertEqual(
+            [line_data['course_name'] for __, line_data in response.context['formset_lines_data']],
+            [course.name for course in courses]
+        )
+
     @ddt.data({
         'course': 'edX+DemoX',
         'short_description': None,
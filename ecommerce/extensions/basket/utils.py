@@ -9,6 +9,7 @@ from oscar.core.loading import get_class, get_model
 import pytz
 
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME, SEAT_PRODUCT_CLASS_NAME
+from ecommerce.extensions.catalogue.utils import load_product_attributes
 from ecommerce.referrals.models import Referral
 
 Applicator = get_class('offer.utils', 'Applicator')
@@ -65,10 +66,11 @@ def get_basket_switch_data(product):
         switch_link_text = _('Click here to purchase multiple seats in this course')
         structure = 'standalone'
 
-    stock_records = StockRecord.objects.filter(
+    stock_records = list(StockRecord.objects.filter(
         product__course_id=product.course_id,
         product__structure=structure
-    )
+    ).select_related('product'))
+    load_product_attributes([product] + [stock_record.product for stock_record in stock_records])
 
     # Determine the proper partner SKU to embed in the single/multiple basket switch link
     # The logic here is a little confusing.  "Seat" products have "certificate_type" attributes, and
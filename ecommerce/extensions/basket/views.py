@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 import logging
 
 import waffle
+from django.db.models.query import prefetch_related_objects
 from django.http import HttpResponseBadRequest, HttpResponseRedirect
 from django.utils.translation import ugettext_lazy as _
 from opaque_keys.edx.keys import CourseKey
@@ -14,9 +15,10 @@ from slumber.exceptions import SlumberBaseException
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME, SEAT_PRODUCT_CLASS_NAME
 from ecommerce.core.exceptions import SiteConfigurationError
 from ecommerce.core.url_utils import get_lms_url
-from ecommerce.courses.utils import get_certificate_type_display_value, get_course_info_from_catalog, mode_for_seat
+from ecommerce.courses.utils import get_certificate_type_display_value, get_courses_info_from_catalog, mode_for_seat
 from ecommerce.extensions.analytics.utils import prepare_analytics_data
 from ecommerce.extensions.basket.utils import prepare_basket, get_basket_switch_data
+from ecommerce.extensions.catalogue.utils import load_product_attributes
 from ecommerce.extensions.offer.utils import format_benefit_value
 from ecommerce.extensions.partner.shortcuts import get_partner_for_site
 from ecommerce.extensions.payment.constants import CLIENT_SIDE_CHECKOUT_FLAG_NAME
@@ -99,7 +101,7 @@ class BasketSummaryView(BasketView):
     def get_context_data(self, **kwargs):
         context = super(BasketSummaryView, self).get_context_data(**kwargs)
         formset = context.get('formset', [])
-        lines = context.get('line_list', [])
+        lines = list(context.get('line_list', []))
         lines_data = []
         is_verification_required = is_bulk_purchase = False
         switch_link_text = partner_sku = ''
@@ -107,37 +109,40 @@ class BasketSummaryView(BasketView):
         site = self.request.site
         site_configuration = site.siteconfiguration
 
-        for line in lines:
-            course_key = CourseKey.from_string(line.product.attr.course_key)
+        # Load the data needed for all lines up front, rather than line by line.
+        products = [line.product for line in lines]
+        prefetch_related_objects(products, ['product_class', 'parent__product_class'])
+        load_product_attributes(products)
+
+        course_keys = [CourseKey.from_string(product.attr.course_key) for product in products]
+        try:
+            courses = get_courses_info_from_catalog(site, course_keys)
+        except (ConnectionError, SlumberBaseException, Timeout):
+            courses = {}
+            for course_key in course_keys:
+                logger.exception('Failed to retrieve data from Catalog Service for course [%s].', course_key)
+
+        benefit_value = None
+        if any(line.has_discount for line in lines):
+            benefit = basket.applied_offers().values()[0].benefit
+            benefit_value = format_benefit_value(benefit)
+
+        for line, course_key in zip(lines, course_keys):
             course_name = None
             image_url = None
             short_description = None
-            try:
-                course = get_course_info_from_catalog(self.request.site, course_key)
+            course = courses.get(unicode(course_key))
+            if course is not None:
                 try:
                     image_url = course['image']['src']
                 except (KeyError, TypeError):
                     image_url = ''
                 short_description = course.get('short_description', '')
                 course_name = course.get('title', '')
-            except (ConnectionError, SlumberBaseException, Timeout):
-                logger.exception('Failed to retrieve data from Catalog Service for course [%s].', course_key)
 
-            if self.request.site.siteconfiguration.enable_enrollment_codes:
-                # Get variables for the switch link that toggles from enrollment codes and seat.
-                switch_link_text, partner_sku = get_basket_switch_data(line.product)
-                if line.product.get_product_class().name == ENROLLMENT_CODE_PRODUCT_CLASS_NAME:
-                    is_bulk_purchase = True
-                    # Iterate on message storage so all messages are marked as read.
-                    # This will hide the success messages when a user updates the quantity
-                    # for an item in the basket.
-                    list(messages.get_messages(self.request))
-
-            if line.has_discount:
-                benefit = basket.applied_offers().values()[0].benefit
-                benefit_value = format_benefit_value(benefit)
-            else:
-                benefit_value = None
+            is_enrollment_code = line.product.get_product_class().name == ENROLLMENT_CODE_PRODUCT_CLASS_NAME
+            if site_configuration.enable_enrollment_codes and is_enrollment_code:
+                is_bulk_purchase = True
 
             lines_data.append({
                 'seat_type': self._determine_seat_type(line.product),
@@ -145,17 +150,37 @@ class BasketSummaryView(BasketView):
                 'course_key': course_key,
                 'image_url': image_url,
                 'course_short_description': short_description,
-                'benefit_value': benefit_value,
-                'enrollment_code': line.product.get_product_class().name == ENROLLMENT_CODE_PRODUCT_CLASS_NAME,
+                'benefit_value': benefit_value if line.has_discount else None,
+                'enrollment_code': is_enrollment_code,
                 'line': line,
             })
 
+            # Check product attributes to determine if ID verification is required for this basket
+            try:
+                is_verification_required = line.product.attr.id_verification_required \
+                    and line.product.attr.certificate_type != 'credit'
+            except AttributeError:
+                pass
+
+        if lines:
+            # The remaining data depends only on the basket as a whole, or its last line.
+            last_product = lines[-1].product
+            if site_configuration.enable_enrollment_codes:
+                # Get variables for the switch link that toggles from enrollment codes and seat.
+                switch_link_text, partner_sku = get_basket_switch_data(last_product)
+
+            if is_bulk_purchase:
+                # Iterate on message storage so all messages are marked as read.
+                # This will hide the success messages when a user updates the quantity
+                # for an item in the basket.
+                list(messages.get_messages(self.request))
+
             user = self.request.user
             context.update({
                 'analytics_data': prepare_analytics_data(
                     user,
-                    self.request.site.siteconfiguration.segment_key,
-                    unicode(course_key)
+                    site_configuration.segment_key,
+                    unicode(course_keys[-1])
                 ),
                 'enable_client_side_checkout': False,
             })
@@ -178,13 +203,6 @@ class BasketSummaryView(BasketView):
                                                              sc=site_configuration.id)
                     raise SiteConfigurationError(msg)
 
-            # Check product attributes to determine if ID verification is required for this basket
-            try:
-                is_verification_required = line.product.attr.id_verification_required \
-                    and line.product.attr.certificate_type != 'credit'
-            except AttributeError:
-                pass
-
         context.update({
             'free_basket': context['order_total'].incl_tax == 0,
             'payment_processors': site_configuration.get_payment_processors(),
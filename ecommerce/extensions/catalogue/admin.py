@@ -13,8 +13,21 @@ class ProductAdminExtended(SimpleHistoryAdmin):
     show_full_result_count = False
     raw_id_fields = ('course',)
 
+    def save_related(self, request, form, formsets, change):
+        super(ProductAdminExtended, self).save_related(request, form, formsets, change)
+        # Attribute values edited inline are saved after the product itself.
+        form.instance.sync_attribute_fields()
+
 
 @admin.register(ProductAttributeValue)
 class ProductAttributeValueAdminExtended(SimpleHistoryAdmin):
     list_display = ('product', 'attribute', 'value')
     show_full_result_count = False
+
+    def save_model(self, request, obj, form, change):
+        super(ProductAttributeValueAdminExtended, self).save_model(request, obj, form, change)
+        Product.objects.get(pk=obj.product_id).sync_attribute_fields()
+
+    def delete_model(self, request, obj):
+        super(ProductAttributeValueAdminExtended, self).delete_model(request, obj)
+        Product.objects.get(pk=obj.product_id).sync_attribute_fields()
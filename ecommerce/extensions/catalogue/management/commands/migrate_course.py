@@ -1,13 +1,19 @@
 from __future__ import unicode_literals
+import hashlib
+import json
 import logging
+from multiprocessing.pool import ThreadPool
 from optparse import make_option
+import sys
 
 from dateutil.parser import parse
 from django.conf import settings
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.management import BaseCommand
 from django.db import transaction
 import requests
+from requests.adapters import HTTPAdapter
 import waffle
 
 from ecommerce.courses.models import Course
@@ -16,37 +22,51 @@ from ecommerce.courses.models import Course
 logger = logging.getLogger(__name__)
 
 
-class MigratedCourse(object):
-    def __init__(self, course_id, site_domain):
-        self.course, _created = Course.objects.get_or_create(id=course_id)
-        self.site_configuration = Site.objects.get(domain=site_domain).siteconfiguration
+DEFAULT_WORKERS = 4
+FINGERPRINT_CACHE_KEY = 'migrate_course_fingerprint_{site_id}_{course_id}'
 
-    def load_from_lms(self, access_token):
-        """
-        Loads course products from the LMS.
 
-        Loaded data is NOT persisted until the save() method is called.
-        """
-        name, verification_deadline, modes = self._retrieve_data_from_lms(access_token)
+def build_lms_session(pool_size):
+    """
+    Returns a requests Session whose connection pool can serve the given number of concurrent workers.
 
-        self.course.name = name
-        self.course.verification_deadline = verification_deadline
-        self.course.save()
+    Arguments:
+        pool_size (int): Maximum number of connections kept open per LMS host.
 
-        self._get_products(modes)
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class LMSCourseData(object):
+    """
+    Retrieves the name, verification deadline, and modes of a course from the LMS.
+
+    This class does NOT access the database, so instances can safely be used from worker threads.
+    """
+
+    def __init__(self, course_id, lms_url_root, session=None):
+        self.course_id = course_id
+        self.lms_url_root = lms_url_root
+        self.session = session or requests.Session()
 
     def _build_lms_url(self, path):
         # We avoid using urljoin here because it URL-encodes the path, and some LMS APIs
         # are not capable of decoding these values.
-        host = self.site_configuration.lms_url_root.strip('/')
+        host = self.lms_url_root.strip('/')
         return '{host}/{path}'.format(host=host, path=path)
 
     def _query_commerce_api(self, headers):
         """Get course name and verification deadline from the Commerce API."""
-        url = '{}/courses/{}/'.format(self._build_lms_url('api/commerce/v1'), self.course.id)
+        url = '{}/courses/{}/'.format(self._build_lms_url('api/commerce/v1'), self.course_id)
         timeout = settings.COMMERCE_API_TIMEOUT
 
-        response = requests.get(url, headers=headers, timeout=timeout)
+        response = self.session.get(url, headers=headers, timeout=timeout)
         if response.status_code != 200:
             raise Exception('Unable to retrieve course name and verification deadline: [{status}] - {body}'.format(
                 status=response.status_code,
@@ -58,7 +78,7 @@ class MigratedCourse(object):
 
         course_name = data.get('name')
         if course_name is None:
-            message = u'Unable to retrieve course name for {}.'.format(self.course.id)
+            message = u'Unable to retrieve course name for {}.'.format(self.course_id)
             logger.error(message)
             raise Exception(message)
 
@@ -74,8 +94,8 @@ class MigratedCourse(object):
             'Authorization': 'Bearer ' + access_token
         }
 
-        url = self._build_lms_url('api/course_structure/v0/courses/{}/'.format(self.course.id))
-        response = requests.get(url, headers=headers)
+        url = self._build_lms_url('api/course_structure/v0/courses/{}/'.format(self.course_id))
+        response = self.session.get(url, headers=headers)
 
         if response.status_code != 200:
             raise Exception('Unable to retrieve course name: [{status}] - {body}'.format(
@@ -88,7 +108,7 @@ class MigratedCourse(object):
 
         course_name = data.get('name')
         if course_name is None:
-            message = u'Aborting migration. No name is available for {}.'.format(self.course.id)
+            message = u'Aborting migration. No name is available for {}.'.format(self.course_id)
             logger.error(message)
             raise Exception(message)
 
@@ -100,8 +120,8 @@ class MigratedCourse(object):
 
     def _query_enrollment_api(self, headers):
         """Get modes and pricing from Enrollment API."""
-        url = self._build_lms_url('api/enrollment/v1/course/{}?include_expired=1'.format(self.course.id))
-        response = requests.get(url, headers=headers)
+        url = self._build_lms_url('api/enrollment/v1/course/{}?include_expired=1'.format(self.course_id))
+        response = self.session.get(url, headers=headers)
 
         if response.status_code != 200:
             raise Exception('Unable to retrieve course modes: [{status}] - {body}'.format(
@@ -113,9 +133,12 @@ class MigratedCourse(object):
         logger.debug(data)
         return data['course_modes']
 
-    def _retrieve_data_from_lms(self, access_token):
+    def retrieve(self, access_token):
         """
         Retrieves the course name and modes from the LMS.
+
+        Returns:
+            tuple: Course name, verification deadline, and list of modes.
         """
         headers = {
             'Accept': 'application/json',
@@ -136,6 +159,55 @@ class MigratedCourse(object):
 
         return course_name, course_verification_deadline, modes
 
+
+def fingerprint_lms_data(lms_data):
+    """
+    Returns a digest of the data retrieved from the LMS for a course.
+
+    Two retrievals yielding the same digest would result in identical seats, so the digest
+    can be used to detect courses that have not changed since they were last migrated.
+    """
+    name, verification_deadline, modes = lms_data
+    data = {
+        'name': name,
+        'verification_deadline': verification_deadline.isoformat() if verification_deadline else None,
+        'modes': sorted(modes, key=lambda mode: mode['slug']),
+    }
+    return hashlib.md5(json.dumps(data, sort_keys=True)).hexdigest()
+
+
+class MigratedCourse(object):
+    def __init__(self, course_id, site_domain, session=None):
+        self.course, _created = Course.objects.get_or_create(id=course_id)
+        self.site_configuration = Site.objects.get(domain=site_domain).siteconfiguration
+        self.session = session
+
+    def load_from_lms(self, access_token, lms_data=None):
+        """
+        Loads course products from the LMS.
+
+        Loaded data is NOT persisted until the save() method is called.
+
+        Arguments:
+            access_token (str): OAuth2 access token used to authenticate against some LMS APIs.
+            lms_data (tuple): Data previously retrieved with LMSCourseData. If not provided,
+                the data is retrieved from the LMS.
+        """
+        name, verification_deadline, modes = lms_data or self._retrieve_data_from_lms(access_token)
+
+        self.course.name = name
+        self.course.verification_deadline = verification_deadline
+        self.course.save()
+
+        self._get_products(modes)
+
+    def _retrieve_data_from_lms(self, access_token):
+        """
+        Retrieves the course name and modes from the LMS.
+        """
+        lms_course_data = LMSCourseData(self.course.id, self.site_configuration.lms_url_root, session=self.session)
+        return lms_course_data.retrieve(access_token)
+
     def _get_products(self, modes):
         """ Creates/updates course seat products. """
         for mode in modes:
@@ -170,10 +242,21 @@ class Command(BaseCommand):
                     dest='site_domain',
                     default=None,
                     help='Domain for the ecommerce site providing the course.'),
+        make_option('--workers',
+                    action='store',
+                    dest='workers',
+                    type='int',
+                    default=DEFAULT_WORKERS,
+                    help='Number of courses whose data is retrieved from the LMS concurrently.'),
+        make_option('--force',
+                    action='store_true',
+                    dest='force',
+                    default=False,
+                    help='Migrate courses even if their LMS data has not changed since they were last migrated.'),
     )
 
     def handle(self, *args, **options):
-        course_ids = args
+        course_ids = [unicode(course_id) for course_id in args]
         access_token = options.get('access_token')
         site_domain = options.get('site_domain')
         if not access_token:
@@ -184,40 +267,80 @@ class Command(BaseCommand):
             logger.error('Courses cannot be migrated without providing a site domain.')
             return
 
-        for course_id in course_ids:
-            course_id = unicode(course_id)
+        site_configuration = Site.objects.get(domain=site_domain).siteconfiguration
+        workers = max(options.get('workers') or DEFAULT_WORKERS, 1)
+        session = build_lms_session(workers)
+
+        def retrieve(course_id):
+            # Runs on a worker thread. Only LMS calls are made here; all database access
+            # happens on the main thread, one transaction per course.
             try:
-                with transaction.atomic():
-                    migrated_course = MigratedCourse(course_id, site_domain)
-                    migrated_course.load_from_lms(access_token)
-
-                    course = migrated_course.course
-                    msg = 'Retrieved info for {0} ({1}):\n'.format(course.id, course.name)
-                    msg += '\t(cert. type, verified?, price, SKU, slug, expires)\n'
-
-                    for seat in course.seat_products:
-                        stock_record = seat.stockrecords.first()
-                        data = (
-                            getattr(seat.attr, 'certificate_type', ''),
-                            seat.attr.id_verification_required,
-                            '{0} {1}'.format(stock_record.price_currency, stock_record.price_excl_tax),
-                            stock_record.partner_sku,
-                            seat.slug,
-                            seat.expires
-                        )
-                        msg += '\t{}\n'.format(data)
-
-                    logger.info(msg)
-
-                    if options.get('commit', False):
-                        logger.info('Course [%s] was saved to the database.', course.id)
-                        if waffle.switch_is_active('publish_course_modes_to_lms'):
-                            course.publish_to_lms(access_token=access_token)
-                        else:
-                            logger.info('Data was not published to LMS because the switch '
-                                        '[publish_course_modes_to_lms] is disabled.')
-                    else:
-                        logger.info('Course [%s] was NOT saved to the database.', course.id)
-                        raise Exception('Forced rollback.')
+                lms_data = LMSCourseData(course_id, site_configuration.lms_url_root, session=session).retrieve(
+                    access_token
+                )
+                return course_id, lms_data, None
             except Exception:  # pylint: disable=broad-except
-                logger.exception('Failed to migrate [%s]!', course_id)
+                return course_id, None, sys.exc_info()
+
+        pool = ThreadPool(min(workers, len(course_ids)) or 1)
+        try:
+            for course_id, lms_data, exc_info in pool.imap_unordered(retrieve, course_ids):
+                if exc_info:
+                    logger.error('Failed to migrate [%s]!', course_id, exc_info=exc_info)
+                    continue
+
+                self._migrate_course(course_id, lms_data, site_configuration, access_token, session, options)
+        finally:
+            pool.close()
+            pool.join()
+            session.close()
+
+    def _migrate_course(self, course_id, lms_data, site_configuration, access_token, session, options):
+        """ Persists the data retrieved from the LMS for a single course in its own transaction. """
+        commit = options.get('commit', False)
+        fingerprint = fingerprint_lms_data(lms_data)
+        fingerprint_key = FINGERPRINT_CACHE_KEY.format(site_id=site_configuration.site_id, course_id=course_id)
+
+        if not options.get('force') and cache.get(fingerprint_key) == fingerprint:
+            logger.info('LMS data for [%s] has not changed since the last migration. Skipping.', course_id)
+            return
+
+        try:
+            with transaction.atomic():
+                migrated_course = MigratedCourse(course_id, site_configuration.site.domain, session=session)
+                migrated_course.load_from_lms(access_token, lms_data=lms_data)
+
+                course = migrated_course.course
+                msg = 'Retrieved info for {0} ({1}):\n'.format(course.id, course.name)
+                msg += '\t(cert. type, verified?, price, SKU, slug, expires)\n'
+
+                for seat in course.seat_products:
+                    stock_record = seat.stockrecords.first()
+                    data = (
+                        getattr(seat.attr, 'certificate_type', ''),
+                        seat.attr.id_verification_required,
+                        '{0} {1}'.format(stock_record.price_currency, stock_record.price_excl_tax),
+                        stock_record.partner_sku,
+                        seat.slug,
+                        seat.expires
+                    )
+                    msg += '\t{}\n'.format(data)
+
+                logger.info(msg)
+
+                if commit:
+                    logger.info('Course [%s] was saved to the database.', course.id)
+                    if waffle.switch_is_active('publish_course_modes_to_lms'):
+                        course.publish_to_lms(access_token=access_token)
+                    else:
+                        logger.info('Data was not published to LMS because the switch '
+                                    '[publish_course_modes_to_lms] is disabled.')
+                else:
+                    logger.info('Course [%s] was NOT saved to the database.', course.id)
+                    raise Exception('Forced rollback.')
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Failed to migrate [%s]!', course_id)
+            return
+
+        # Only remember the data once the course's transaction has been committed.
+        cache.set(fingerprint_key, fingerprint, None)
@@ -1,11 +1,15 @@
 from __future__ import unicode_literals
+from collections import defaultdict
 import logging
 import time
 from optparse import make_option
 
 from dateutil import parser
 from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
 from edx_rest_api_client.client import EdxRestApiClient
+from oscar.core.loading import get_model
 from slumber.exceptions import HttpClientError
 
 from ecommerce.core.url_utils import get_lms_url
@@ -13,6 +17,7 @@ from ecommerce.courses.models import Course
 
 
 logger = logging.getLogger(__name__)
+Product = get_model('catalogue', 'Product')
 
 
 class Command(BaseCommand):
@@ -26,18 +31,31 @@ class Command(BaseCommand):
                     default=False,
                     help='Save the data to the database. If this is not set, '
                          'expires date will not be updated'),
+        make_option('--incremental',
+                    action='store_true',
+                    dest='incremental',
+                    default=False,
+                    help='Process the LMS data one page at a time, and only update seats whose '
+                         'expiration date differs from the course enrollment end date.'),
     )
 
     ch = logging.StreamHandler()
     ch.setLevel(logging.DEBUG)
     logger.addHandler(ch)
     enrollment_date_not_found = set()
+    seats_to_update = ['honor', 'audit', 'no-id-professional', 'professional']
+    page_size = 50
     pause_time = 5
+    max_pause_time = 300
     max_tries = 5
 
     def handle(self, *args, **options):
-        seats_to_update = ['honor', 'audit', 'no-id-professional', 'professional']
         save_to_db = options.get('commit', False)
+
+        if options.get('incremental', False):
+            self._sync_incrementally(save_to_db)
+            return
+
         courses_enrollment_info = self._get_courses_enrollment_info()
 
         if not courses_enrollment_info:
@@ -57,10 +75,7 @@ class Command(BaseCommand):
                 continue
 
             if save_to_db:
-                course_seats = course.seat_products.filter(
-                    attributes__name='certificate_type',
-                    attribute_values__value_text__in=seats_to_update
-                )
+                course_seats = course.seat_products.filter(certificate_type__in=self.seats_to_update)
                 expires = parser.parse(enrollment_end_date)
                 course_seats.update(expires=expires)
                 logger.info(
@@ -69,6 +84,65 @@ class Command(BaseCommand):
                     ', '.join([str(seat.id) for seat in course_seats]),
                 )
 
+    def _sync_incrementally(self, save_to_db):
+        """
+        Updates seat expiration dates one page of LMS data at a time.
+
+        The LMS Course API does not expose modification dates, so the expiration dates already stored on
+        the seats serve as the watermark: only seats whose stored date differs from the LMS enrollment
+        end date are written, using one bulk update per distinct date on each page.
+        """
+        updated = 0
+        for page, courses_enrollment_info in enumerate(self._iter_courses_enrollment_info(), start=1):
+            changes = self._get_expiration_changes(courses_enrollment_info)
+            seat_count = sum(len(seat_ids) for seat_ids in changes.values())
+
+            if save_to_db and changes:
+                with transaction.atomic():
+                    for expires, seat_ids in changes.items():
+                        Product.objects.filter(id__in=seat_ids).update(expires=expires)
+                updated += seat_count
+
+            logger.info('Page [%d]: [%d] seats require an expiration date update.', page, seat_count)
+
+        if save_to_db:
+            logger.info('Updated expiration date for [%d] seats.', updated)
+
+    def _get_expiration_changes(self, courses_enrollment_info):
+        """
+        Determines which seats of the given courses have an outdated expiration date.
+
+        Arguments:
+            courses_enrollment_info (dict): Mapping of course ID to enrollment end date.
+
+        Returns:
+            dict: Mapping of new expiration datetime to the list of IDs of seats that should be updated.
+        """
+        expiration_dates = {}
+        for course_id, enrollment_end_date in courses_enrollment_info.items():
+            if enrollment_end_date:
+                expires = parser.parse(enrollment_end_date)
+                if timezone.is_naive(expires):
+                    expires = timezone.make_aware(expires, timezone.get_default_timezone())
+                expiration_dates[course_id] = expires
+
+        if not expiration_dates:
+            return {}
+
+        seats = Product.objects.filter(
+            course_id__in=expiration_dates.keys(),
+            structure=Product.CHILD,
+            certificate_type__in=self.seats_to_update
+        ).values_list('id', 'course_id', 'expires')
+
+        changes = defaultdict(list)
+        for seat_id, course_id, current_expires in seats:
+            expires = expiration_dates[course_id]
+            if current_expires != expires:
+                changes[expires].append(seat_id)
+
+        return changes
+
     def _get_courses_enrollment_info(self):
         """
         Retrieve the enrollment information for all the courses.
@@ -76,44 +150,77 @@ class Command(BaseCommand):
         Returns:
             Dictionary representing the key-value pair (course_key, enrollment_end) of course.
         """
-        def _parse_response(api_response):
-            response_data = api_response.get('results', [])
+        course_enrollments = {}
+        for enrollment_info in self._iter_courses_enrollment_info():
+            course_enrollments.update(enrollment_info)
+        return course_enrollments
 
-            # Map course_id with enrollment end date.
-            courses_enrollment = dict(
-                (course_info['course_id'], course_info['enrollment_end'])
-                for course_info in response_data
-            )
-            return courses_enrollment, api_response['pagination'].get('next', None)
+    def _iter_courses_enrollment_info(self):
+        """
+        Retrieve the enrollment information for all the courses, one page at a time.
+
+        Requests are paced according to the throttling signals returned by the LMS. The delay between
+        requests grows whenever a request is rate-limited, honoring any Retry-After header, and shrinks
+        again as requests succeed.
 
-        querystring = {'page_size': 50}
+        Yields:
+            Dictionary representing the key-value pair (course_key, enrollment_end) of each course on a page.
+        """
+        querystring = {'page_size': self.page_size}
         api = EdxRestApiClient(get_lms_url('api/courses/v1/'))
-        course_enrollments = {}
 
         page = 0
+        delay = 0
         throttling_attempts = 0
         next_page = True
         while next_page:
-            page += 1
-            querystring['page'] = page
+            if delay:
+                time.sleep(delay)
+
+            querystring['page'] = page + 1
             try:
                 response = api.courses().get(**querystring)
-                throttling_attempts = 0
             except HttpClientError as exc:
                 # this is a known limitation; If we get HTTP429, we need to pause execution for a few seconds
                 # before re-requesting the data. raise any other errors
                 if exc.response.status_code == 429 and throttling_attempts < self.max_tries:
+                    pause_time = self._get_pause_time(exc.response, throttling_attempts)
                     logger.warning(
                         'API calls are being rate-limited. Waiting for [%d] seconds before retrying...',
-                        self.pause_time
+                        pause_time
                     )
-                    time.sleep(self.pause_time)
-                    page -= 1
+                    time.sleep(pause_time)
                     throttling_attempts += 1
+                    delay = min(max(delay * 2, 1), self.max_pause_time)
                     logger.info('Retrying [%d]...', throttling_attempts)
                     continue
                 else:
                     raise
-            enrollment_info, next_page = _parse_response(response)
-            course_enrollments.update(enrollment_info)
-        return course_enrollments
+
+            page += 1
+            throttling_attempts = 0
+            delay = delay // 2
+
+            response_data = response.get('results', [])
+            next_page = response['pagination'].get('next', None)
+
+            # Map course_id with enrollment end date.
+            yield dict(
+                (course_info['course_id'], course_info['enrollment_end'])
+                for course_info in response_data
+            )
+
+    def _get_pause_time(self, response, throttling_attempts):
+        """
+        Returns the number of seconds to wait before retrying a rate-limited request.
+
+        The Retry-After header is used if the server provided one. Otherwise, the pause time
+        is doubled with every consecutive rate-limited request.
+        """
+        retry_after = response.headers.get('Retry-After')
+        try:
+            pause_time = int(retry_after)
+        except (TypeError, ValueError):
+            pause_time = self.pause_time * 2 ** throttling_attempts
+
+        return min(pause_time, self.max_pause_time)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0020_auto_20161025_1446'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicalproduct',
+            name='certificate_type',
+            field=models.CharField(db_index=True, max_length=255, null=True, editable=False, blank=True),
+        ),
+        migrations.AddField(
+            model_name='historicalproduct',
+            name='course_key',
+            field=models.CharField(db_index=True, max_length=255, null=True, editable=False, blank=True),
+        ),
+        migrations.AddField(
+            model_name='historicalproduct',
+            name='credit_provider',
+            field=models.CharField(db_index=True, max_length=255, null=True, editable=False, blank=True),
+        ),
+        migrations.AddField(
+            model_name='historicalproduct',
+            name='id_verification_required',
+            field=models.NullBooleanField(db_index=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='certificate_type',
+            field=models.CharField(db_index=True, max_length=255, null=True, editable=False, blank=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='course_key',
+            field=models.CharField(db_index=True, max_length=255, null=True, editable=False, blank=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='credit_provider',
+            field=models.CharField(db_index=True, max_length=255, null=True, editable=False, blank=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='id_verification_required',
+            field=models.NullBooleanField(db_index=True, editable=False),
+        ),
+    ]
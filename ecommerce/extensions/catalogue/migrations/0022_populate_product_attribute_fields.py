@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from collections import defaultdict
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+ATTRIBUTE_FIELDS = {
+    'course_key': 'value_text',
+    'certificate_type': 'value_text',
+    'id_verification_required': 'value_boolean',
+    'credit_provider': 'value_text',
+}
+
+
+def populate_attribute_fields(apps, schema_editor):
+    """Copy the seat attribute values of existing products into their indexed columns."""
+    Product = apps.get_model('catalogue', 'Product')
+    ProductAttributeValue = apps.get_model('catalogue', 'ProductAttributeValue')
+
+    for field, value_field in ATTRIBUTE_FIELDS.items():
+        products_by_value = defaultdict(list)
+        values = ProductAttributeValue.objects.filter(attribute__code=field).values_list('product_id', value_field)
+        for product_id, value in values.iterator():
+            if value not in (None, ''):
+                products_by_value[value].append(product_id)
+
+        for value, product_ids in products_by_value.items():
+            for start in range(0, len(product_ids), BATCH_SIZE):
+                Product.objects.filter(id__in=product_ids[start:start + BATCH_SIZE]).update(**{field: value})
+
+
+def clear_attribute_fields(apps, schema_editor):
+    """Clear the indexed seat attribute columns."""
+    Product = apps.get_model('catalogue', 'Product')
+    Product.objects.update(**{field: None for field in ATTRIBUTE_FIELDS})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalogue', '0021_product_attribute_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_attribute_fields, clear_attribute_fields)
+    ]
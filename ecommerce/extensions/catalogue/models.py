@@ -6,11 +6,43 @@ from simple_history.models import HistoricalRecords
 
 
 class Product(AbstractProduct):
+    # Attributes copied from product.attr into their own indexed columns, so that seats can be
+    # looked up without joining the attribute tables.
+    ATTRIBUTE_FIELDS = ('course_key', 'certificate_type', 'id_verification_required', 'credit_provider',)
+
     course = models.ForeignKey('courses.Course', null=True, blank=True, related_name='products')
     expires = models.DateTimeField(null=True, blank=True,
                                    help_text=_('Last date/time on which this product can be purchased.'))
+    course_key = models.CharField(null=True, blank=True, max_length=255, db_index=True, editable=False)
+    certificate_type = models.CharField(null=True, blank=True, max_length=255, db_index=True, editable=False)
+    id_verification_required = models.NullBooleanField(db_index=True, editable=False)
+    credit_provider = models.CharField(null=True, blank=True, max_length=255, db_index=True, editable=False)
     history = HistoricalRecords()
 
+    def save(self, *args, **kwargs):
+        super(Product, self).save(*args, **kwargs)
+        self.sync_attribute_fields()
+
+    def sync_attribute_fields(self):
+        """
+        Copies the values of the attributes listed in ATTRIBUTE_FIELDS into their columns.
+
+        This must run after the attribute values have been saved, since product.attr then reflects
+        exactly what was persisted. The columns are only written if their values changed.
+        """
+        changed = {}
+        for field in self.ATTRIBUTE_FIELDS:
+            value = getattr(self.attr, field, None)
+            if value == '':
+                value = None
+
+            if getattr(self, field) != value:
+                setattr(self, field, value)
+                changed[field] = value
+
+        if changed:
+            Product.objects.filter(pk=self.pk).update(**changed)
+
 
 class ProductAttributeValue(AbstractProductAttributeValue):
     history = HistoricalRecords()
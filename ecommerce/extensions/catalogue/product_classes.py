@@ -0,0 +1,90 @@
+"""
+Registry of product classes, held in memory for the life of the process.
+
+Product classes are created by migrations and rarely change, but are resolved for nearly every product
+that is priced, sold, or fulfilled. The registry loads all of them with a single query, and loads them
+again after a product class has been modified by any process. The shared version is read at most once
+per PRODUCT_CLASS_CACHE_CHECK_INTERVAL.
+"""
+import time
+
+from django.conf import settings
+from oscar.core.loading import get_model
+
+from ecommerce.core.cache_versions import get_version
+
+PRODUCT_CLASS_VERSION_CACHE_KEY = 'product_class_version'
+
+# Product classes held in memory, the shared version they were loaded at, and the time it was last checked.
+_registry = {
+    'version': None,
+    'checked_at': 0,
+    'by_id': {},
+    'by_name': {},
+    'by_slug': {},
+}
+
+
+def clear_product_class_registry():
+    """ Discards the product classes held in memory, so that they are loaded again by the next lookup. """
+    _registry['version'] = None
+
+
+def _load(version):
+    ProductClass = get_model('catalogue', 'ProductClass')
+    product_classes = list(ProductClass.objects.all())
+
+    _registry.update({
+        'version': version,
+        'by_id': {product_class.id: product_class for product_class in product_classes},
+        'by_name': {product_class.name: product_class for product_class in product_classes},
+        'by_slug': {product_class.slug: product_class for product_class in product_classes},
+    })
+
+
+def _lookup(index, value):
+    now = time.time()
+    if _registry['version'] is None or now - _registry['checked_at'] >= settings.PRODUCT_CLASS_CACHE_CHECK_INTERVAL:
+        _registry['checked_at'] = now
+        version = get_version(PRODUCT_CLASS_VERSION_CACHE_KEY)
+        if version != _registry['version']:
+            _load(version)
+
+    try:
+        return _registry[index][value]
+    except KeyError:
+        ProductClass = get_model('catalogue', 'ProductClass')
+        raise ProductClass.DoesNotExist('No product class has the {} [{}].'.format(index[3:], value))
+
+
+def get_product_class_by_slug(slug):
+    """
+    Returns the product class with the given slug.
+
+    Raises:
+        ProductClass.DoesNotExist: If there is no such product class.
+    """
+    return _lookup('by_slug', slug)
+
+
+def get_product_class_by_name(name):
+    """
+    Returns the product class with the given name.
+
+    Raises:
+        ProductClass.DoesNotExist: If there is no such product class.
+    """
+    return _lookup('by_name', name)
+
+
+def get_product_class(product):
+    """
+    Returns the product class of the given product, or of its parent if the product is a child.
+
+    This is equivalent to Product.get_product_class, without querying for the product class.
+    """
+    product_class_id = product.parent.product_class_id if product.is_child else product.product_class_id
+    if product_class_id is None:
+        return None
+
+    return _lookup('by_id', product_class_id)
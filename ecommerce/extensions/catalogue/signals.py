@@ -0,0 +1,16 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from oscar.core.loading import get_model
+
+from ecommerce.core.cache_versions import bump_on_commit
+from ecommerce.extensions.catalogue.product_classes import PRODUCT_CLASS_VERSION_CACHE_KEY, clear_product_class_registry
+
+ProductClass = get_model('catalogue', 'ProductClass')
+
+
+@receiver(post_save, sender=ProductClass, dispatch_uid='catalogue.product_class_saved')
+@receiver(post_delete, sender=ProductClass, dispatch_uid='catalogue.product_class_deleted')
+def invalidate_product_class_registry(*_args, **kwargs):  # pylint: disable=unused-argument
+    """ Clears the product classes held in memory by this process, and those held by all other processes. """
+    clear_product_class_registry()
+    bump_on_commit(PRODUCT_CLASS_VERSION_CACHE_KEY)
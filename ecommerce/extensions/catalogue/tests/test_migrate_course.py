@@ -6,6 +6,7 @@ import json
 import logging
 from urlparse import urljoin, urlparse
 
+from django.core.cache import cache
 from django.core.management import call_command
 from django.test import override_settings
 import httpretty
@@ -272,6 +273,7 @@ class CommandTests(CourseMigrationTestMixin, TestCase):
     def setUp(self):
         super(CommandTests, self).setUp()
         toggle_switch('publish_course_modes_to_lms', True)
+        self.addCleanup(cache.clear)
 
     @httpretty.activate
     def test_handle(self):
@@ -370,3 +372,84 @@ class CommandTests(CourseMigrationTestMixin, TestCase):
 
             # Verify that the migrated course was published back to the LMS
             self.assertFalse(mock_publish.called)
+
+    @httpretty.activate
+    def test_handle_unchanged_course_skipped(self):
+        """ Verify courses whose LMS data has not changed since the last committed migration are skipped. """
+        self._mock_lms_apis()
+
+        with mock.patch.object(LMSPublisher, 'publish') as mock_publish:
+            call_command(
+                'migrate_course', self.course_id, access_token=ACCESS_TOKEN, commit=True, site_domain=self.site.domain
+            )
+            self.assertEqual(mock_publish.call_count, 1)
+
+            with LogCapture(LOGGER_NAME, level=logging.INFO) as l:
+                call_command(
+                    'migrate_course', self.course_id, access_token=ACCESS_TOKEN, commit=True,
+                    site_domain=self.site.domain
+                )
+                l.check((
+                    LOGGER_NAME,
+                    'INFO',
+                    'LMS data for [{}] has not changed since the last migration. Skipping.'.format(self.course_id)
+                ))
+            self.assertEqual(mock_publish.call_count, 1)
+
+            # Forcing the migration should process the course again.
+            call_command(
+                'migrate_course', self.course_id, access_token=ACCESS_TOKEN, commit=True,
+                site_domain=self.site.domain, force=True
+            )
+            self.assertEqual(mock_publish.call_count, 2)
+
+        self.assert_course_migrated()
+
+    @httpretty.activate
+    def test_handle_changed_course_migrated(self):
+        """ Verify courses whose LMS modes changed since the last migration are migrated again. """
+        self._mock_lms_apis()
+        call_command(
+            'migrate_course', self.course_id, access_token=ACCESS_TOKEN, commit=True, site_domain=self.site.domain
+        )
+
+        self.prices['verified'] = 20
+        self.addCleanup(self.prices.__setitem__, 'verified', 10)
+        self._mock_lms_apis()
+        call_command(
+            'migrate_course', self.course_id, access_token=ACCESS_TOKEN, commit=True, site_domain=self.site.domain
+        )
+
+        self.assert_course_migrated()
+
+    @httpretty.activate
+    def test_handle_dry_run_not_remembered(self):
+        """ Verify a migration that is rolled back does not cause later runs to skip the course. """
+        self._mock_lms_apis()
+        call_command('migrate_course', self.course_id, access_token=ACCESS_TOKEN, site_domain=self.site.domain)
+        call_command(
+            'migrate_course', self.course_id, access_token=ACCESS_TOKEN, commit=True, site_domain=self.site.domain
+        )
+
+        self.assert_course_migrated()
+
+    @httpretty.activate
+    def test_handle_lms_failure_isolated(self):
+        """ Verify a course whose LMS data cannot be retrieved does not prevent other courses from migrating. """
+        self._mock_lms_apis()
+        failed_course_id = 'fail/course/run'
+        httpretty.register_uri(
+            httpretty.GET,
+            urljoin(self.lms_url, 'api/enrollment/v1/course/{}'.format(failed_course_id)),
+            status=500
+        )
+
+        with LogCapture(LOGGER_NAME, level=logging.ERROR) as l:
+            call_command(
+                'migrate_course', failed_course_id, self.course_id, access_token=ACCESS_TOKEN, commit=True,
+                site_domain=self.site.domain, workers=2
+            )
+            l.check((LOGGER_NAME, 'ERROR', 'Failed to migrate [{}]!'.format(failed_course_id)))
+
+        self.assert_course_migrated()
+        self.assertFalse(Course.objects.filter(id=failed_course_id).exists())
@@ -0,0 +1,61 @@
+from __future__ import unicode_literals
+
+from oscar.core.loading import get_model
+
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
+from ecommerce.tests.testcases import TestCase
+
+Product = get_model('catalogue', 'Product')
+
+
+class ProductTests(CourseCatalogTestMixin, TestCase):
+    def setUp(self):
+        super(ProductTests, self).setUp()
+        self.course = CourseFactory()
+
+    def assert_attribute_fields(self, product, **expected):
+        """ Verify the attribute columns of the product, as stored in the database, match the expected values. """
+        product = Product.objects.get(id=product.id)
+        for field in Product.ATTRIBUTE_FIELDS:
+            self.assertEqual(getattr(product, field), expected.get(field))
+            self.assertEqual(getattr(product, field), getattr(product.attr, field, None))
+
+    def test_seat_attribute_fields(self):
+        """ Verify the attribute columns are populated when a seat is created. """
+        seat = self.course.create_or_update_seat('credit', True, 100, self.partner, credit_provider='MIT')
+        self.assert_attribute_fields(
+            seat,
+            course_key=self.course.id,
+            certificate_type='credit',
+            id_verification_required=True,
+            credit_provider='MIT'
+        )
+
+        parent = self.course.parent_seat_product
+        self.assert_attribute_fields(parent, course_key=self.course.id)
+
+    def test_audit_seat_attribute_fields(self):
+        """ Verify audit seats, which have no certificate_type attribute, have no certificate type. """
+        seat = self.course.create_or_update_seat('', False, 0, self.partner)
+        self.assert_attribute_fields(seat, course_key=self.course.id, id_verification_required=False)
+
+    def test_attribute_fields_updated(self):
+        """ Verify the attribute columns follow changes to, and removal of, the attribute values. """
+        seat = self.course.create_or_update_seat('honor', False, 0, self.partner)
+
+        seat = Product.objects.get(id=seat.id)
+        seat.attr.certificate_type = ''
+        seat.save()
+        self.assertIsNone(seat.certificate_type)
+        self.assert_attribute_fields(seat, course_key=self.course.id, id_verification_required=False)
+
+    def test_seat_lookup_by_attribute_fields(self):
+        """ Verify seats can be looked up by their attribute columns, without joining attribute values. """
+        verified_seat = self.course.create_or_update_seat('verified', True, 10, self.partner)
+        self.course.create_or_update_seat('honor', False, 0, self.partner)
+
+        self.assertEqual(
+            Product.objects.get(course_key=self.course.id, certificate_type='verified', id_verification_required=True),
+            verified_seat
+        )
@@ -0,0 +1,71 @@
+from __future__ import unicode_literals
+
+import mock
+from django.core.cache import cache
+from django.test import override_settings
+from oscar.core.loading import get_model
+
+from ecommerce.core.cache_versions import bump_version
+from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME
+from ecommerce.courses.tests.factories import CourseFactory
+from ecommerce.extensions.catalogue import product_classes
+from ecommerce.extensions.catalogue.product_classes import (
+    PRODUCT_CLASS_VERSION_CACHE_KEY, get_product_class, get_product_class_by_name, get_product_class_by_slug
+)
+from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
+from ecommerce.tests.testcases import TestCase
+
+ProductClass = get_model('catalogue', 'ProductClass')
+
+
+class ProductClassRegistryTests(CourseCatalogTestMixin, TestCase):
+    def setUp(self):
+        super(ProductClassRegistryTests, self).setUp()
+        cache.clear()
+        product_classes.clear_product_class_registry()
+
+    def test_lookups(self):
+        """ Verify product classes are resolved by slug, name and product. """
+        self.assertEqual(get_product_class_by_slug('seat'), self.seat_product_class)
+        self.assertEqual(
+            get_product_class_by_name(ENROLLMENT_CODE_PRODUCT_CLASS_NAME), self.enrollment_code_product_class
+        )
+
+        seat = CourseFactory().create_or_update_seat('verified', True, 100, self.partner)
+        self.assertEqual(get_product_class(seat), self.seat_product_class)
+        self.assertEqual(get_product_class(seat.parent), self.seat_product_class)
+
+    def test_missing(self):
+        """ Verify an error is raised if the product class does not exist. """
+        with self.assertRaises(ProductClass.DoesNotExist):
+            get_product_class_by_slug('does-not-exist')
+
+    def test_cached(self):
+        """ Verify product classes are loaded once, and loaded again after a product class is modified. """
+        get_product_class_by_slug('seat')
+        with self.assertNumQueries(0):
+            self.assertEqual(get_product_class_by_slug('seat'), self.seat_product_class)
+
+        product_class = ProductClass.objects.create(name='Gift Card', slug='gift-card')
+        self.assertEqual(get_product_class_by_slug('gift-card'), product_class)
+
+        product_class.name = 'Gift Certificate'
+        product_class.save()
+        self.assertEqual(get_product_class_by_slug('gift-card').name, 'Gift Certificate')
+
+        product_class.delete()
+        with self.assertRaises(ProductClass.DoesNotExist):
+            get_product_class_by_slug('gift-card')
+
+    @override_settings(PRODUCT_CLASS_CACHE_CHECK_INTERVAL=60)
+    def test_check_interval(self):
+        """ Verify changes made by other processes are only detected once per check interval. """
+        get_product_class_by_slug('seat')
+        bump_version(PRODUCT_CLASS_VERSION_CACHE_KEY)
+        with self.assertNumQueries(0):
+            get_product_class_by_slug('seat')
+
+        checked_at = product_classes._registry['checked_at']  # pylint: disable=protected-access
+        with mock.patch('time.time', return_value=checked_at + 60):
+            with self.assertNumQueries(1):
+                get_product_class_by_slug('seat')
@@ -21,6 +21,7 @@ from ecommerce.tests.testcases import TestCase
 logger = logging.getLogger(__name__)
 LOGGER_NAME = 'ecommerce.extensions.catalogue.management.commands.update_course_seat_expire'
 JSON = 'application/json'
+SLEEP_PATH = 'ecommerce.extensions.catalogue.management.commands.update_course_seat_expire.time.sleep'
 
 
 @ddt.ddt
@@ -190,7 +191,7 @@ class UpdateSeatExpireDateTests(CourseCatalogTestMixin, TestCase):
         new_callable=mock.PropertyMock,
         return_value=1
     )
-    def test_update_course_with_exception(self, mock_max_tries, mock_pause_time):
+    def test_update_course_with_exception(self, mock_pause_time, mock_max_tries):
         """
         Verify that management command logs throttling errors when rate-limit to API
         exceeds.
@@ -205,13 +206,81 @@ class UpdateSeatExpireDateTests(CourseCatalogTestMixin, TestCase):
             (
                 LOGGER_NAME,
                 'INFO',
-                'Retrying [1]'
+                'Retrying [1]...'
             ),
         ]
-        with self.assertRaises(HttpClientError):
+        with mock.patch(SLEEP_PATH) as mock_sleep:
             with LogCapture(LOGGER_NAME) as lc:
-                call_command('update_course_seat_expire')
+                with self.assertRaises(HttpClientError):
+                    call_command('update_course_seat_expire')
                 lc.check(*expected)
 
-        self.assertEqual(mock_max_tries.call_count, 2)
-        self.assertEqual(mock_pause_time.call_count, 2)
+        self.assertTrue(mock_max_tries.called)
+        self.assertTrue(mock_pause_time.called)
+        # One pause for the rate-limited request, and one to pace the retry.
+        self.assertEqual(mock_sleep.call_args_list, [mock.call(1), mock.call(1)])
+
+    @httpretty.activate
+    def test_throttling_honors_retry_after(self):
+        """ Verify the Retry-After header of rate-limited responses determines the pause time. """
+        httpretty.register_uri(
+            httpretty.GET,
+            get_lms_url('/api/courses/v1/courses/'),
+            responses=[
+                httpretty.Response(body='{}', status=429, adding_headers={'Retry-After': '17'}),
+                httpretty.Response(body=json.dumps(self.course_info), status=200, content_type=JSON),
+            ]
+        )
+
+        with mock.patch(SLEEP_PATH) as mock_sleep:
+            call_command('update_course_seat_expire', commit=True)
+
+        # The first sleep honors the header. The second one paces the request that follows the
+        # throttled one, even though it succeeded.
+        self.assertEqual(mock_sleep.call_args_list, [mock.call(17), mock.call(1)])
+        self.assertEqual(Product.objects.get(id=self.honor_seat.id).expires, self.expire_date)
+
+    @httpretty.activate
+    def test_incremental_update(self):
+        """ Verify incremental mode only updates seats whose expiration date has changed. """
+        unchanged_course = CourseFactory()
+        unchanged_seat = unchanged_course.create_or_update_seat(
+            'honor', False, 0, self.partner, expires=self.expire_date
+        )
+        self.course_info['results'].append({
+            'enrollment_end': unicode(self.expire_date),
+            'course_id': unchanged_course.id
+        })
+        self.mock_courses_api(status=200, body=self.course_info)
+
+        with mock.patch.object(Product.objects, 'filter', wraps=Product.objects.filter) as mock_filter:
+            with LogCapture(LOGGER_NAME) as lc:
+                call_command('update_course_seat_expire', commit=True, incremental=True)
+                lc.check(
+                    (LOGGER_NAME, 'INFO', 'Page [1]: [2] seats require an expiration date update.'),
+                    (LOGGER_NAME, 'INFO', 'Updated expiration date for [2] seats.'),
+                )
+
+            # One query to find the outdated seats, and one bulk update for the single new date.
+            self.assertEqual(mock_filter.call_count, 2)
+            self.assertEqual(
+                sorted(mock_filter.call_args[1]['id__in']),
+                sorted([self.honor_seat.id, self.professional_seat.id])
+            )
+
+        for seat in (self.honor_seat, self.professional_seat, unchanged_seat):
+            self.assertEqual(Product.objects.get(id=seat.id).expires, self.expire_date)
+
+        # Verify that 'verified' seat has not been updated.
+        self.assertEqual(Product.objects.get(id=self.verified_seat.id).expires, self.verified_expire_date)
+
+    @httpretty.activate
+    def test_incremental_update_without_commit(self):
+        """ Verify incremental mode reports outdated seats without updating them if commit is not provided. """
+        self.mock_courses_api(status=200, body=self.course_info)
+
+        with LogCapture(LOGGER_NAME) as lc:
+            call_command('update_course_seat_expire', incremental=True)
+            lc.check((LOGGER_NAME, 'INFO', 'Page [1]: [2] seats require an expiration date update.'))
+
+        self.assertIsNone(Product.objects.get(id=self.honor_seat.id).expires)
@@ -8,7 +8,9 @@ from oscar.core.loading import get_model
 
 from ecommerce.coupons.tests.mixins import CouponMixin
 from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
-from ecommerce.extensions.catalogue.utils import create_coupon_product, generate_sku, get_or_create_catalog
+from ecommerce.extensions.catalogue.utils import (
+    create_coupon_product, generate_sku, get_or_create_catalog, load_product_attributes
+)
 from ecommerce.tests.factories import ProductFactory
 from ecommerce.tests.testcases import TestCase
 
@@ -86,6 +88,19 @@ class UtilsTests(CourseCatalogTestMixin, TestCase):
         self.assertNotEqual(self.catalog, new_catalog)
         self.assertEqual(Catalog.objects.count(), 2)
 
+    def test_load_product_attributes(self):
+        """Verify the attribute values of multiple products are loaded with a single query."""
+        other_seat = self.course.create_or_update_seat('honor', False, 0, self.partner)
+        seats = list(Product.objects.filter(id__in=[self.seat.id, other_seat.id]).order_by('id'))
+
+        with self.assertNumQueries(1):
+            load_product_attributes(seats)
+            self.assertEqual([seat.attr.certificate_type for seat in seats], ['verified', 'honor'])
+            self.assertEqual(seats[0].attr.course_key, COURSE_ID)
+
+        with self.assertNumQueries(0):
+            load_product_attributes(seats)
+
 
 class CouponUtilsTests(CouponMixin, CourseCatalogTestMixin, TestCase):
     def setUp(self):
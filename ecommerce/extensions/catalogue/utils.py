@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 
+from collections import defaultdict
 from hashlib import md5
 import logging
 
@@ -8,6 +9,7 @@ from django.db.utils import IntegrityError
 from oscar.core.loading import get_model
 
 from ecommerce.core.constants import ENROLLMENT_CODE_PRODUCT_CLASS_NAME, SEAT_PRODUCT_CLASS_NAME
+from ecommerce.extensions.catalogue.product_classes import get_product_class, get_product_class_by_slug
 from ecommerce.extensions.voucher.models import CouponVouchers
 from ecommerce.extensions.voucher.utils import create_vouchers
 
@@ -15,7 +17,7 @@ Catalog = get_model('catalogue', 'Catalog')
 logger = logging.getLogger(__name__)
 Product = get_model('catalogue', 'Product')
 ProductCategory = get_model('catalogue', 'ProductCategory')
-ProductClass = get_model('catalogue', 'ProductClass')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
 StockRecord = get_model('partner', 'StockRecord')
 
 
@@ -67,7 +69,7 @@ def create_coupon_product(
         IntegrityError: An error occured when create_vouchers method returns
                         an IntegrityError exception
     """
-    product_class = ProductClass.objects.get(slug='coupon')
+    product_class = get_product_class_by_slug('coupon')
     coupon_product = Product.objects.create(title=title, product_class=product_class)
     ProductCategory.objects.get_or_create(product=coupon_product, category=category)
 
@@ -120,7 +122,7 @@ def generate_sku(product, partner):
 
     Example: 76E4E71
     """
-    product_class = product.get_product_class()
+    product_class = get_product_class(product)
 
     if not product_class:
         raise AttributeError('Product has no product class')
@@ -170,3 +172,29 @@ def get_or_create_catalog(name, partner, stock_record_ids):
     for stock_record in stock_records:
         catalog.stock_records.add(stock_record)
     return catalog, True
+
+
+def load_product_attributes(products):
+    """
+    Loads the attribute values of the given products with a single query.
+
+    Oscar loads the attribute values of each product the first time one of them is accessed via
+    product.attr. Calling this beforehand avoids a query per product when the attributes of
+    many products are needed.
+
+    Args:
+        products (iterable): Products whose attribute values should be loaded.
+    """
+    products = [product for product in products if not product.attr.initialised]
+    if not products:
+        return
+
+    values_by_product = defaultdict(list)
+    values = ProductAttributeValue.objects.filter(product__in=products).select_related('attribute')
+    for value in values:
+        values_by_product[value.product_id].append(value)
+
+    for product in products:
+        for value in values_by_product[product.id]:
+            setattr(product.attr, value.attribute.code, value.value)
+        product.attr.initialised = True
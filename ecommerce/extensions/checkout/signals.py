@@ -98,3 +98,17 @@ def send_course_purchase_email(sender, order=None, **kwargs):  # pylint: disable
 
         else:
             logger.info('Currently support receipt emails for order with one item.')
+
+
+@receiver(post_checkout, dispatch_uid='checkout.clear_verification_status_cache')
+def clear_verification_status_cache(sender, order=None, **kwargs):  # pylint: disable=unused-argument
+    """ Clear the cached verification status of users purchasing products that require ID verification.
+
+    These users are likely to submit a verification next, so their status must not be served from a
+    cache populated before the purchase.
+    """
+    if not order.user:
+        return
+
+    if order.lines.filter(product__id_verification_required=True).exists():
+        order.user.clear_verification_status_cache()
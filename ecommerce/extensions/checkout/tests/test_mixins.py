@@ -2,6 +2,7 @@
 Tests for the ecommerce.extensions.checkout.mixins module.
 """
 
+from analytics import Client as SegmentClient
 from django.core import mail
 from django.test import RequestFactory
 from mock import Mock, patch
@@ -11,7 +12,6 @@ from oscar.test.newfactories import BasketFactory, ProductFactory, UserFactory
 from testfixtures import LogCapture
 from waffle.models import Sample
 
-from ecommerce.core.models import SegmentClient
 from ecommerce.extensions.checkout.exceptions import BasketNotFreeError
 from ecommerce.extensions.checkout.mixins import EdxOrderPlacementMixin
 from ecommerce.extensions.fulfillment.status import ORDER
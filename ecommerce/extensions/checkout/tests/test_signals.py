@@ -2,6 +2,7 @@ import json
 
 from django.conf import settings
 from django.core import mail
+from django.core.cache import cache
 import httpretty
 from oscar.test import factories
 from oscar.test.newfactories import BasketFactory
@@ -10,7 +11,7 @@ from testfixtures import LogCapture
 from ecommerce.core.tests import toggle_switch
 from ecommerce.courses.tests.factories import CourseFactory
 from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
-from ecommerce.extensions.checkout.signals import send_course_purchase_email
+from ecommerce.extensions.checkout.signals import clear_verification_status_cache, send_course_purchase_email
 from ecommerce.tests.testcases import TestCase
 
 LOGGER_NAME = 'ecommerce.extensions.checkout.signals'
@@ -20,24 +21,28 @@ class SignalTests(CourseCatalogTestMixin, TestCase):
 
     def setUp(self):
         super(SignalTests, self).setUp()
+        cache.clear()
         self.user = self.create_user()
         self.request.user = self.user
         self.site.siteconfiguration.enable_otto_receipt_page = True
         toggle_switch('ENABLE_NOTIFICATIONS', True)
 
-    def prepare_order(self, seat_type, credit_provider_id=None):
+    def prepare_order(self, seat_type, credit_provider_id=None, id_verification_required=False):
         """
         Prepares order for a post-checkout test.
 
         Args:
             seat_type (str): Course seat type
             credit_provider_id (str): Credit provider associated with the course seat.
+            id_verification_required (bool): Whether the course seat requires ID verification.
 
         Returns:
             Order
         """
         course = CourseFactory()
-        seat = course.create_or_update_seat(seat_type, False, 50, self.partner, credit_provider_id, None, 2)
+        seat = course.create_or_update_seat(
+            seat_type, id_verification_required, 50, self.partner, credit_provider_id, None, 2
+        )
         basket = BasketFactory(site=self.site)
         basket.add_product(seat, 1)
         order = factories.create_order(basket=basket, user=self.user)
@@ -108,3 +113,19 @@ class SignalTests(CourseCatalogTestMixin, TestCase):
                     )
                 )
             )
+
+    def test_clear_verification_status_cache(self):
+        """ Verify the cached verification status is cleared when a seat requiring ID verification is purchased. """
+        cache.set(self.user.verification_status_cache_key, False, None)
+        order = self.prepare_order('verified', id_verification_required=True)
+        self.assertEqual(order.user, self.user)
+        with self.assertNumQueries(1):
+            clear_verification_status_cache(None, order=order)
+        self.assertIsNone(cache.get(self.user.verification_status_cache_key))
+
+    def test_clear_verification_status_cache_not_required(self):
+        """ Verify the cached verification status is kept when no purchased seat requires ID verification. """
+        cache.set(self.user.verification_status_cache_key, False, None)
+        order = self.prepare_order('honor')
+        clear_verification_status_cache(None, order=order)
+        self.assertFalse(cache.get(self.user.verification_status_cache_key))
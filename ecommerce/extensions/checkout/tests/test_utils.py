@@ -4,9 +4,10 @@ import ddt
 import httpretty
 import mock
 import requests
+from django.core.cache import cache
 from requests import ConnectionError, Timeout
 
-from ecommerce.extensions.checkout.utils import get_credit_provider_details
+from ecommerce.extensions.checkout.utils import get_credit_provider_details, get_credit_providers
 from ecommerce.tests.testcases import TestCase
 
 
@@ -14,6 +15,7 @@ from ecommerce.tests.testcases import TestCase
 class UtilTests(TestCase):
     def setUp(self):
         super(UtilTests, self).setUp()
+        cache.clear()
         self.credit_provider_id = 'HGW'
         self.credit_provider_name = 'Hogwarts'
         self.body = {'display_name': self.credit_provider_name}
@@ -72,3 +74,56 @@ class UtilTests(TestCase):
                     self.site.siteconfiguration
                 )
             )
+
+    @httpretty.activate
+    def test_get_credit_provider_details_cached(self):
+        """ Verify credit provider details are cached, and not retrieved again while cached. """
+        url = self.site.siteconfiguration.build_lms_url(self.get_credit_provider_details_url(self.credit_provider_id))
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(self.body), content_type='application/json')
+        get_credit_provider_details(self.access_token, self.credit_provider_id, self.site.siteconfiguration)
+
+        httpretty.register_uri(httpretty.GET, url, status=400)
+        provider_data = get_credit_provider_details(
+            self.access_token,
+            self.credit_provider_id,
+            self.site.siteconfiguration
+        )
+        self.assertDictEqual(provider_data, self.body)
+
+    @httpretty.activate
+    def test_get_credit_providers(self):
+        """ Verify only the providers that are not cached are retrieved, and that the cache is shared. """
+        providers = [
+            {'id': self.credit_provider_id, 'display_name': self.credit_provider_name},
+            {'id': 'ASU', 'display_name': 'Arizona State University'},
+        ]
+        url = self.site.siteconfiguration.build_lms_url('api/credit/v1/providers/')
+        httpretty.register_uri(httpretty.GET, url, body=json.dumps(providers[1:]), content_type='application/json')
+
+        # Cache the details of the first provider.
+        httpretty.register_uri(
+            httpretty.GET,
+            self.site.siteconfiguration.build_lms_url(self.get_credit_provider_details_url(self.credit_provider_id)),
+            body=json.dumps(providers[0]),
+            content_type='application/json'
+        )
+        get_credit_provider_details(self.access_token, self.credit_provider_id, self.site.siteconfiguration)
+
+        actual = get_credit_providers(self.access_token, [self.credit_provider_id, 'ASU'], self.site.siteconfiguration)
+        self.assertEqual(actual, providers)
+        self.assertEqual(httpretty.last_request().querystring, {'provider_ids': ['ASU']})
+
+        # All of the providers are now cached.
+        httpretty.register_uri(httpretty.GET, url, status=400)
+        actual = get_credit_providers(self.access_token, [self.credit_provider_id, 'ASU'], self.site.siteconfiguration)
+        self.assertEqual(actual, providers)
+
+    @httpretty.activate
+    def test_get_credit_providers_unavailable_request(self):
+        """ Check that None is returned on Bad Request response. """
+        httpretty.register_uri(
+            httpretty.GET,
+            self.site.siteconfiguration.build_lms_url('api/credit/v1/providers/'),
+            status=400
+        )
+        self.assertIsNone(get_credit_providers(self.access_token, ['ASU'], self.site.siteconfiguration))
@@ -1,7 +1,8 @@
+import hashlib
 import logging
 
-from babel.numbers import format_currency
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import get_language, to_locale
 from edx_rest_api_client.client import EdxRestApiClient
 from requests.exceptions import ConnectionError, Timeout
@@ -11,9 +12,20 @@ from slumber.exceptions import SlumberHttpBaseException
 logger = logging.getLogger(__name__)
 
 
+def get_credit_provider_cache_key(site_configuration, credit_provider_id):
+    """ Returns the key used to cache the details of a credit provider for a site. """
+    cache_key = 'credit_provider_{site_id}_{credit_provider_id}'.format(
+        site_id=site_configuration.site_id,
+        credit_provider_id=credit_provider_id
+    )
+    return hashlib.md5(cache_key.encode('utf-8')).hexdigest()
+
+
 def get_credit_provider_details(access_token, credit_provider_id, site_configuration):
     """ Returns the credit provider details from LMS.
 
+    Details are cached per site, and shared with get_credit_providers.
+
     Args:
         access_token (str): JWT access token
         credit_provider_id (str): Identifier for the provider
@@ -21,8 +33,13 @@ def get_credit_provider_details(access_token, credit_provider_id, site_configura
 
     Returns: dict
     """
+    cache_key = get_credit_provider_cache_key(site_configuration, credit_provider_id)
+    provider_data = cache.get(cache_key)
+    if provider_data is not None:
+        return provider_data
+
     try:
-        return EdxRestApiClient(
+        provider_data = EdxRestApiClient(
             site_configuration.build_lms_url('api/credit/v1/'),
             oauth_access_token=access_token
         ).providers(credit_provider_id).get()
@@ -30,6 +47,55 @@ def get_credit_provider_details(access_token, credit_provider_id, site_configura
         logger.exception('Failed to retrieve credit provider details for provider [%s].', credit_provider_id)
         return None
 
+    cache.set(cache_key, provider_data, settings.CREDIT_PROVIDER_CACHE_TIMEOUT)
+    return provider_data
+
+
+def get_credit_providers(access_token, credit_provider_ids, site_configuration):
+    """ Returns the details of several credit providers from LMS.
+
+    Details are cached per site, and shared with get_credit_provider_details. The providers
+    that are not cached are retrieved with a single request.
+
+    Args:
+        access_token (str): JWT access token
+        credit_provider_ids (list): Identifiers of the providers
+        site_configuration (SiteConfiguration): Ecommerce Site Configuration
+
+    Returns:
+        list: Details of the providers known to LMS, or None if they could not be retrieved.
+    """
+    cache_keys = {
+        credit_provider_id: get_credit_provider_cache_key(site_configuration, credit_provider_id)
+        for credit_provider_id in credit_provider_ids
+    }
+    cached = cache.get_many(cache_keys.values())
+    providers = {
+        credit_provider_id: cached[cache_key]
+        for credit_provider_id, cache_key in cache_keys.items() if cache_key in cached
+    }
+
+    missing = [credit_provider_id for credit_provider_id in credit_provider_ids if credit_provider_id not in providers]
+    if missing:
+        try:
+            retrieved = EdxRestApiClient(
+                site_configuration.build_lms_url('api/credit/v1/'),
+                oauth_access_token=access_token
+            ).providers.get(provider_ids=','.join(missing))
+        except (ConnectionError, SlumberHttpBaseException, Timeout):
+            logger.exception('Failed to retrieve credit provider details for providers [%s].', ','.join(missing))
+            return None
+
+        retrieved = {provider['id']: provider for provider in retrieved if provider['id'] in cache_keys}
+        cache.set_many(
+            {cache_keys[credit_provider_id]: provider for credit_provider_id, provider in retrieved.items()},
+            settings.CREDIT_PROVIDER_CACHE_TIMEOUT
+        )
+        providers.update(retrieved)
+
+    return [providers[credit_provider_id] for credit_provider_id in credit_provider_ids
+            if credit_provider_id in providers]
+
 
 def get_receipt_page_url(site_configuration, order_number=None):
     """ Returns the receipt page URL.
@@ -63,6 +129,9 @@ def add_currency(amount):
     Returns:
         str: Formatted price with currency.
     """
+    # Babel loads its locale data on import, which slows down the startup of processes that never format prices.
+    from babel.numbers import format_currency
+
     return format_currency(
         amount,
         settings.OSCAR_DEFAULT_CURRENCY,
@@ -6,3 +6,11 @@ class UserFormMixin(forms.Form):
     """ Mixin for user field filtering. """
     username = forms.CharField(required=False, label=_("Username"))
     email = forms.CharField(required=False, label=_("Email"))
+
+    def clean_username(self):
+        # Lowercased to match the normalized username searched by the dashboards.
+        return self.cleaned_data['username'].lower()
+
+    def clean_email(self):
+        # Lowercased to match the normalized email searched by the dashboards.
+        return self.cleaned_data['email'].lower()
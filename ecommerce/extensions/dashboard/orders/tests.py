@@ -159,6 +159,21 @@ class OrderListViewTests(OrderViewTestsMixin, RefundTestMixin, LiveServerTestCas
         ))
         self.assert_successful_response(response, [new_order])
 
+    def test_email_filtering(self):
+        """ Verify that the view allows case-insensitive, starts-with filtering by email. """
+        self.create_order(user=self.user)
+
+        new_user = self.create_user(email='Hacker.Man@example.com')
+        new_order = self.create_order(user=new_user)
+
+        self.client.login(username=self.user.username, password=self.password)
+
+        response = self.client.get('{path}?email={email}'.format(path=self.path, email='hACKER.m'))
+        self.assert_successful_response(response, [new_order])
+
+        response = self.client.get('{path}?email={email}'.format(path=self.path, email='man@'))
+        self.assert_successful_response(response, [])
+
     def test_address_not_displayed(self):
         """ Verify no address data is displayed when the view is rendered. """
         self.client.login(username=self.user.username, password=self.password)
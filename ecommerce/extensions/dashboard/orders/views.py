@@ -7,6 +7,7 @@ from oscar.apps.dashboard.orders.views import (
 )
 from oscar.core.loading import get_model
 
+from ecommerce.core.views import ReadReplicaMixin
 from ecommerce.extensions.dashboard.views import FilterFieldsMixin
 
 Order = get_model('order', 'Order')
@@ -27,7 +28,7 @@ def queryset_orders_for_user(user):  # pylint: disable=unused-argument
     return Order._default_manager.select_related('user').prefetch_related('lines')  # pylint: disable=protected-access
 
 
-class OrderListView(FilterFieldsMixin, CoreOrderListView):
+class OrderListView(ReadReplicaMixin, FilterFieldsMixin, CoreOrderListView):
     base_queryset = None
     form = None
 
@@ -1,8 +1,18 @@
+from datetime import timedelta
+from decimal import Decimal as D
+
+from django.core.management import call_command
 from django.core.urlresolvers import reverse
-from oscar.test.factories import OrderFactory, UserFactory
+from django.utils.timezone import now
+from oscar.core.loading import get_model
+from oscar.test.factories import BasketFactory, OrderFactory
 
+from ecommerce.tests.factories import SiteFactory
 from ecommerce.tests.testcases import TestCase
 
+Basket = get_model('basket', 'Basket')
+Order = get_model('order', 'Order')
+
 
 class DashboardViewTestMixin(object):
     def assert_message_equals(self, response, msg, level):  # pylint: disable=unused-argument
@@ -17,16 +27,80 @@ class DashboardViewTestMixin(object):
 
 
 class ExtendedIndexViewTests(TestCase):
+    path = reverse('dashboard:index')
+
+    def setUp(self):
+        super(ExtendedIndexViewTests, self).setUp()
+        user = self.create_user(is_staff=True)
+        self.client.login(username=user.username, password=self.password)
+
+    def create_order(self, total, hours_ago=0):
+        order = OrderFactory(site_id=self.site.id, total_incl_tax=total, total_excl_tax=total)
+        Order.objects.filter(pk=order.pk).update(date_placed=now() - timedelta(hours=hours_ago))
+
     def test_average_paid_order_costs(self):
         """ Verify the stats contain average_paid_order_costs. """
-        password = 'password'
-        user = UserFactory(is_staff=True, password=password)
-        self.client.login(username=user.username, password=password)
-        response = self.client.get(reverse('dashboard:index'))
-
+        response = self.client.get(self.path)
         actual = response.context['average_paid_order_costs']
         self.assertEqual(actual, 0)
 
-        order = OrderFactory()
-        actual = response.context['average_paid_order_costs']
-        self.assertEqual(actual, order.total_incl_tax)
+        self.create_order(D('10.00'))
+        self.create_order(D('30.00'))
+        self.create_order(D('0.00'))
+        call_command('update_order_statistics')
+
+        response = self.client.get(self.path)
+        self.assertEqual(response.context['average_paid_order_costs'], D('20.00'))
+        self.assertEqual(response.context['average_order_costs'], D('40.00') / 3)
+
+    def test_order_stats(self):
+        """ Verify the order stats are read from the hourly order statistics of the current site. """
+        self.create_order(D('10.00'))
+        self.create_order(D('20.00'), hours_ago=3)
+        self.create_order(D('40.00'), hours_ago=30)
+        OrderFactory(site_id=SiteFactory().id, total_incl_tax=D('80.00'), total_excl_tax=D('80.00'))
+
+        # Orders are not reported until the statistics have been updated.
+        response = self.client.get(self.path)
+        self.assertEqual(response.context['total_orders'], 0)
+
+        call_command('update_order_statistics')
+        response = self.client.get(self.path)
+        self.assertEqual(response.context['total_orders_last_day'], 2)
+        self.assertEqual(response.context['total_revenue_last_day'], D('30.00'))
+        self.assertEqual(response.context['total_orders'], 3)
+        self.assertEqual(response.context['total_revenue'], D('70.00'))
+
+        report = response.context['hourly_report_dict']
+        self.assertEqual(len(report['order_total_hourly']), 12)
+        self.assertEqual(report['order_total_hourly'][-1]['total_incl_tax'], D('10.00'))
+        self.assertEqual(report['order_total_hourly'][-2]['total_incl_tax'], D('20.00'))
+        self.assertEqual(report['max_revenue'], D('20'))
+
+    def test_order_status_breakdown(self):
+        """ Verify the order status breakdown is read from the order status statistics of the current site. """
+        self.create_order(D('10.00'))
+        self.create_order(D('20.00'))
+        OrderFactory(site_id=SiteFactory().id, total_incl_tax=D('80.00'), total_excl_tax=D('80.00'))
+        Order.objects.filter(site_id=self.site.id).update(status='Complete')
+
+        response = self.client.get(self.path)
+        self.assertEqual(list(response.context['order_status_breakdown']), [])
+
+        call_command('update_order_statistics')
+        response = self.client.get(self.path)
+        self.assertEqual(list(response.context['order_status_breakdown']), [{'status': 'Complete', 'freq': 2}])
+
+    def test_basket_stats(self):
+        """ Verify only the open baskets of the current site are counted. """
+        response = self.client.get(self.path)
+        self.assertEqual(response.context['total_open_baskets'], 0)
+
+        user = self.create_user()
+        BasketFactory(owner=user, site=self.site)
+        BasketFactory(owner=user, site=self.site)
+        BasketFactory(owner=self.create_user(), site=SiteFactory())
+
+        response = self.client.get(self.path)
+        self.assertEqual(response.context['total_open_baskets'], 2)
+        self.assertEqual(response.context['total_open_baskets_last_day'], 2)
@@ -1,31 +1,159 @@
 from oscar.apps.dashboard.views import *  # pylint: disable=wildcard-import, unused-wildcard-import
 
+from ecommerce.core.views import ReadReplicaMixin
+from ecommerce.extensions.analytics.utils import truncate_to_hour
+
+HourlyOrderStatistics = get_model('analytics', 'HourlyOrderStatistics')
+OrderStatusStatistics = get_model('analytics', 'OrderStatusStatistics')
+
+
+class ExtendedIndexView(ReadReplicaMixin, IndexView):
+    def get_open_baskets(self, filters=None):
+        """ Returns the open baskets of the current site. """
+        return super(ExtendedIndexView, self).get_open_baskets(filters).filter(site=self.request.site)
+
+    def get_order_statistics(self):
+        """ Returns the hourly order statistics of the current site. """
+        return HourlyOrderStatistics.objects.filter(site=self.request.site)
 
-class ExtendedIndexView(IndexView):
     def get_stats(self):
-        stats = super(ExtendedIndexView, self).get_stats()
+        """
+        Returns the statistics of the current site displayed on the dashboard.
 
+        Oscar computes every statistic in IndexView.get_stats, so those which are not derived from orders
+        are computed here too, with the open baskets scoped to the current site. Users are not associated
+        with sites, so customers are counted across all sites, as Oscar does.
+        """
         datetime_24hrs_ago = now() - timedelta(hours=24)
-        orders = Order.objects.filter()
-        paid_orders_last_day = orders.filter(date_placed__gt=datetime_24hrs_ago, total_incl_tax__gt=0)
+        open_alerts = StockAlert.objects.filter(status=StockAlert.OPEN)
+        closed_alerts = StockAlert.objects.filter(status=StockAlert.CLOSED)
 
-        stats['average_paid_order_costs'] = paid_orders_last_day.aggregate(
-            Avg('total_incl_tax')
-        )['total_incl_tax__avg'] or D('0.00')
+        stats = {
+            'total_customers_last_day': User.objects.filter(date_joined__gt=datetime_24hrs_ago).count(),
+            'total_open_baskets_last_day': self.get_open_baskets({'date_created__gt': datetime_24hrs_ago}).count(),
 
+            'total_products': Product.objects.count(),
+            'total_open_stock_alerts': open_alerts.count(),
+            'total_closed_stock_alerts': closed_alerts.count(),
+
+            'total_site_offers': self.get_active_site_offers().count(),
+            'total_vouchers': self.get_active_vouchers().count(),
+            'total_promotions': self.get_number_of_promotions(),
+
+            'total_customers': User.objects.count(),
+            'total_open_baskets': self.get_open_baskets().count(),
+        }
+        stats.update(self.get_order_stats())
         return stats
 
+    def get_order_stats(self):
+        """
+        Returns the order statistics of the current site displayed on the dashboard.
+
+        These are read from the statistics maintained by the update_order_statistics management command,
+        rather than aggregated from the orders on every load. Statistics of the last 24 hours cover the
+        current hour, and the 23 before it.
+        """
+        start_hour = truncate_to_hour(now()) - timedelta(hours=23)
+
+        order_statistics = self.get_order_statistics()
+        last_day = list(order_statistics.filter(hour__gte=start_hour))
+        totals = order_statistics.aggregate(
+            total_orders=Sum('num_orders'), total_lines=Sum('num_lines'), total_revenue=Sum('revenue')
+        )
+
+        total_orders_last_day = sum(stats.num_orders for stats in last_day)
+        total_revenue_last_day = sum((stats.revenue for stats in last_day), D('0.00'))
+        paid_orders_last_day = sum(stats.num_paid_orders for stats in last_day)
+        paid_revenue_last_day = sum((stats.paid_revenue for stats in last_day), D('0.00'))
+
+        return {
+            'total_orders_last_day': total_orders_last_day,
+            'total_lines_last_day': sum(stats.num_lines for stats in last_day),
+            'average_order_costs': average(total_revenue_last_day, total_orders_last_day),
+            'average_paid_order_costs': average(paid_revenue_last_day, paid_orders_last_day),
+            'total_revenue_last_day': total_revenue_last_day,
+            'hourly_report_dict': self.get_hourly_report(hours=24, statistics=last_day),
+
+            'total_orders': totals['total_orders'] or 0,
+            'total_lines': totals['total_lines'] or 0,
+            'total_revenue': totals['total_revenue'] or D('0.00'),
+
+            'order_status_breakdown': [
+                {'status': stats.status, 'freq': stats.num_orders}
+                for stats in OrderStatusStatistics.objects.filter(site=self.request.site)
+            ],
+        }
+
+    def get_hourly_report(self, hours=24, segments=10, statistics=None):
+        """
+        Returns the report of order revenue, split up into two-hour chunks, displayed on the dashboard.
+
+        The report has the same format as Oscar's, but is built from the given hourly order statistics,
+        rather than with an aggregate query for each chunk.
+
+        Arguments:
+            hours (int): Number of hours, up to and including the current one, covered by the report.
+            segments (int): Number of segments into which the y-axis is divided.
+            statistics (list): HourlyOrderStatistics of the hours covered by the report. Retrieved if not provided.
+        """
+        start_hour = truncate_to_hour(now()) - timedelta(hours=hours - 1)
+        if statistics is None:
+            statistics = self.get_order_statistics().filter(hour__gte=start_hour)
+
+        order_total_hourly = [
+            {'end_time': start_hour + timedelta(hours=hour + 2), 'total_incl_tax': D('0.0')}
+            for hour in range(0, hours, 2)
+        ]
+        for stats in statistics:
+            chunk = int((stats.hour - start_hour).total_seconds() // 7200)
+            if 0 <= chunk < len(order_total_hourly):
+                order_total_hourly[chunk]['total_incl_tax'] += stats.revenue
+
+        max_value = max([x['total_incl_tax'] for x in order_total_hourly])
+        divisor = 1
+        while divisor < max_value / 50:
+            divisor *= 10
+        max_value = (max_value / divisor).quantize(D('1'), rounding=ROUND_UP)
+        max_value *= divisor
+        if max_value:
+            segment_size = max_value / D('100.0')
+            for item in order_total_hourly:
+                item['percentage'] = int(item['total_incl_tax'] / segment_size)
+
+            y_axis_steps = max_value / D(str(segments))
+            y_range = [idx * y_axis_steps for idx in reversed(range(segments + 1))]
+        else:
+            y_range = []
+            for item in order_total_hourly:
+                item['percentage'] = 0
+
+        return {
+            'order_total_hourly': order_total_hourly,
+            'max_revenue': max_value,
+            'y_range': y_range,
+        }
+
+
+def average(total, count):
+    """ Returns the average of the given total over the given count, or zero if the count is zero. """
+    return total / count if count else D('0.00')
+
 
 class FilterFieldsMixin(object):
     def get_filter_fields(self):
-        """ Returns a dictionary of fields with custom filters. """
+        """ Returns a dictionary of fields with custom filters.
+
+        Users are searched by the lowercased copies of their usernames and emails, which are indexed.
+        The values searched for are lowercased by UserFormMixin.
+        """
         return {
             'username': {
-                'query_filter': 'user__username__istartswith',
+                'query_filter': 'user__username_lower__prefix',
                 'exposed': True
             },
             'email': {
-                'query_filter': 'user__email__istartswith',
+                'query_filter': 'user__email_lower__prefix',
                 'exposed': True
             },
         }
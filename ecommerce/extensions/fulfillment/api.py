@@ -11,6 +11,7 @@ from django.conf import settings
 from django.utils import importlib
 from django.utils.timezone import now
 
+from ecommerce.extensions.catalogue.product_classes import get_product_class
 from ecommerce.extensions.fulfillment import exceptions
 from ecommerce.extensions.fulfillment.status import ORDER, LINE
 from ecommerce.extensions.refund.status import REFUND_LINE
@@ -61,7 +62,7 @@ def fulfill_order(order, lines):
         # Check to see if any line items in the order have not been accounted for by a FulfillmentModule
         # Any product does not line up with a module, we have to mark a fulfillment error.
         for line in line_items:
-            product_type = line.product.get_product_class().name
+            product_type = get_product_class(line.product).name
             logger.error("Product Type [%s] does not have an associated Fulfillment Module. It cannot be fulfilled.",
                          product_type)
             line.set_status(LINE.FULFILLMENT_CONFIGURATION_ERROR)
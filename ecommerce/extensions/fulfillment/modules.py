@@ -20,6 +20,7 @@ from ecommerce.core.url_utils import get_lms_enrollment_api_url
 from ecommerce.courses.models import Course
 from ecommerce.courses.utils import mode_for_seat
 from ecommerce.extensions.analytics.utils import audit_log, parse_tracking_context
+from ecommerce.extensions.catalogue.product_classes import get_product_class
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
 from ecommerce.extensions.fulfillment.status import LINE
 from ecommerce.extensions.voucher.models import OrderLineVouchers
@@ -125,7 +126,7 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
         return requests.post(enrollment_api_url, data=json.dumps(data), headers=headers, timeout=timeout)
 
     def supports_line(self, line):
-        return line.product.get_product_class().name == 'Seat'
+        return get_product_class(line.product).name == 'Seat'
 
     def get_supported_lines(self, lines):
         """ Return a list of lines that can be fulfilled through enrollment.
@@ -218,7 +219,7 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
                         'line_fulfilled',
                         order_line_id=line.id,
                         order_number=order.number,
-                        product_class=line.product.get_product_class().name,
+                        product_class=get_product_class(line.product).name,
                         course_id=course_key,
                         mode=mode,
                         user_id=order.user.id,
@@ -271,7 +272,7 @@ class EnrollmentFulfillmentModule(BaseFulfillmentModule):
                     'line_revoked',
                     order_line_id=line.id,
                     order_number=line.order.number,
-                    product_class=line.product.get_product_class().name,
+                    product_class=get_product_class(line.product).name,
                     course_id=course_key,
                     certificate_type=getattr(line.product.attr, 'certificate_type', ''),
                     user_id=line.order.user.id
@@ -309,7 +310,7 @@ class CouponFulfillmentModule(BaseFulfillmentModule):
             True if the line contains product of product class Coupon.
             False otherwise.
         """
-        return line.product.get_product_class().name == 'Coupon'
+        return get_product_class(line.product).name == 'Coupon'
 
     def get_supported_lines(self, lines):
         """ Return a list of lines containing products with Coupon product class
@@ -365,7 +366,7 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
             True if the line contains an Enrollment code.
             False otherwise.
         """
-        return line.product.get_product_class().name == ENROLLMENT_CODE_PRODUCT_CLASS_NAME
+        return get_product_class(line.product).name == ENROLLMENT_CODE_PRODUCT_CLASS_NAME
 
     def get_supported_lines(self, lines):
         """ Return a list of lines containing Enrollment code products that can be fulfilled.
@@ -397,12 +398,9 @@ class EnrollmentCodeFulfillmentModule(BaseFulfillmentModule):
 
         for line in lines:
             name = 'Enrollment Code Range for {}'.format(line.product.attr.course_key)
-            seat = Product.objects.filter(
-                attributes__name='course_key',
-                attribute_values__value_text=line.product.attr.course_key
-            ).get(
-                attributes__name='certificate_type',
-                attribute_values__value_text=line.product.attr.seat_type
+            seat = Product.objects.get(
+                course_key=line.product.attr.course_key,
+                certificate_type=line.product.attr.seat_type
             )
             _range, created = Range.objects.get_or_create(name=name)
             if created:
@@ -1,7 +1,8 @@
 from django.utils import timezone
 
 from oscar.apps.partner import availability, strategy
-from oscar.core.loading import get_model
+
+from ecommerce.extensions.catalogue.product_classes import get_product_class_by_slug
 
 
 class CourseSeatAvailabilityPolicyMixin(strategy.StockRequired):
@@ -14,8 +15,7 @@ class CourseSeatAvailabilityPolicyMixin(strategy.StockRequired):
 
     @property
     def seat_class(self):
-        ProductClass = get_model('catalogue', 'ProductClass')
-        return ProductClass.objects.get(slug='seat')
+        return get_product_class_by_slug('seat')
 
     def availability_policy(self, product, stockrecord):
         """ A product is unavailable for non-admin users if the current date is
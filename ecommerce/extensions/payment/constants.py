@@ -28,3 +28,7 @@ CYBERSOURCE_CARD_TYPE_MAP = {
 }
 
 CLIENT_SIDE_CHECKOUT_FLAG_NAME = 'enable_client_side_checkout'
+
+# Cache key holding the version of the PayPal processor configuration and web profiles. Processes compare it to the
+# version of the data they hold in memory in order to detect changes made by other processes.
+PAYPAL_CONFIGURATION_VERSION_CACHE_KEY = 'paypal_configuration_version'
@@ -9,9 +9,6 @@ from decimal import Decimal
 from django.conf import settings
 from oscar.apps.payment.exceptions import UserCancelled, GatewayError, TransactionDeclined
 from oscar.core.loading import get_model
-from suds.client import Client
-from suds.sudsobject import asdict
-from suds.wsse import Security, UsernameToken
 
 from ecommerce.core.constants import ISO_8601_FORMAT
 from ecommerce.core.url_utils import get_ecommerce_url
@@ -23,7 +20,6 @@ from ecommerce.extensions.payment.exceptions import (
 )
 from ecommerce.extensions.payment.helpers import sign
 from ecommerce.extensions.payment.processors import BasePaymentProcessor, HandledProcessorResponse
-from ecommerce.extensions.payment.transport import RequestsTransport
 
 logger = logging.getLogger(__name__)
 
@@ -294,6 +290,11 @@ class Cybersource(BasePaymentProcessor):
         return response and (self._generate_signature(response, use_sop_profile) == response.get('signature'))
 
     def issue_credit(self, order, reference_number, amount, currency):
+        # suds, and the transport built on it, are slow to import. They are only needed to issue credits.
+        from suds.client import Client
+        from suds.wsse import Security, UsernameToken
+        from ecommerce.extensions.payment.transport import RequestsTransport
+
         try:
             security = Security()
             token = UsernameToken(self.merchant_id, self.transaction_key)
@@ -338,6 +339,8 @@ def suds_response_to_dict(d):  # pragma: no cover
 
     Source: http://stackoverflow.com/a/15678861/592820
     """
+    from suds.sudsobject import asdict
+
     out = {}
     for k, v in asdict(d).iteritems():
         if hasattr(v, '__keylist__'):
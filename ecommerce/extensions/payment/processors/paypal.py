@@ -5,19 +5,54 @@ import logging
 from decimal import Decimal
 from urlparse import urljoin
 
-import paypalrestsdk
 import waffle
 from django.core.urlresolvers import reverse
 from django.utils.functional import cached_property
 from oscar.apps.payment.exceptions import GatewayError
 
+from ecommerce.core.cache_versions import get_version
 from ecommerce.core.url_utils import get_ecommerce_url
+from ecommerce.extensions.payment.constants import PAYPAL_CONFIGURATION_VERSION_CACHE_KEY
 from ecommerce.extensions.payment.models import PaypalWebProfile, PaypalProcessorConfiguration
 from ecommerce.extensions.payment.processors import BasePaymentProcessor, HandledProcessorResponse
 from ecommerce.extensions.payment.utils import middle_truncate
 
 logger = logging.getLogger(__name__)
 
+# PayPal configuration held in memory for the life of the process, and the shared version it was loaded at.
+_configuration_cache = {
+    'version': None,
+    'retry_attempts': None,
+    'web_profile_id': None,
+}
+# PayPal SDK API contexts, keyed by credentials. Each context holds an OAuth access token that it reuses until expiry.
+_api_cache = {}
+
+
+def get_paypal_configuration():
+    """
+    Returns the PayPal processor configuration and the ID of the default web profile.
+
+    Both are loaded from the database once, and again only after they have been modified by any process.
+
+    Returns:
+        dict: The number of retry attempts, and the web profile ID (None if there is no default profile).
+    """
+    version = get_version(PAYPAL_CONFIGURATION_VERSION_CACHE_KEY)
+    if version != _configuration_cache['version']:
+        try:
+            web_profile_id = PaypalWebProfile.objects.get(name=Paypal.DEFAULT_PROFILE_NAME).id
+        except PaypalWebProfile.DoesNotExist:
+            web_profile_id = None
+
+        _configuration_cache.update({
+            'version': version,
+            'retry_attempts': PaypalProcessorConfiguration.get_solo().retry_attempts,
+            'web_profile_id': web_profile_id,
+        })
+
+    return _configuration_cache
+
 
 class Paypal(BasePaymentProcessor):
     """
@@ -39,19 +74,28 @@ class Paypal(BasePaymentProcessor):
         super(Paypal, self).__init__(site)
 
         # Number of times payment execution is retried after failure.
-        self.retry_attempts = PaypalProcessorConfiguration.get_solo().retry_attempts
+        self.retry_attempts = get_paypal_configuration()['retry_attempts']
 
     @cached_property
     def paypal_api(self):
         """
         Returns Paypal API instance with appropriate configuration
+        The instance, and the access token it holds, are shared by all processors using the same credentials.
         Returns: Paypal API instance
         """
-        return paypalrestsdk.Api({
+        options = {
             'mode': self.configuration['mode'],
             'client_id': self.configuration['client_id'],
             'client_secret': self.configuration['client_secret']
-        })
+        }
+        credentials = tuple(sorted(options.items()))
+        if credentials not in _api_cache:
+            # The SDK is slow to import, and only needed by processes that handle PayPal payments.
+            import paypalrestsdk
+
+            _api_cache[credentials] = paypalrestsdk.Api(options)
+
+        return _api_cache[credentials]
 
     @property
     def cancel_url(self):
@@ -79,6 +123,8 @@ class Paypal(BasePaymentProcessor):
             GatewayError: Indicates a general error or unexpected behavior on the part of PayPal which prevented
                 a payment from being created.
         """
+        import paypalrestsdk
+
         return_url = urljoin(get_ecommerce_url(), reverse('paypal_execute'))
         data = {
             'intent': 'sale',
@@ -112,11 +158,9 @@ class Paypal(BasePaymentProcessor):
             }],
         }
 
-        try:
-            web_profile = PaypalWebProfile.objects.get(name=self.DEFAULT_PROFILE_NAME)
-            data['experience_profile_id'] = web_profile.id
-        except PaypalWebProfile.DoesNotExist:
-            pass
+        web_profile_id = get_paypal_configuration()['web_profile_id']
+        if web_profile_id:
+            data['experience_profile_id'] = web_profile_id
 
         available_attempts = 1
         if waffle.switch_is_active('PAYPAL_RETRY_ATTEMPTS'):
@@ -209,6 +253,8 @@ class Paypal(BasePaymentProcessor):
         Returns:
             HandledProcessorResponse
         """
+        import paypalrestsdk
+
         data = {'payer_id': response.get('PayerID')}
 
         # By default PayPal payment will be executed only once.
@@ -295,6 +341,8 @@ class Paypal(BasePaymentProcessor):
         return None
 
     def issue_credit(self, order, reference_number, amount, currency):
+        import paypalrestsdk
+
         try:
             payment = paypalrestsdk.Payment.find(reference_number, api=self.paypal_api)
             sale = self._get_payment_sale(payment)
@@ -1,27 +1,39 @@
 import logging
 
 from django.conf import settings
-from django.core.cache import cache
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from waffle.models import Switch
 
-from ecommerce.extensions.api.v2.views.payments import PAYMENT_PROCESSOR_CACHE_KEY
+from ecommerce.core.cache_versions import bump_on_commit
+from ecommerce.extensions.api.v2.views.payments import PAYMENT_PROCESSOR_VERSION_CACHE_KEY
+from ecommerce.extensions.payment.constants import PAYPAL_CONFIGURATION_VERSION_CACHE_KEY
+from ecommerce.extensions.payment.models import PaypalProcessorConfiguration, PaypalWebProfile
 
 
 logger = logging.getLogger(__name__)
 
 
 @receiver(post_save, sender=Switch)
+@receiver(post_delete, sender=Switch)
 def invalidate_processor_cache(*_args, **kwargs):
     """
     When Waffle switches for payment processors are toggled, the
-    payment processor list view cache must be invalidated.
+    payment processor list view cache of every site must be invalidated.
     """
     switch = kwargs['instance']
     parts = switch.name.split(settings.PAYMENT_PROCESSOR_SWITCH_PREFIX)
     if len(parts) == 2:
         processor = parts[1]
         logger.info('Switched payment processor [%s] %s.', processor, 'on' if switch.active else 'off')
-        cache.delete(PAYMENT_PROCESSOR_CACHE_KEY)
+        bump_on_commit(PAYMENT_PROCESSOR_VERSION_CACHE_KEY)
         logger.info('Invalidated payment processor cache after toggling [%s].', switch.name)
+
+
+@receiver(post_save, sender=PaypalProcessorConfiguration, dispatch_uid='payment.paypal_configuration_saved')
+@receiver(post_delete, sender=PaypalProcessorConfiguration, dispatch_uid='payment.paypal_configuration_deleted')
+@receiver(post_save, sender=PaypalWebProfile, dispatch_uid='payment.paypal_web_profile_saved')
+@receiver(post_delete, sender=PaypalWebProfile, dispatch_uid='payment.paypal_web_profile_deleted')
+def invalidate_paypal_configuration_cache(*_args, **kwargs):  # pylint: disable=unused-argument
+    """ Signals all processes to reload the PayPal configuration and web profile they hold in memory. """
+    bump_on_commit(PAYPAL_CONFIGURATION_VERSION_CACHE_KEY)
@@ -10,6 +10,7 @@ import ddt
 import mock
 import paypalrestsdk
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.test import RequestFactory
 from oscar.apps.payment.exceptions import GatewayError
@@ -20,8 +21,8 @@ from testfixtures import LogCapture
 from ecommerce.core.tests import toggle_switch
 from ecommerce.core.tests.patched_httpretty import httpretty
 from ecommerce.extensions.checkout.utils import get_receipt_page_url
-from ecommerce.extensions.payment.models import PaypalWebProfile
-from ecommerce.extensions.payment.processors.paypal import Paypal
+from ecommerce.extensions.payment.models import PaypalProcessorConfiguration, PaypalWebProfile
+from ecommerce.extensions.payment.processors.paypal import Paypal, get_paypal_configuration
 from ecommerce.extensions.payment.tests.mixins import PaypalMixin
 from ecommerce.extensions.payment.tests.processors.mixins import PaymentProcessorTestCaseMixin
 from ecommerce.tests.testcases import TestCase
@@ -64,6 +65,9 @@ class PaypalTests(PaypalMixin, PaymentProcessorTestCaseMixin, TestCase):
         """
         super(PaypalTests, self).setUp()
 
+        # Discard the web profiles held in memory by earlier tests.
+        cache.clear()
+
         # Dummy request from which an HTTP Host header can be extracted during
         # construction of absolute URLs
         self.request = RequestFactory().post('/')
@@ -182,7 +186,7 @@ class PaypalTests(PaypalMixin, PaymentProcessorTestCaseMixin, TestCase):
         assert self._get_receipt_url() == self.site.siteconfiguration.build_lms_url('/commerce/checkout/receipt')
 
     @httpretty.activate
-    @mock.patch('ecommerce.extensions.payment.processors.paypal.paypalrestsdk.Payment')
+    @mock.patch('paypalrestsdk.Payment')
     @ddt.data(None, Paypal.DEFAULT_PROFILE_NAME, "some-other-name")
     def test_web_profiles(self, enabled_profile_name, mock_payment):
         """
@@ -435,3 +439,35 @@ class PaypalTests(PaypalMixin, PaymentProcessorTestCaseMixin, TestCase):
             ids.append(payment_response.id)
 
         return ids
+
+
+class PaypalConfigurationCacheTests(TestCase):
+    """Tests for the PayPal configuration held in memory by each process."""
+
+    def setUp(self):
+        super(PaypalConfigurationCacheTests, self).setUp()
+        cache.clear()
+
+    def test_configuration_cached(self):
+        """Verify the configuration is only reloaded from the database after it has been modified."""
+        configuration = PaypalProcessorConfiguration.get_solo()
+        get_paypal_configuration()
+
+        with self.assertNumQueries(0):
+            cached = get_paypal_configuration()
+        self.assertIsNone(cached['web_profile_id'])
+        self.assertEqual(cached['retry_attempts'], configuration.retry_attempts)
+
+        PaypalWebProfile.objects.create(name=Paypal.DEFAULT_PROFILE_NAME, id='test-profile-id')
+        self.assertEqual(get_paypal_configuration()['web_profile_id'], 'test-profile-id')
+
+        configuration.retry_attempts = 3
+        configuration.save()
+        self.assertEqual(Paypal(self.site).retry_attempts, 3)
+
+        PaypalWebProfile.objects.all().delete()
+        self.assertIsNone(get_paypal_configuration()['web_profile_id'])
+
+    def test_api_shared(self):
+        """Verify processors using the same credentials share an API context, and its access token."""
+        self.assertIs(Paypal(self.site).paypal_api, Paypal(self.site).paypal_api)
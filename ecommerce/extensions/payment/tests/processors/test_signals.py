@@ -1,23 +1,41 @@
+import mock
 from django.conf import settings
 from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from waffle.models import Switch
 
-from ecommerce.extensions.api.v2.views.payments import PAYMENT_PROCESSOR_CACHE_KEY
+from ecommerce.extensions.api.v2.views.payments import (
+    PAYMENT_PROCESSOR_VERSION_CACHE_KEY, PaymentProcessorListView, get_payment_processor_cache_key
+)
 from ecommerce.tests.testcases import TestCase
 
 
 class SignalTests(TestCase):
+    def setUp(self):
+        super(SignalTests, self).setUp()
+        cache.clear()
+
     def test_invalidate_processor_cache(self):
-        """ Verify the payment processor cache is invalidated when payment processor switches are toggled. """
+        """ Verify the cached payment processor lists are no longer served once a processor switch is toggled. """
         user = self.create_user()
         self.client.login(username=user.username, password=self.password)
+        path = reverse('api:v2:payment:list_processors')
+        request = mock.Mock(site=self.site)
+
+        get_queryset = PaymentProcessorListView.get_queryset
+        with mock.patch.object(PaymentProcessorListView, 'get_queryset', autospec=True,
+                               side_effect=get_queryset) as mock_get_queryset:
+            # The first request caches the list under a key that includes the current versions.
+            self.assertEqual(self.client.get(path).status_code, 200)
+            self.assertIsNotNone(cache.get(get_payment_processor_cache_key(request)))
+            self.assertEqual(self.client.get(path).status_code, 200)
+            self.assertEqual(mock_get_queryset.call_count, 1)
 
-        # Make a call that triggers cache creation
-        response = self.client.get(reverse('api:v2:payment:list_processors'))
-        self.assertEqual(response.status_code, 200)
-        self.assertIsNotNone(cache.get(PAYMENT_PROCESSOR_CACHE_KEY))
+            # Toggling a switch changes the version, so the next request misses the cache.
+            version = cache.get(PAYMENT_PROCESSOR_VERSION_CACHE_KEY)
+            Switch.objects.get_or_create(name=settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + 'dummy')
+            self.assertNotEqual(cache.get(PAYMENT_PROCESSOR_VERSION_CACHE_KEY), version)
+            self.assertIsNone(cache.get(get_payment_processor_cache_key(request)))
 
-        # Toggle a switch to trigger cache deletion
-        Switch.objects.get_or_create(name=settings.PAYMENT_PROCESSOR_SWITCH_PREFIX + 'dummy')
-        self.assertIsNone(cache.get(PAYMENT_PROCESSOR_CACHE_KEY))
+            self.assertEqual(self.client.get(path).status_code, 200)
+            self.assertEqual(mock_get_queryset.call_count, 2)
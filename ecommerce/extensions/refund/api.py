@@ -1,10 +1,28 @@
-from oscar.core.loading import get_model
+import logging
+from multiprocessing.pool import ThreadPool
 
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Case, DecimalField, F, Value, When
+from oscar.apps.payment.exceptions import PaymentError
+from oscar.core.loading import get_class, get_model
+
+from ecommerce.extensions.analytics.utils import audit_log
+from ecommerce.extensions.fulfillment.api import revoke_fulfillment_for_refund
 from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.order.constants import PaymentEventTypeName
+from ecommerce.extensions.payment.helpers import get_processor_class_by_name
+from ecommerce.extensions.refund.status import REFUND, REFUND_LINE
 
+logger = logging.getLogger(__name__)
 
+PaymentEvent = get_model('order', 'PaymentEvent')
+PaymentEventType = get_model('order', 'PaymentEventType')
+post_refund = get_class('refund.signals', 'post_refund')
 Refund = get_model('refund', 'Refund')
 RefundLine = get_model('refund', 'RefundLine')
+Source = get_model('payment', 'Source')
+Transaction = get_model('payment', 'Transaction')
 
 
 def find_orders_associated_with_course(user, course_id):
@@ -30,9 +48,7 @@ def find_orders_associated_with_course(user, course_id):
         return []
 
     # Find all complete orders associated with the course.
-    orders = user.orders.filter(status=ORDER.COMPLETE,
-                                lines__product__attribute_values__attribute__code='course_key',
-                                lines__product__attribute_values__value_text=course_id)
+    orders = user.orders.filter(status=ORDER.COMPLETE, lines__product__course_key=course_id).distinct()
 
     return list(orders)
 
@@ -52,12 +68,203 @@ def create_refunds(orders, course_id):
 
     for order in orders:
         # Find lines associated with the course and not refunded.
-        lines = order.lines.filter(refund_lines__id__isnull=True,
-                                   product__attribute_values__attribute__code='course_key',
-                                   product__attribute_values__value_text=course_id)
+        lines = order.lines.filter(refund_lines__id__isnull=True, product__course_key=course_id)
 
         refund = Refund.create_with_lines(order, lines)
         if refund is not None:
             refunds.append(refund)
 
     return refunds
+
+
+def approve_refunds(refund_ids, revoke_fulfillment=True):
+    """
+    Approves the given refunds, in bulk.
+
+    This is equivalent to calling Refund.approve for each refund. However, refunds are grouped by payment
+    processor, and a single processor instance is used for each group. Credits are issued concurrently, by up
+    to REFUND_CREDIT_CONCURRENCY threads, and the resulting payment events and status changes are saved with
+    a handful of queries, rather than several for each refund.
+
+    Arguments:
+        refund_ids (list): IDs of the refunds to approve.
+        revoke_fulfillment (bool): Whether fulfillment of the refunded lines should be revoked.
+
+    Returns:
+        dict: Mapping of refund ID to a boolean indicating if the refund was approved.
+    """
+    refunds = list(
+        Refund.objects.filter(id__in=refund_ids).select_related(
+            'order__basket', 'order__site', 'user'
+        ).prefetch_related('order__sources__source_type', 'lines__order_line')
+    )
+    results = dict((refund.id, False) for refund in refunds)
+
+    approvable = []
+    for refund in refunds:
+        if refund.can_approve:
+            approvable.append(refund)
+        else:
+            logger.debug('Refund [%d] cannot be approved.', refund.id)
+
+    _issue_credits([refund for refund in approvable if refund.status in (REFUND.OPEN, REFUND.PAYMENT_REFUND_ERROR)])
+
+    if revoke_fulfillment:
+        completed = []
+        failed = []
+        for refund in approvable:
+            if refund.status in (REFUND.PAYMENT_REFUNDED, REFUND.REVOCATION_ERROR):
+                if revoke_fulfillment_for_refund(refund):
+                    completed.append(refund)
+                else:
+                    logger.error('Unable to revoke fulfillment of all lines of Refund [%d].', refund.id)
+                    failed.append(refund)
+
+        Refund.bulk_set_status(completed, REFUND.COMPLETE)
+        Refund.bulk_set_status(failed, REFUND.REVOCATION_ERROR)
+    else:
+        completed = [refund for refund in approvable if refund.status == REFUND.PAYMENT_REFUNDED]
+        for refund in completed:
+            logger.info('Skipping the revocation step for refund [%d].', refund.id)
+
+        # Mark the refunds complete, as they do not involve the revocation.
+        Refund.bulk_set_status(completed, REFUND.COMPLETE)
+        RefundLine.bulk_set_status(
+            [line for refund in completed for line in refund.lines.all()], REFUND_LINE.COMPLETE
+        )
+
+    for refund in approvable:
+        if refund.status == REFUND.COMPLETE:
+            post_refund.send_robust(sender=Refund, refund=refund)
+            results[refund.id] = True
+
+    return results
+
+
+def _issue_credits(refunds):
+    """
+    Issues credits for the given refunds, via the payment processors used for the original orders.
+
+    The statuses of the refunds are updated to reflect the outcome.
+    """
+    processors = {}
+    credits = []
+    credited = []
+    for refund in refunds:
+        # NOTE: Update this if we ever support multiple payment sources for a single order.
+        sources = refund.order.sources.all()
+        if not sources:
+            # This occurs when attempting to refund free orders.
+            logger.info('No payments to credit for Refund [%d]', refund.id)
+            credited.append(refund)
+            continue
+
+        source = sources[0]
+        key = (source.source_type.name, refund.order.site_id)
+        if key not in processors:
+            processors[key] = get_processor_class_by_name(source.source_type.name)(refund.order.site)
+        credits.append((refund, source, processors[key]))
+
+    concurrency = min(settings.REFUND_CREDIT_CONCURRENCY, len(credits))
+    if concurrency > 1:
+        pool = ThreadPool(concurrency)
+        try:
+            references = pool.map(_issue_credit_in_thread, credits)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        references = [_issue_credit(credit) for credit in credits]
+
+    failed = []
+    issued = []
+    for credit, reference in zip(credits, references):
+        if reference is None:
+            failed.append(credit[0])
+        else:
+            issued.append(credit + (reference,))
+
+    with transaction.atomic():
+        _record_credits(issued)
+        Refund.bulk_set_status(credited + [refund for refund, __, __, __ in issued], REFUND.PAYMENT_REFUNDED)
+        Refund.bulk_set_status(failed, REFUND.PAYMENT_REFUND_ERROR)
+
+
+def _issue_credit(credit):
+    """
+    Issues the given credit, returning the reference number of the refund, or None if it failed.
+
+    Every error is treated as a failure of this credit alone. Raising would discard the outcome of the other
+    credits of the batch, which may already have been issued by their payment processors, and lead to them
+    being issued again by the next approval.
+    """
+    refund, source, processor = credit
+    try:
+        return processor.issue_credit(refund.order, source.reference, refund.total_credit_excl_tax, refund.currency)
+    except PaymentError:
+        logger.exception('Failed to issue credit for refund [%d].', refund.id)
+    except Exception:  # pylint: disable=broad-except
+        logger.exception('An unexpected error occurred while issuing credit for refund [%d].', refund.id)
+    return None
+
+
+def _issue_credit_in_thread(credit):
+    """ Issues the given credit from a worker thread, closing the database connections the thread opened. """
+    try:
+        return _issue_credit(credit)
+    finally:
+        connections.close_all()
+
+
+def _record_credits(issued):
+    """
+    Records the given credits against the sources and orders they were issued for.
+
+    Arguments:
+        issued (list): Tuples of refund, source, processor and refund reference number.
+    """
+    if not issued:
+        return
+
+    event_type, __ = PaymentEventType.objects.get_or_create(name=PaymentEventTypeName.REFUNDED)
+    PaymentEvent.objects.bulk_create([
+        PaymentEvent(
+            event_type=event_type,
+            order=refund.order,
+            amount=refund.total_credit_excl_tax,
+            reference=reference,
+            processor_name=processor.NAME
+        )
+        for refund, __, processor, reference in issued
+    ])
+
+    Transaction.objects.bulk_create([
+        Transaction(
+            source=source,
+            txn_type=Transaction.REFUND,
+            amount=refund.total_credit_excl_tax,
+            reference=reference
+        )
+        for refund, source, __, reference in issued
+    ])
+
+    # Several refunds of the same order credit the same source.
+    amounts = {}
+    for refund, source, __, __ in issued:
+        amounts[source.pk] = amounts.get(source.pk, 0) + refund.total_credit_excl_tax
+    Source.objects.filter(pk__in=amounts.keys()).update(
+        amount_refunded=F('amount_refunded') + Case(
+            *[When(pk=source_id, then=Value(amount)) for source_id, amount in amounts.items()],
+            output_field=DecimalField()
+        )
+    )
+
+    for refund, __, processor, __ in issued:
+        audit_log(
+            'credit_issued',
+            amount=refund.total_credit_excl_tax,
+            currency=refund.currency,
+            processor_name=processor.NAME,
+            refund_id=refund.id,
+            user_id=refund.user.id
+        )
@@ -2,6 +2,7 @@ import logging
 
 from django.conf import settings
 from django.db import models
+from django.utils.timezone import now
 from django.utils.translation import ugettext_lazy as _
 from django_extensions.db.models import TimeStampedModel
 from oscar.apps.payment.exceptions import PaymentError
@@ -36,12 +37,8 @@ class StatusMixin(object):
         """Returns all possible statuses that this object can move to."""
         return self.pipeline.get(self.status, ())
 
-    # pylint: disable=access-member-before-definition,attribute-defined-outside-init
-    def set_status(self, new_status):
-        """Set a new status for this object.
-
-        If the requested status is not valid, then ``InvalidStatus`` is raised.
-        """
+    def validate_status(self, new_status):
+        """Raises ``InvalidStatus`` if this object cannot move to the given status."""
         if new_status not in self.available_statuses():
             msg = " Transition from '{status}' to '{new_status}' is invalid for {model_name} {id}.".format(
                 new_status=new_status,
@@ -51,9 +48,53 @@ class StatusMixin(object):
             )
             raise InvalidStatus(msg)
 
+    # pylint: disable=access-member-before-definition,attribute-defined-outside-init
+    def set_status(self, new_status):
+        """Set a new status for this object.
+
+        If the requested status is not valid, then ``InvalidStatus`` is raised.
+        """
+        self.validate_status(new_status)
         self.status = new_status
         self.save()
 
+    @classmethod
+    def bulk_set_status(cls, objects, new_status):
+        """Set a new status for all of the given objects, with a single query.
+
+        If the requested status is not valid for any of the objects, then ``InvalidStatus`` is raised,
+        and none of them are updated. Historical records, which are not created by bulk updates, are
+        created for the updated objects.
+        """
+        objects = list(objects)
+        if not objects:
+            return
+
+        for obj in objects:
+            obj.validate_status(new_status)
+
+        modified = now()
+        cls.objects.filter(pk__in=[obj.pk for obj in objects]).update(status=new_status, modified=modified)
+
+        # Attribute the changes to the user making the request, as HistoricalRecords does for single saves.
+        request = getattr(HistoricalRecords.thread, 'request', None)
+        history_user = getattr(request, 'user', None)
+        if history_user is not None and not history_user.is_authenticated():
+            history_user = None
+
+        HistoricalModel = cls.history.model  # pylint: disable=no-member
+        history = []
+        for obj in objects:
+            obj.status = new_status
+            obj.modified = modified
+            history.append(HistoricalModel(
+                history_date=modified,
+                history_type='~',
+                history_user=history_user,
+                **dict((field.attname, getattr(obj, field.attname)) for field in cls._meta.fields)
+            ))
+        HistoricalModel.objects.bulk_create(history)
+
     def __str__(self):
         return unicode(self.id)
 
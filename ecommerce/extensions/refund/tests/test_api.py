@@ -1,17 +1,25 @@
 import ddt
 from django.test import override_settings
-from oscar.core.loading import get_model
+import mock
+from mock_django import mock_signal_receiver
+from oscar.apps.payment.exceptions import GatewayError
+from oscar.core.loading import get_class, get_model
 from oscar.test.newfactories import UserFactory
 
 from ecommerce.extensions.fulfillment.status import ORDER
-from ecommerce.extensions.refund.api import find_orders_associated_with_course, create_refunds
-from ecommerce.extensions.refund.tests.factories import RefundLineFactory
+from ecommerce.extensions.payment.tests.processors import DummyProcessor
+from ecommerce.extensions.refund.api import approve_refunds, find_orders_associated_with_course, create_refunds
+from ecommerce.extensions.refund.status import REFUND, REFUND_LINE
+from ecommerce.extensions.refund.tests.factories import RefundFactory, RefundLineFactory
 from ecommerce.extensions.refund.tests.mixins import RefundTestMixin
 from ecommerce.tests.testcases import TestCase
 
+PaymentEvent = get_model('order', 'PaymentEvent')
+post_refund = get_class('refund.signals', 'post_refund')
 ProductAttribute = get_model("catalogue", "ProductAttribute")
 ProductClass = get_model("catalogue", "ProductClass")
 Refund = get_model('refund', 'Refund')
+Source = get_model('payment', 'Source')
 
 OSCAR_INITIAL_REFUND_STATUS = 'REFUND_OPEN'
 OSCAR_INITIAL_REFUND_LINE_STATUS = 'REFUND_LINE_OPEN'
@@ -77,3 +85,126 @@ class ApiTests(RefundTestMixin, TestCase):
 
         actual = create_refunds([order], self.course.id)
         self.assertEqual(actual, [])
+
+
+@ddt.ddt
+@override_settings(PAYMENT_PROCESSORS=['ecommerce.extensions.payment.tests.processors.DummyProcessor'])
+class ApproveRefundsTests(RefundTestMixin, TestCase):
+    def setUp(self):
+        super(ApproveRefundsTests, self).setUp()
+        self.refunds = [self.create_refund(), self.create_refund()]
+
+    def revoke_fulfillment_for_refund(self, refund):
+        for line in refund.lines.all():
+            line.set_status(REFUND_LINE.COMPLETE)
+        return True
+
+    def approve_refunds(self, refunds, revoke_fulfillment=True):
+        with mock.patch('ecommerce.extensions.refund.api.revoke_fulfillment_for_refund',
+                        side_effect=self.revoke_fulfillment_for_refund) as mock_revoke:
+            with mock_signal_receiver(post_refund) as receiver:
+                results = approve_refunds([refund.id for refund in refunds], revoke_fulfillment=revoke_fulfillment)
+                self.assertEqual(receiver.call_count, sum(results.values()))
+
+        self.assertEqual(mock_revoke.call_count, len(refunds) if revoke_fulfillment else 0)
+        return results
+
+    def assert_status(self, refund, status, line_status):
+        refund = Refund.objects.get(id=refund.id)
+        self.assertEqual(refund.status, status)
+        for line in refund.lines.all():
+            self.assertEqual(line.status, line_status)
+        self.assertEqual(refund.history.first().status, status)
+
+    def assert_credit_issued(self, refund):
+        source = Source.objects.get(order=refund.order)
+        self.assertEqual(source.amount_refunded, refund.total_credit_excl_tax)
+        self.assertEqual(source.transactions.get().amount, refund.total_credit_excl_tax)
+
+        payment_event = PaymentEvent.objects.get(order=refund.order)
+        self.assertEqual(payment_event.amount, refund.total_credit_excl_tax)
+        self.assertEqual(payment_event.reference, DummyProcessor.REFUND_TRANSACTION_ID)
+        self.assertEqual(payment_event.processor_name, DummyProcessor.NAME)
+
+    @ddt.data(1, 4)
+    def test_approve_refunds(self, concurrency):
+        """ Verify credits are issued, and fulfillment revoked, for all of the refunds. """
+        with override_settings(REFUND_CREDIT_CONCURRENCY=concurrency):
+            with mock.patch.object(DummyProcessor, 'issue_credit', autospec=True,
+                                   return_value=DummyProcessor.REFUND_TRANSACTION_ID) as mock_issue_credit:
+                results = self.approve_refunds(self.refunds)
+
+        self.assertEqual(results, dict((refund.id, True) for refund in self.refunds))
+        self.assertEqual(mock_issue_credit.call_count, 2)
+        # The same processor instance is used for all refunds placed on a site.
+        self.assertIs(mock_issue_credit.call_args_list[0][0][0], mock_issue_credit.call_args_list[1][0][0])
+
+        for refund in self.refunds:
+            self.assert_status(refund, REFUND.COMPLETE, REFUND_LINE.COMPLETE)
+            self.assert_credit_issued(refund)
+
+    def test_approve_payment_only(self):
+        """ Verify the refunds are completed without revoking fulfillment, if so requested. """
+        results = self.approve_refunds(self.refunds, revoke_fulfillment=False)
+
+        self.assertEqual(results, dict((refund.id, True) for refund in self.refunds))
+        for refund in self.refunds:
+            self.assert_status(refund, REFUND.COMPLETE, REFUND_LINE.COMPLETE)
+            self.assert_credit_issued(refund)
+
+    @ddt.data(GatewayError, ValueError)
+    def test_payment_error(self, error_class):
+        """ Verify refunds whose credit could not be issued, for any reason, are marked as such, without
+        affecting the others. """
+        failed, succeeded = self.refunds
+
+        def issue_credit(processor, order, reference_number, amount, currency):  # pylint: disable=unused-argument
+            if order == failed.order:
+                raise error_class
+            return DummyProcessor.REFUND_TRANSACTION_ID
+
+        with mock.patch.object(DummyProcessor, 'issue_credit', autospec=True, side_effect=issue_credit):
+            with mock.patch('ecommerce.extensions.refund.api.revoke_fulfillment_for_refund',
+                            side_effect=self.revoke_fulfillment_for_refund):
+                results = approve_refunds([refund.id for refund in self.refunds])
+
+        self.assertEqual(results, {failed.id: False, succeeded.id: True})
+        self.assert_status(failed, REFUND.PAYMENT_REFUND_ERROR, REFUND_LINE.OPEN)
+        self.assertFalse(PaymentEvent.objects.filter(order=failed.order).exists())
+        self.assert_status(succeeded, REFUND.COMPLETE, REFUND_LINE.COMPLETE)
+        self.assert_credit_issued(succeeded)
+
+    def test_revocation_error(self):
+        """ Verify refunds whose fulfillment could not be revoked are marked as such. """
+        refund = self.refunds[0]
+
+        def revoke_fulfillment_for_refund(r):
+            for line in r.lines.all():
+                line.set_status(REFUND_LINE.REVOCATION_ERROR)
+            return False
+
+        with mock.patch('ecommerce.extensions.refund.api.revoke_fulfillment_for_refund',
+                        side_effect=revoke_fulfillment_for_refund):
+            self.assertEqual(approve_refunds([refund.id]), {refund.id: False})
+
+        self.assert_status(refund, REFUND.REVOCATION_ERROR, REFUND_LINE.REVOCATION_ERROR)
+        self.assert_credit_issued(refund)
+
+    def test_free_order(self):
+        """ Verify refunds of orders without payment sources are approved without issuing credits. """
+        refund = RefundFactory()
+        with mock.patch.object(DummyProcessor, 'issue_credit') as mock_issue_credit:
+            self.assertEqual(self.approve_refunds([refund]), {refund.id: True})
+
+        self.assertFalse(mock_issue_credit.called)
+        self.assert_status(refund, REFUND.COMPLETE, REFUND_LINE.COMPLETE)
+
+    @ddt.data(REFUND.COMPLETE, REFUND.DENIED)
+    def test_wrong_state(self, status):
+        """ Verify refunds which cannot be approved are left untouched. """
+        refund = RefundFactory(status=status)
+        with mock.patch('ecommerce.extensions.refund.api.revoke_fulfillment_for_refund') as mock_revoke:
+            self.assertEqual(approve_refunds([refund.id]), {refund.id: False})
+
+        self.assertFalse(mock_revoke.called)
+        self.assert_status(refund, status, REFUND_LINE.OPEN)
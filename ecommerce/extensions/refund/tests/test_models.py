@@ -5,6 +5,7 @@ from django.conf import settings
 from oscar.apps.payment.exceptions import PaymentError
 from oscar.core.loading import get_model, get_class
 from oscar.test.newfactories import UserFactory
+from simple_history.models import HistoricalRecords
 from testfixtures import LogCapture
 
 from ecommerce.core.url_utils import get_lms_enrollment_api_url
@@ -61,6 +62,19 @@ class StatusTestsMixin(object):
                 instance.set_status(new_status)
                 self.assertEqual(instance.status, new_status, 'Refund status was not updated!')
 
+    def test_bulk_set_status_history_user(self):
+        """ Verify the historical records created by bulk status changes are attributed to the requesting user. """
+        status, valid_statuses = next((status, statuses) for status, statuses in self.pipeline.iteritems() if statuses)
+        instance = self._get_instance(status=status)
+        user = UserFactory()
+
+        with mock.patch.object(HistoricalRecords.thread, 'request', mock.Mock(user=user), create=True):
+            instance.__class__.bulk_set_status([instance], valid_statuses[0])
+
+        history = instance.history.first()
+        self.assertEqual(history.status, valid_statuses[0])
+        self.assertEqual(history.history_user, user)
+
 
 @ddt.ddt
 class RefundTests(RefundTestMixin, StatusTestsMixin, TestCase):
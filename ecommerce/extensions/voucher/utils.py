@@ -16,6 +16,7 @@ from oscar.core.loading import get_model
 from oscar.templatetags.currency_filters import currency
 import pytz
 
+from ecommerce.core.routers import use_read_replica
 from ecommerce.core.url_utils import get_ecommerce_url
 from ecommerce.extensions.api import exceptions
 from ecommerce.extensions.offer.utils import get_discount_percentage, get_discount_value
@@ -174,6 +175,7 @@ def _get_voucher_info_for_coupon_report(voucher):
     return coupon_data
 
 
+@use_read_replica
 def generate_coupon_report(coupon_vouchers):
     """
     Generate coupon report data
@@ -1,12 +1,16 @@
 import logging
 
 from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.utils.timezone import now
 from oscar.core.loading import get_model
 
 from ecommerce.core.models import BusinessClient
 from ecommerce.invoice.models import Invoice
 
 logger = logging.getLogger(__name__)
+Basket = get_model('basket', 'Basket')
 Order = get_model('order', 'Order')
 
 
@@ -16,23 +20,136 @@ class Command(BaseCommand):
     and set the basket values to None. Creates a new business client object
     from the basket owner username value and assigns it to the invoice if there
     is not one assigned already.
+
+    Invoices are processed in batches, each of which is updated with a single query.
     """
     ch = logging.StreamHandler()
     ch.setLevel(logging.DEBUG)
     logger.addHandler(ch)
 
+    def add_arguments(self, parser):
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=1000,
+                            type=int,
+                            help='Number of invoices processed in each batch.')
+        parser.add_argument('--dry-run',
+                            action='store_true',
+                            dest='dry_run',
+                            default=False,
+                            help='Only log the number of invoices that would be updated, without changing them.')
+
     def handle(self, *args, **options):
-        for invoice in Invoice.objects.all():
-            if invoice.basket:
-                try:
-                    order = Order.objects.get(basket=invoice.basket)
-                    invoice.order = order
-                    if not invoice.business_client:
-                        invoice.business_client, __ = BusinessClient.objects.get_or_create(
-                            name=invoice.basket.owner.username
-                        )
-                    invoice.basket = None
-                    invoice.save()
-                    logger.info('Order [%d] saved to invoice [%d].', order.id, invoice.id)
-                except Order.DoesNotExist:
-                    logger.info('Order for basket [%s] does not exist.', invoice.basket)
+        queryset = Invoice.objects.filter(basket__isnull=False)
+        total = queryset.count()
+        batch_size = options['batch_size']
+        commit = not options['dry_run']
+
+        processed = 0
+        populated = 0
+        last_id = 0
+        while True:
+            invoices = queryset.filter(pk__gt=last_id).order_by('pk')
+            invoices = list(invoices.values_list('pk', 'basket_id', 'business_client_id')[:batch_size])
+            if not invoices:
+                break
+
+            last_id = invoices[-1][0]
+            updates = self.get_updates(invoices, commit)
+            if commit and updates:
+                with transaction.atomic():
+                    self.update_invoices(updates)
+
+            processed += len(invoices)
+            populated += len(updates)
+            logger.info('Processed [%d] of [%d] invoices.', processed, total)
+
+        if commit:
+            logger.info('Populated the order of [%d] invoices.', populated)
+        else:
+            logger.info(
+                'This has been a dry run. Without the --dry-run flag, the command would have '
+                'populated the order of [%d] invoices.', populated
+            )
+
+    def get_updates(self, invoices, commit):
+        """
+        Determines the order and business client of each of the given invoices.
+
+        Invoices whose basket has not been ordered are left untouched. Business clients named after
+        basket owners are created as needed, unless this is a dry run.
+
+        Arguments:
+            invoices (list): Tuples of invoice ID, basket ID and business client ID.
+            commit (bool): Whether missing business clients should be created.
+
+        Returns:
+            dict: Mapping of invoice ID to a tuple of order ID and business client ID.
+        """
+        basket_ids = set(basket_id for __, basket_id, __ in invoices)
+        order_ids = {}
+        # Baskets are not expected to have multiple orders. Should one have any, use the first one.
+        for basket_id, order_id in Order.objects.filter(basket_id__in=basket_ids).order_by('id').values_list(
+                'basket_id', 'id'):
+            order_ids.setdefault(basket_id, order_id)
+
+        invoices = [invoice for invoice in invoices if invoice[1] in order_ids]
+        usernames = dict(
+            Basket.objects.filter(
+                id__in=[basket_id for __, basket_id, business_client_id in invoices if not business_client_id]
+            ).values_list('id', 'owner__username')
+        )
+
+        business_client_ids = {}
+        if usernames and commit:
+            names = set(usernames.values())
+            business_client_ids = dict(BusinessClient.objects.filter(name__in=names).values_list('name', 'id'))
+            missing = names.difference(business_client_ids)
+            if missing:
+                BusinessClient.objects.bulk_create([BusinessClient(name=name) for name in missing])
+                business_client_ids = dict(
+                    BusinessClient.objects.filter(name__in=names).values_list('name', 'id')
+                )
+
+        return dict(
+            (
+                invoice_id,
+                (order_ids[basket_id], business_client_id or business_client_ids.get(usernames.get(basket_id)))
+            )
+            for invoice_id, basket_id, business_client_id in invoices
+        )
+
+    def update_invoices(self, updates):
+        """
+        Updates the orders and business clients of invoices, and clears their baskets, with a single query.
+
+        Historical records, which are not created by bulk updates, are created for the updated invoices.
+
+        Arguments:
+            updates (dict): Mapping of invoice ID to a tuple of order ID and business client ID.
+        """
+        Invoice.objects.filter(pk__in=updates.keys()).update(
+            basket=None,
+            order_id=Case(
+                *[When(pk=invoice_id, then=Value(order_id)) for invoice_id, (order_id, __) in updates.items()],
+                output_field=IntegerField()
+            ),
+            business_client_id=Case(
+                *[
+                    When(pk=invoice_id, then=Value(business_client_id))
+                    for invoice_id, (__, business_client_id) in updates.items()
+                ],
+                output_field=IntegerField()
+            )
+        )
+
+        history_date = now()
+        Invoice.history.model.objects.bulk_create([
+            Invoice.history.model(
+                history_date=history_date,
+                history_type='~',
+                **dict((field.attname, getattr(invoice, field.attname)) for field in Invoice._meta.fields)
+            )
+            for invoice in Invoice.objects.filter(pk__in=updates.keys())
+        ])
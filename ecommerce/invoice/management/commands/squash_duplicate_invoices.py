@@ -1,6 +1,7 @@
 import logging
 
 from django.core.management import BaseCommand
+from django.db import transaction
 
 from ecommerce.extensions.catalogue.models import Product
 from ecommerce.invoice.models import Invoice
@@ -13,14 +14,83 @@ class Command(BaseCommand):
     Squash duplicate invoices for coupon orders.
     When we moved from re-using a coupon some of them had already more than one invoice,
     and we are not having that! Monogamy rulez here, yerr damn hippies!
+
+    Coupons are processed in batches. The invoices of all coupons in a batch are retrieved
+    with a single query, and their duplicates deleted together.
     """
     ch = logging.StreamHandler()
     ch.setLevel(logging.DEBUG)
     logger.addHandler(ch)
 
+    def add_arguments(self, parser):
+        parser.add_argument('-b', '--batch-size',
+                            action='store',
+                            dest='batch_size',
+                            default=1000,
+                            type=int,
+                            help='Number of coupons processed in each batch.')
+        parser.add_argument('--dry-run',
+                            action='store_true',
+                            dest='dry_run',
+                            default=False,
+                            help='Only log the number of duplicate invoices that would be deleted, without '
+                                 'deleting them.')
+
     def handle(self, *args, **options):
-        for coupon in Product.objects.filter(product_class__name='Coupon'):
-            qs = Invoice.objects.filter(order__lines__product=coupon).order_by('created')
-            if qs.count() > 1:
-                qs.exclude(pk=qs.first().id).delete()
-                logger.info('Deleted douplicate invoices of coupon %s', coupon.id)
+        coupons = Product.objects.filter(product_class__name='Coupon')
+        total = coupons.count()
+        batch_size = options['batch_size']
+        commit = not options['dry_run']
+
+        processed = 0
+        deleted = 0
+        last_id = 0
+        while True:
+            coupon_ids = list(coupons.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not coupon_ids:
+                break
+
+            last_id = coupon_ids[-1]
+            duplicate_ids = self.get_duplicate_invoice_ids(coupon_ids)
+            if commit and duplicate_ids:
+                with transaction.atomic():
+                    Invoice.objects.filter(pk__in=duplicate_ids).delete()
+
+            processed += len(coupon_ids)
+            deleted += len(duplicate_ids)
+            logger.info('Processed [%d] of [%d] coupons.', processed, total)
+
+        if commit:
+            logger.info('Deleted [%d] duplicate invoices.', deleted)
+        else:
+            logger.info(
+                'This has been a dry run. Without the --dry-run flag, the command would have '
+                'deleted [%d] duplicate invoices.', deleted
+            )
+
+    def get_duplicate_invoice_ids(self, coupon_ids):
+        """
+        Determines which invoices of the given coupons are duplicates.
+
+        The earliest invoice of each coupon is kept. All others are duplicates, unless they are
+        the earliest invoice of another coupon.
+
+        Arguments:
+            coupon_ids (list): IDs of the coupon products.
+
+        Returns:
+            set: IDs of the duplicate invoices.
+        """
+        invoices = Invoice.objects.filter(
+            order__lines__product_id__in=coupon_ids
+        ).order_by(
+            'order__lines__product_id', 'created', 'pk'
+        ).values_list('order__lines__product_id', 'pk')
+
+        kept = {}
+        invoice_ids = set()
+        for coupon_id, invoice_id in invoices:
+            kept.setdefault(coupon_id, invoice_id)
+            invoice_ids.add(invoice_id)
+
+        return invoice_ids.difference(kept.values())
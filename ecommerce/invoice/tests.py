@@ -1,12 +1,15 @@
 from django.core.management import call_command
 from oscar.core.loading import get_model
 from oscar.test import factories
+from testfixtures import LogCapture
 
 from ecommerce.core.models import BusinessClient
 from ecommerce.invoice.models import Invoice
 from ecommerce.tests.testcases import TestCase
 
 Order = get_model('order', 'Order')
+POPULATE_LOGGER_NAME = 'ecommerce.invoice.management.commands.populate_invoice_orders'
+SQUASH_LOGGER_NAME = 'ecommerce.invoice.management.commands.squash_duplicate_invoices'
 
 
 class InvoiceTests(TestCase):
@@ -54,6 +57,16 @@ class PopulateInvoiceOrdersCommandTests(TestCase):
         self.assertIsNone(invoice_after.basket)
         self.assertEqual(invoice_after.order, self.order)
 
+    def test_multiple_orders(self):
+        """Verify the first order of a basket with several orders is used."""
+        self.order.basket = self.basket
+        self.order.save()
+        factories.OrderFactory(basket=self.basket)
+        Invoice.objects.create(basket=self.basket)
+
+        call_command('populate_invoice_orders')
+        self.assertEqual(Invoice.objects.first().order, self.order)
+
     def test_non_existing_order(self):
         """Verify the invoice is not altered if no order exists."""
         self.assertIsNone(self.order.basket)
@@ -98,6 +111,65 @@ class PopulateInvoiceOrdersCommandTests(TestCase):
         invoice_after = Invoice.objects.first()
         self.assertEqual(invoice_after.business_client, business_client)
 
+    def test_dry_run(self):
+        """Verify the invoices are not altered, and the number of invoices to be populated is logged,
+        if the dry run flag is set."""
+        self.order.basket = self.basket
+        self.order.save()
+        Invoice.objects.create(basket=self.basket)
+
+        with LogCapture(POPULATE_LOGGER_NAME) as log:
+            call_command('populate_invoice_orders', dry_run=True)
+            log.check(
+                (POPULATE_LOGGER_NAME, 'INFO', 'Processed [1] of [1] invoices.'),
+                (
+                    POPULATE_LOGGER_NAME,
+                    'INFO',
+                    'This has been a dry run. Without the --dry-run flag, the command would have '
+                    ' populated the order of [1] invoices.'
+                ),
+            )
+
+        invoice = Invoice.objects.first()
+        self.assertEqual(invoice.basket, self.basket)
+        self.assertIsNone(invoice.order)
+        self.assertIsNone(invoice.business_client)
+        self.assertEqual(BusinessClient.objects.count(), 0)
+
+    def test_batches(self):
+        """Verify invoices are processed in batches, and their history is recorded."""
+        self.order.basket = self.basket
+        self.order.save()
+        business_client = BusinessClient.objects.create(name='Tester')
+        invoices = [Invoice.objects.create(basket=self.basket, business_client=business_client)]
+
+        for __ in range(2):
+            basket = factories.BasketFactory(owner=self.basket.owner)
+            order = factories.OrderFactory()
+            order.basket = basket
+            order.save()
+            invoices.append(Invoice.objects.create(basket=basket))
+
+        with LogCapture(POPULATE_LOGGER_NAME) as log:
+            call_command('populate_invoice_orders', batch_size=2)
+            log.check(
+                (POPULATE_LOGGER_NAME, 'INFO', 'Processed [2] of [3] invoices.'),
+                (POPULATE_LOGGER_NAME, 'INFO', 'Processed [3] of [3] invoices.'),
+                (POPULATE_LOGGER_NAME, 'INFO', 'Populated the order of [3] invoices.'),
+            )
+
+        owner_client = BusinessClient.objects.get(name=self.basket.owner.username)
+        for invoice in invoices:
+            invoice = Invoice.objects.get(id=invoice.id)
+            self.assertIsNone(invoice.basket)
+            self.assertEqual(invoice.order.basket_id, Invoice.history.filter(id=invoice.id).last().basket_id)
+            self.assertEqual(invoice.business_client, business_client if invoice == invoices[0] else owner_client)
+
+            latest = invoice.history.first()
+            self.assertEqual(latest.history_type, '~')
+            self.assertEqual(latest.order_id, invoice.order_id)
+            self.assertIsNone(latest.basket_id)
+
 
 class SquashDuplicateInvoicesCommandTests(TestCase):
     """Tests for the squash_duplicate_invoices command."""
@@ -125,6 +197,47 @@ class SquashDuplicateInvoicesCommandTests(TestCase):
         call_command('squash_duplicate_invoices')
         self.assert_unique_invoice(self.product, self.invoice)
 
+    def test_dry_run(self):
+        """Verify no invoices are deleted, and the number of duplicates is logged, if the dry run flag is set."""
+        Invoice.objects.create(order=self.order)
+
+        with LogCapture(SQUASH_LOGGER_NAME) as log:
+            call_command('squash_duplicate_invoices', dry_run=True)
+            log.check(
+                (SQUASH_LOGGER_NAME, 'INFO', 'Processed [1] of [1] coupons.'),
+                (
+                    SQUASH_LOGGER_NAME,
+                    'INFO',
+                    'This has been a dry run. Without the --dry-run flag, the command would have '
+                    ' deleted [1] duplicate invoices.'
+                ),
+            )
+        self.assertEqual(Invoice.objects.filter(order__lines__product=self.product).count(), 2)
+
+    def test_batches(self):
+        """Verify the duplicate invoices of multiple coupons are squashed in batches."""
+        Invoice.objects.create(order=self.order)
+        other_product = factories.ProductFactory(
+            product_class=self.product.product_class,
+            stockrecords__partner=self.product.stockrecords.first().partner
+        )
+        basket = factories.BasketFactory()
+        basket.add_product(other_product, 1)
+        other_order = factories.create_order(basket=basket)
+        other_invoice = Invoice.objects.create(order=other_order)
+        Invoice.objects.create(order=other_order)
+        Invoice.objects.create(order=other_order)
+
+        with LogCapture(SQUASH_LOGGER_NAME) as log:
+            call_command('squash_duplicate_invoices', batch_size=1)
+            log.check(
+                (SQUASH_LOGGER_NAME, 'INFO', 'Processed [1] of [2] coupons.'),
+                (SQUASH_LOGGER_NAME, 'INFO', 'Processed [2] of [2] coupons.'),
+                (SQUASH_LOGGER_NAME, 'INFO', 'Deleted [3] duplicate invoices.'),
+            )
+        self.assert_unique_invoice(self.product, self.invoice)
+        self.assert_unique_invoice(other_product, other_invoice)
+
     def test_not_squashing_invoices(self):
         """Verify the non-duplicate invoices are left the same."""
         self.assertEqual(Invoice.objects.filter(order__lines__product=self.product).count(), 1)
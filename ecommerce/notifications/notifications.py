@@ -1,7 +1,6 @@
 import logging
 
 from oscar.core.loading import get_model, get_class
-from premailer import transform
 
 from ecommerce.extensions.analytics.utils import parse_tracking_context
 
@@ -46,5 +45,8 @@ def send_notification(user, commtype_code, context, site):
         messages = event_type.get_messages(context)
 
     if messages and (messages['body'] or messages['html']):
+        # premailer, and the CSS and HTML parsers it depends on, are slow to import.
+        from premailer import transform
+
         messages['html'] = transform(messages['html'])
         Dispatcher().dispatch_user_messages(user, messages, site)
@@ -1,14 +1,20 @@
 import logging
+import threading
 
 import waffle
+from celery import group
+from django.core.signals import request_finished, request_started
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from ecommerce_worker.sailthru.v1.tasks import update_course_enrollment
 from oscar.core.loading import get_class, get_model
 
+from ecommerce.core.cache_versions import bump_on_commit, get_version
 from ecommerce.core.constants import SEAT_PRODUCT_CLASS_NAME
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.utils import mode_for_seat
 from ecommerce.extensions.analytics.utils import silence_exceptions
+from ecommerce.extensions.catalogue.utils import load_product_attributes
 
 logger = logging.getLogger(__name__)
 post_checkout = get_class('checkout.signals', 'post_checkout')
@@ -16,6 +22,17 @@ basket_addition = get_class('basket.signals', 'basket_addition')
 BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
 SAILTHRU_CAMPAIGN = 'sailthru_bid'
+SAILTHRU_CAMPAIGN_VERSION_CACHE_KEY = 'sailthru_campaign_attribute_type_version'
+
+# ID of the campaign ID attribute type held in memory, and the shared version it was loaded at.
+_basket_attribute_type_cache = {
+    'version': None,
+    'id': None,
+}
+
+# Notifications of the basket additions made by the request being processed by this thread. Additions are
+# only buffered while a request is being processed.
+_pending_basket_additions = threading.local()
 
 
 @receiver(post_checkout)
@@ -41,18 +58,16 @@ def process_checkout_complete(sender, order=None, user=None, request=None,  # py
         message_id = request.COOKIES.get('sailthru_bid')
 
     if not message_id:
-        saved_id = BasketAttribute.objects.filter(
+        message_id = BasketAttribute.objects.filter(
             basket=order.basket,
-            attribute_type=get_basket_attribute_type()
-        )
-        if len(saved_id) > 0:
-            message_id = saved_id[0].value_text
+            attribute_type_id=get_basket_attribute_type_id()
+        ).values_list('value_text', flat=True).first()
 
-    # loop through lines in order
-    #  If multi product orders become common it may be worthwhile to pass an array of
-    #  orders to the worker in one call to save overhead, however, that would be difficult
-    #  because of the fact that there are different templates for free enroll versus paid enroll
-    for line in order.lines.all():
+    lines = list(order.lines.select_related('product__product_class', 'product__parent__product_class'))
+    load_product_attributes([line.product for line in lines])
+
+    notifications = []
+    for line in lines:
 
         # get product
         product = line.product
@@ -64,12 +79,16 @@ def process_checkout_complete(sender, order=None, user=None, request=None,  # py
             price = line.line_price_excl_tax
             course_id = product.course_id
 
-            # Tell Sailthru that the purchase is complete asynchronously
-            update_course_enrollment.delay(order.user.email, _build_course_url(course_id),
+            notifications.append(
+                update_course_enrollment.s(order.user.email, _build_course_url(course_id),
                                            False, mode_for_seat(product),
                                            unit_cost=price, course_id=course_id, currency=order.currency,
                                            site_code=partner.short_code,
                                            message_id=message_id)
+            )
+
+    # Tell Sailthru that the purchase is complete asynchronously
+    _send_notifications(notifications)
 
 
 @receiver(basket_addition)
@@ -78,6 +97,10 @@ def process_basket_addition(sender, product=None, user=None, request=None, baske
                             **kwargs):  # pylint: disable=unused-argument
     """Tell Sailthru when payment started.
 
+    Sailthru is notified once the request has finished, with the notifications for all of the products
+    added to the basket during the request being sent together. Additions made outside of a request, for
+    example by a Celery task or management command, are sent immediately.
+
     Arguments:
             Parameters described at http://django-oscar.readthedocs.io/en/releases-1.1/ref/signals.html
     """
@@ -95,29 +118,84 @@ def process_basket_addition(sender, product=None, user=None, request=None, baske
 
         course_id = product.course_id
 
-        stock_record = product.stockrecords.first()
-        if stock_record:
-            price = stock_record.price_excl_tax
-            currency = stock_record.price_currency
+        # Use the stock records prefetched with the product, if any.
+        stock_records = product.stockrecords.all()
+        price = None
+        if stock_records:
+            price = stock_records[0].price_excl_tax
+            currency = stock_records[0].price_currency
 
-        # save Sailthru campaign ID, if there is one
+        # save Sailthru campaign ID, if there is one, unless it has already been saved during this request
         message_id = request.COOKIES.get('sailthru_bid')
-        if message_id and basket:
+        if message_id and basket and getattr(basket, '_sailthru_campaign_id', None) != message_id:
             BasketAttribute.objects.update_or_create(
                 basket=basket,
-                attribute_type=get_basket_attribute_type(),
+                attribute_type_id=get_basket_attribute_type_id(),
                 defaults={'value_text': message_id}
             )
+            basket._sailthru_campaign_id = message_id  # pylint: disable=protected-access
 
         # inform sailthru if there is a price.  The purpose of this call is to tell Sailthru when
         # an item has been added to the shopping cart so that an abandoned cart message can be sent
         # later if the purchase is not completed.  Abandoned cart support is only for purchases, not
         # for free enrolls
         if price:
-            update_course_enrollment.delay(user.email, _build_course_url(course_id), True, mode_for_seat(product),
-                                           unit_cost=price, course_id=course_id, currency=currency,
-                                           site_code=partner.short_code,
-                                           message_id=message_id)
+            addition = (
+                user.email, product,
+                dict(unit_cost=price, course_id=course_id, currency=currency, site_code=partner.short_code,
+                     message_id=message_id)
+            )
+            additions = getattr(_pending_basket_additions, 'additions', None)
+            if additions is None:
+                _send_basket_addition_notifications([addition])
+            else:
+                additions.append(addition)
+
+
+@receiver(request_started, dispatch_uid='sailthru.start_basket_addition_notifications')
+def start_basket_addition_notifications(**kwargs):  # pylint: disable=unused-argument
+    """Start buffering the Sailthru notifications of the basket additions made by the request that has started."""
+    _pending_basket_additions.additions = []
+
+
+@receiver(request_finished, dispatch_uid='sailthru.send_basket_addition_notifications')
+@silence_exceptions("Failed to call Sailthru upon basket addition.")
+def send_basket_addition_notifications(**kwargs):  # pylint: disable=unused-argument
+    """Send the Sailthru notifications of the basket additions made by the request that has just finished."""
+    additions = getattr(_pending_basket_additions, 'additions', None)
+    if additions is None:
+        return
+
+    del _pending_basket_additions.additions
+    _send_basket_addition_notifications(additions)
+
+
+def _send_basket_addition_notifications(additions):
+    """Send the Sailthru notifications of the given basket additions together.
+
+    Arguments:
+        additions (list): Tuples of the user's email address, the product added, and the task's keyword arguments.
+    """
+    if not additions:
+        return
+
+    load_product_attributes([product for __, product, __ in additions])
+    _send_notifications([
+        update_course_enrollment.s(email, _build_course_url(task_kwargs['course_id']), True, mode_for_seat(product),
+                                   **task_kwargs)
+        for email, product, task_kwargs in additions
+    ])
+
+
+def _send_notifications(notifications):
+    """Enqueue the given update_course_enrollment task signatures.
+
+    The tasks are published together, over a single broker connection, but each of them is still
+    published as a separate message: update_course_enrollment belongs to ecommerce-worker, and takes a
+    single enrollment.
+    """
+    if notifications:
+        group(notifications).apply_async()
 
 
 def _build_course_url(course_id):
@@ -125,10 +203,26 @@ def _build_course_url(course_id):
     return get_lms_url('courses/{}/info'.format(course_id))
 
 
-def get_basket_attribute_type():
-    """ Returns `BasketAttributeType` for Sailthru campaign ID.
+def get_basket_attribute_type_id():
+    """ Returns the ID of the `BasketAttributeType` for Sailthru campaign ID.
+
+    The ID is retrieved once per process, and again only after the attribute type has been modified by any process.
 
     Returns:
-        BasketAttributeType
+        int
     """
-    return BasketAttributeType.objects.get(name=SAILTHRU_CAMPAIGN)
+    version = get_version(SAILTHRU_CAMPAIGN_VERSION_CACHE_KEY)
+    if version != _basket_attribute_type_cache['version']:
+        _basket_attribute_type_cache.update({
+            'version': version,
+            'id': BasketAttributeType.objects.get(name=SAILTHRU_CAMPAIGN).id,
+        })
+    return _basket_attribute_type_cache['id']
+
+
+@receiver(post_save, sender=BasketAttributeType, dispatch_uid='sailthru.basket_attribute_type_saved')
+@receiver(post_delete, sender=BasketAttributeType, dispatch_uid='sailthru.basket_attribute_type_deleted')
+def invalidate_basket_attribute_type_cache(*_args, **kwargs):  # pylint: disable=unused-argument
+    """ Clears the attribute type ID held in memory by this process, and by all other processes. """
+    _basket_attribute_type_cache['version'] = None
+    bump_on_commit(SAILTHRU_CAMPAIGN_VERSION_CACHE_KEY)
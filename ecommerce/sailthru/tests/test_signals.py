@@ -1,7 +1,10 @@
 """Tests of ecommerce sailthru signal handlers."""
 import logging
 
+from django.core.cache import cache
+from django.core.signals import request_finished, request_started
 from django.test.client import RequestFactory
+from ecommerce_worker.sailthru.v1.tasks import update_course_enrollment
 from mock import patch
 from oscar.core.loading import get_model
 from oscar.test.factories import create_order
@@ -11,10 +14,14 @@ from ecommerce.core.tests import toggle_switch
 from ecommerce.coupons.tests.mixins import CouponMixin
 from ecommerce.courses.models import Course
 from ecommerce.extensions.catalogue.tests.mixins import CourseCatalogTestMixin
-from ecommerce.sailthru.signals import process_checkout_complete, process_basket_addition, SAILTHRU_CAMPAIGN
+from ecommerce.sailthru import signals
+from ecommerce.sailthru.signals import (
+    get_basket_attribute_type_id, process_checkout_complete, process_basket_addition, SAILTHRU_CAMPAIGN
+)
 from ecommerce.tests.factories import SiteConfigurationFactory
 from ecommerce.tests.testcases import TestCase
 
+BasketAttribute = get_model('basket', 'BasketAttribute')
 BasketAttributeType = get_model('basket', 'BasketAttributeType')
 log = logging.getLogger(__name__)
 
@@ -27,6 +34,12 @@ class SailthruSignalTests(CouponMixin, CourseCatalogTestMixin, TestCase):
 
     def setUp(self):
         super(SailthruSignalTests, self).setUp()
+        cache.clear()
+        # pylint: disable=protected-access
+        patcher = patch.dict(signals._basket_attribute_type_cache, {'version': None, 'id': None})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
         self.request_factory = RequestFactory()
         self.request = self.request_factory.get("foo")
         self.request.COOKIES['sailthru_bid'] = CAMPAIGN_COOKIE
@@ -52,135 +65,135 @@ class SailthruSignalTests(CouponMixin, CourseCatalogTestMixin, TestCase):
         process_basket_addition(None)
         self.assertFalse(mock_log_error.called)
 
-    @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
+    @patch('ecommerce.sailthru.signals.group')
     @patch('ecommerce.sailthru.signals.logger.error')
-    def test_partner_not_supported(self, mock_log_error, mock_update_course_enrollment):
+    def test_partner_not_supported(self, mock_log_error, mock_group):
         """ Verify Sailthru is not contacted if the Partner does not support Sailthru. """
         site_configuration = SiteConfigurationFactory(partner__name='TestX')
         site_configuration.partner.enable_sailthru = False
         self.request.site.siteconfiguration = site_configuration
-        process_basket_addition(None, request=self.request)
-        self.assertFalse(mock_update_course_enrollment.called)
+        self._process_basket_addition(request=self.request)
+        self.assertFalse(mock_group.called)
         self.assertFalse(mock_log_error.called)
 
         __, order = self._create_order(99)
         order.site.siteconfiguration = site_configuration
         process_checkout_complete(None, order=order)
-        self.assertFalse(mock_update_course_enrollment.called)
+        self.assertFalse(mock_group.called)
         self.assertFalse(mock_log_error.called)
 
-    @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
+    @patch('ecommerce.sailthru.signals.group')
     @patch('ecommerce.sailthru.signals.logger.error')
-    def test_unsupported_product_class(self, mock_log_error, mock_update_course_enrollment):
+    def test_unsupported_product_class(self, mock_log_error, mock_group):
         """ Verify Sailthru is not contacted for non-seat products. """
         coupon = self.create_coupon()
         basket = BasketFactory()
         basket.add_product(coupon, 1)
-        process_basket_addition(None, request=self.request,
-                                user=self.user,
-                                product=coupon, basket=basket)
-        self.assertFalse(mock_update_course_enrollment.called)
+        self._process_basket_addition(request=self.request,
+                                      user=self.user,
+                                      product=coupon, basket=basket)
+        self.assertFalse(mock_group.called)
         self.assertFalse(mock_log_error.called)
 
         order = create_order(number=1, basket=basket, user=self.user)
         process_checkout_complete(None, order=order, request=None)
-        self.assertFalse(mock_update_course_enrollment.called)
+        self.assertFalse(mock_group.called)
         self.assertFalse(mock_log_error.called)
 
-    @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
-    def test_process_checkout_complete(self, mock_update_course_enrollment):
+    @patch('ecommerce.sailthru.signals.group')
+    def test_process_checkout_complete(self, mock_group):
         """ Verify the post_checkout receiver is called, and contacts Sailthru. """
 
         seat, order = self._create_order(99)
         process_checkout_complete(None, order=order, request=self.request)
-        self.assertTrue(mock_update_course_enrollment.called)
-        mock_update_course_enrollment.assert_called_with(TEST_EMAIL,
-                                                         self.course_url,
-                                                         False,
-                                                         seat.attr.certificate_type,
-                                                         course_id=self.course_id,
-                                                         currency=order.currency,
-                                                         message_id=CAMPAIGN_COOKIE,
-                                                         site_code='edX',
-                                                         unit_cost=order.total_excl_tax)
-
-    @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
-    def test_process_checkout_complete_without_request(self, mock_update_course_enrollment):
+        self.assertTrue(mock_group.called)
+        self.assert_enrollment_updated(mock_group, TEST_EMAIL,
+                                       self.course_url,
+                                       False,
+                                       seat.attr.certificate_type,
+                                       course_id=self.course_id,
+                                       currency=order.currency,
+                                       message_id=CAMPAIGN_COOKIE,
+                                       site_code='edX',
+                                       unit_cost=order.total_excl_tax)
+
+    @patch('ecommerce.sailthru.signals.group')
+    def test_process_checkout_complete_without_request(self, mock_group):
         """ Verify the post_checkout receiver can handle cases in which it is called without a request. """
 
         seat, order = self._create_order(99)
         process_checkout_complete(None, order=order)
-        self.assertTrue(mock_update_course_enrollment.called)
-        mock_update_course_enrollment.assert_called_with(TEST_EMAIL,
-                                                         self.course_url,
-                                                         False,
-                                                         seat.attr.certificate_type,
-                                                         course_id=self.course_id,
-                                                         currency=order.currency,
-                                                         message_id=None,
-                                                         site_code='edX',
-                                                         unit_cost=order.total_excl_tax)
-
-    @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
-    def test_basket_addition(self, mock_update_course_enrollment):
+        self.assertTrue(mock_group.called)
+        self.assert_enrollment_updated(mock_group, TEST_EMAIL,
+                                       self.course_url,
+                                       False,
+                                       seat.attr.certificate_type,
+                                       course_id=self.course_id,
+                                       currency=order.currency,
+                                       message_id=None,
+                                       site_code='edX',
+                                       unit_cost=order.total_excl_tax)
+
+    @patch('ecommerce.sailthru.signals.group')
+    def test_basket_addition(self, mock_group):
         """ Verify the basket_addition receiver is called, and contacts Sailthru. """
 
         seat, order = self._create_order(99)
-        process_basket_addition(None, request=self.request,
-                                user=self.user,
-                                product=seat)
-        self.assertTrue(mock_update_course_enrollment.called)
-        mock_update_course_enrollment.assert_called_with(TEST_EMAIL,
-                                                         self.course_url,
-                                                         True,
-                                                         seat.attr.certificate_type,
-                                                         course_id=self.course_id,
-                                                         currency=order.currency,
-                                                         message_id=CAMPAIGN_COOKIE,
-                                                         site_code='edX',
-                                                         unit_cost=order.total_excl_tax)
-
-    @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
-    def test_basket_addition_with_free_product(self, mock_update_course_enrollment):
+        self._process_basket_addition(request=self.request,
+                                      user=self.user,
+                                      product=seat)
+        self.assertTrue(mock_group.called)
+        self.assert_enrollment_updated(mock_group, TEST_EMAIL,
+                                       self.course_url,
+                                       True,
+                                       seat.attr.certificate_type,
+                                       course_id=self.course_id,
+                                       currency=order.currency,
+                                       message_id=CAMPAIGN_COOKIE,
+                                       site_code='edX',
+                                       unit_cost=order.total_excl_tax)
+
+    @patch('ecommerce.sailthru.signals.group')
+    def test_basket_addition_with_free_product(self, mock_group):
         """ Verify Sailthru is not contacted when free items are added to the basket. """
 
         seat = self._create_order(0)[0]
-        process_basket_addition(None, request=self.request,
-                                user=self.user,
-                                product=seat)
-        self.assertFalse(mock_update_course_enrollment.called)
+        self._process_basket_addition(request=self.request,
+                                      user=self.user,
+                                      product=seat)
+        self.assertFalse(mock_group.called)
 
-    @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
-    def test_basket_attribute_update(self, mock_update_course_enrollment):
+    @patch('ecommerce.sailthru.signals.group')
+    def test_basket_attribute_update(self, mock_group):
         """ Verify the Sailthru campaign ID is saved as a basket attribute. """
 
         seat, order = self._create_order(99)
-        process_basket_addition(None, request=self.request,
-                                user=self.user,
-                                product=seat, basket=order.basket)
-        self.assertTrue(mock_update_course_enrollment.called)
-        mock_update_course_enrollment.assert_called_with(TEST_EMAIL,
-                                                         self.course_url,
-                                                         True,
-                                                         seat.attr.certificate_type,
-                                                         course_id=self.course_id,
-                                                         currency=order.currency,
-                                                         message_id=CAMPAIGN_COOKIE,
-                                                         site_code='edX',
-                                                         unit_cost=order.total_excl_tax)
+        self._process_basket_addition(request=self.request,
+                                      user=self.user,
+                                      product=seat, basket=order.basket)
+        self.assertTrue(mock_group.called)
+        self.assert_enrollment_updated(mock_group, TEST_EMAIL,
+                                       self.course_url,
+                                       True,
+                                       seat.attr.certificate_type,
+                                       course_id=self.course_id,
+                                       currency=order.currency,
+                                       message_id=CAMPAIGN_COOKIE,
+                                       site_code='edX',
+                                       unit_cost=order.total_excl_tax)
 
         # now call checkout_complete with the same basket to see if campaign id saved and restored
         process_checkout_complete(None, order=order, request=None)
-        self.assertTrue(mock_update_course_enrollment.called)
-        mock_update_course_enrollment.assert_called_with(TEST_EMAIL,
-                                                         self.course_url,
-                                                         False,
-                                                         seat.attr.certificate_type,
-                                                         course_id=self.course_id,
-                                                         currency=order.currency,
-                                                         message_id=CAMPAIGN_COOKIE,
-                                                         site_code='edX',
-                                                         unit_cost=order.total_excl_tax)
+        self.assertTrue(mock_group.called)
+        self.assert_enrollment_updated(mock_group, TEST_EMAIL,
+                                       self.course_url,
+                                       False,
+                                       seat.attr.certificate_type,
+                                       course_id=self.course_id,
+                                       currency=order.currency,
+                                       message_id=CAMPAIGN_COOKIE,
+                                       site_code='edX',
+                                       unit_cost=order.total_excl_tax)
 
     def test_basket_attribute_update_with_existing_attribute(self):
         """ Verify existing BasketAttribute values are updated if a user is modifying an existing basket. """
@@ -188,39 +201,118 @@ class SailthruSignalTests(CouponMixin, CourseCatalogTestMixin, TestCase):
         seat, order = self._create_order(99)
         basket = order.basket
         self.request.COOKIES['sailthru_bid'] = campaign_id
-        process_basket_addition(None, request=self.request, user=self.user, product=seat, basket=basket)
+        self._process_basket_addition(request=self.request, user=self.user, product=seat, basket=basket)
         self.assertEqual(basket.basketattribute_set.get(attribute_type=self.basket_attribute_type).value_text,
                          campaign_id)
 
         # Call again to trigger another attempt to create an attribute
         campaign_id = 'attempt-2'
         self.request.COOKIES['sailthru_bid'] = campaign_id
-        process_basket_addition(None, request=self.request, user=self.user, product=seat, basket=basket)
+        self._process_basket_addition(request=self.request, user=self.user, product=seat, basket=basket)
         self.assertEqual(basket.basketattribute_set.get(attribute_type=self.basket_attribute_type).value_text,
                          campaign_id)
 
-    @patch('ecommerce_worker.sailthru.v1.tasks.update_course_enrollment.delay')
-    def test_save_campaign_id_for_audit_enrollments(self, mock_update_course_enrollment):
+    @patch('ecommerce.sailthru.signals.group')
+    def test_save_campaign_id_for_audit_enrollments(self, mock_group):
         """ Verify the Sailthru campaign ID is saved as a basket attribute for audit enrollments. """
 
         seat, order = self._create_order(0, 'audit')
-        process_basket_addition(None, request=self.request,
-                                user=self.user,
-                                product=seat, basket=order.basket)
-        self.assertFalse(mock_update_course_enrollment.called)
+        self._process_basket_addition(request=self.request,
+                                      user=self.user,
+                                      product=seat, basket=order.basket)
+        self.assertFalse(mock_group.called)
 
         # now call checkout_complete with the same basket to see if campaign id saved and restored
         process_checkout_complete(None, order=order, request=None)
-        self.assertTrue(mock_update_course_enrollment.called)
-        mock_update_course_enrollment.assert_called_with(TEST_EMAIL,
-                                                         self.course_url,
-                                                         False,
-                                                         seat.attr.certificate_type,
-                                                         course_id=self.course_id,
-                                                         currency=order.currency,
-                                                         message_id=CAMPAIGN_COOKIE,
-                                                         site_code='edX',
-                                                         unit_cost=order.total_excl_tax)
+        self.assertTrue(mock_group.called)
+        self.assert_enrollment_updated(mock_group, TEST_EMAIL,
+                                       self.course_url,
+                                       False,
+                                       seat.attr.certificate_type,
+                                       course_id=self.course_id,
+                                       currency=order.currency,
+                                       message_id=CAMPAIGN_COOKIE,
+                                       site_code='edX',
+                                       unit_cost=order.total_excl_tax)
+
+    @patch('ecommerce.sailthru.signals.group')
+    def test_basket_additions_sent_together(self, mock_group):
+        """ Verify the notifications of all products added to a basket during a request are sent together,
+        once the request has finished, and the campaign ID is only saved once. """
+        seat, order = self._create_order(99)
+        other_course = Course.objects.create(id='edX/other/2012_Fall', name='Other Course')
+        other_seat = other_course.create_or_update_seat('verified', False, 50, self.partner, None)
+
+        request_started.send(sender=self.__class__)
+        update_or_create = BasketAttribute.objects.update_or_create
+        with patch.object(BasketAttribute.objects, 'update_or_create', wraps=update_or_create) as mock_update:
+            for product in (seat, other_seat):
+                process_basket_addition(None, request=self.request, user=self.user, product=product,
+                                        basket=order.basket)
+            self.assertEqual(mock_update.call_count, 1)
+        self.assertFalse(mock_group.called)
+
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(mock_group.call_count, 1)
+        self.assertEqual(
+            [notification.kwargs['course_id'] for notification in mock_group.call_args[0][0]],
+            [self.course_id, other_course.id]
+        )
+
+        # Nothing is left to be sent by later requests.
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(mock_group.call_count, 1)
+
+    @patch('ecommerce.sailthru.signals.group')
+    def test_process_checkout_complete_multiple_lines(self, mock_group):
+        """ Verify the notifications for all lines of an order are sent together. """
+        other_course = Course.objects.create(id='edX/other/2012_Fall', name='Other Course')
+        seats = [
+            self.course.create_or_update_seat('verified', False, 99, self.partner, None),
+            other_course.create_or_update_seat('verified', False, 50, self.partner, None),
+        ]
+        basket = BasketFactory()
+        for seat in seats:
+            basket.add_product(seat, 1)
+        order = create_order(number=1, basket=basket, user=self.user)
+
+        process_checkout_complete(None, order=order, request=self.request)
+        self.assertEqual(mock_group.call_count, 1)
+        self.assertEqual(
+            sorted(notification.kwargs['course_id'] for notification in mock_group.call_args[0][0]),
+            sorted([self.course_id, other_course.id])
+        )
+
+    @patch('ecommerce.sailthru.signals.group')
+    def test_basket_addition_outside_request(self, mock_group):
+        """ Verify basket additions made outside of a request, e.g. by a Celery task, are sent immediately. """
+        seat, order = self._create_order(99)
+        process_basket_addition(None, request=self.request, user=self.user, product=seat, basket=order.basket)
+        self.assertEqual(mock_group.call_count, 1)
+        self.assertEqual(mock_group.call_args[0][0][0].kwargs['course_id'], self.course_id)
+
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(mock_group.call_count, 1)
+
+    def test_get_basket_attribute_type_id(self):
+        """ Verify the campaign ID attribute type is retrieved once, and again after it has been modified. """
+        self.assertEqual(get_basket_attribute_type_id(), self.basket_attribute_type.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_basket_attribute_type_id(), self.basket_attribute_type.id)
+
+        self.basket_attribute_type.delete()
+        basket_attribute_type = BasketAttributeType.objects.create(name=SAILTHRU_CAMPAIGN)
+        self.assertEqual(get_basket_attribute_type_id(), basket_attribute_type.id)
+
+    def assert_enrollment_updated(self, mock_group, *args, **kwargs):
+        """ Verify a single course enrollment update, with the given arguments, was last sent to Sailthru. """
+        mock_group.assert_called_with([update_course_enrollment.s(*args, **kwargs)])
+
+    def _process_basket_addition(self, **kwargs):
+        """ Call the basket_addition receiver within a request, and finish the request to send its notifications. """
+        request_started.send(sender=self.__class__)
+        process_basket_addition(None, **kwargs)
+        request_finished.send(sender=self.__class__)
 
     def _create_order(self, price, mode='verified'):
         seat = self.course.create_or_update_seat(mode, False, price, self.partner, None)
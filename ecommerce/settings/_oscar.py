@@ -163,6 +163,9 @@ OSCAR_REFUND_LINE_STATUS_PIPELINE = {
     REFUND_LINE.DENIED: (),
     REFUND_LINE.COMPLETE: ()
 }
+
+# Maximum number of credits issued concurrently when refunds are approved in bulk.
+REFUND_CREDIT_CONCURRENCY = 4
 # END REFUND PROCESSING
 
 # DASHBOARD NAVIGATION MENU
@@ -57,6 +57,16 @@ DATABASES = {
         'ATOMIC_REQUESTS': True,
     }
 }
+
+# Aliases, in DATABASES, of read replicas of the default database. Read-only views, reports and commands
+# that declare it read from a replica chosen at random. Replicas SHOULD NOT set ATOMIC_REQUESTS.
+READ_REPLICAS = []
+DATABASE_ROUTERS = ['ecommerce.core.routers.ReadReplicaRouter']
+
+# Reads stay on the default database for this long after a user's request writes, so that users
+# never read stale copies of their own writes from a replica.
+READ_REPLICA_PIN_TIMEOUT = 15  # Value is in seconds.
+READ_REPLICA_PIN_COOKIE_NAME = 'ecommerce_read_replica_pin'
 # END DATABASE CONFIGURATION
 
 
@@ -203,12 +213,19 @@ TEMPLATES = [
 # MIDDLEWARE CONFIGURATION
 # See: https://docs.djangoproject.com/en/dev/ref/settings/#middleware-classes
 MIDDLEWARE_CLASSES = (
+    # NOTE: PerformanceInstrumentationMiddleware measures the work done by all middleware listed after it.
+    'ecommerce.core.middleware.PerformanceInstrumentationMiddleware',
+    # NOTE: ReadReplicaMiddleware MUST appear BEFORE SessionMiddleware, so that it detects session writes.
+    'ecommerce.core.middleware.ReadReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.locale.LocaleMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    # NOTE: SiteConfigurationCacheMiddleware clears stale cached sites. It MUST appear BEFORE
+    # CurrentSiteWithDefaultMiddleware, which retrieves the current site from that cache.
+    'ecommerce.core.middleware.SiteConfigurationCacheMiddleware',
     'django_sites_extensions.middleware.CurrentSiteWithDefaultMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'waffle.middleware.WaffleMiddleware',
@@ -238,10 +255,47 @@ COURSES_API_CACHE_TIMEOUT = 3600  # Value is in seconds
 # PROVIDER DATA PROCESSING
 PROVIDER_DATA_PROCESSING_TIMEOUT = 15  # Value is in seconds.
 CREDIT_PROVIDER_CACHE_TIMEOUT = 600
+
+# Eligibility for credit is cached briefly per user and course, so that reloading the credit
+# checkout page does not query LMS again.
+CREDIT_ELIGIBILITY_CACHE_TIMEOUT = 60  # Value is in seconds.
 # END URL CONFIGURATION
 
 VOUCHER_CACHE_TIMEOUT = 10  # Value is in seconds.
 
+# Cache the ID verification status of users retrieved from LMS. Verified users are cached until their
+# verification expires, for at most VERIFIED_STATUS_CACHE_TIMEOUT. The status of users who have not verified
+# is cached for a shorter time, since it changes once they submit a verification.
+VERIFIED_STATUS_CACHE_TIMEOUT = 24 * 60 * 60  # Value is in seconds.
+UNVERIFIED_STATUS_CACHE_TIMEOUT = 5 * 60  # Value is in seconds.
+
+# Cache the ID of each signed-in user's open basket. Stale IDs, such as those of submitted
+# baskets, are detected when the basket is retrieved.
+OPEN_BASKET_ID_CACHE_TIMEOUT = 3600  # Value is in seconds.
+
+# Interval at which each process checks whether the sites and site configurations it holds in memory
+# have been modified by another process.
+SITE_CONFIGURATION_CACHE_CHECK_INTERVAL = 5  # Value is in seconds.
+
+# Interval at which each process checks whether the product classes it holds in memory have been modified
+# by another process.
+PRODUCT_CLASS_CACHE_CHECK_INTERVAL = 5  # Value is in seconds.
+
+# Measure the queries, outbound HTTP requests and cache lookups made to serve each request, and log them.
+PERFORMANCE_INSTRUMENTATION_ENABLED = False
+# Return the measurements in X-Perf-* response headers. This should not be enabled in production.
+PERFORMANCE_INSTRUMENTATION_HEADERS = False
+
+# Site access tokens are refreshed in the background once they are this close to expiring. The
+# refresh_access_tokens command should be scheduled to run more frequently than this.
+OAUTH2_ACCESS_TOKEN_REFRESH_MARGIN = 300  # Value is in seconds.
+# Maximum time a single process is allowed to spend refreshing a site's access token before another may try.
+OAUTH2_ACCESS_TOKEN_REFRESH_LOCK_TIMEOUT = 60  # Value is in seconds.
+
+# Number of courses processed by each invocation of the command run by a background course job. Jobs
+# can only be cancelled between invocations.
+COURSE_JOB_BATCH_SIZE = 10
+
 # APP CONFIGURATION
 DJANGO_APPS = [
     'django.contrib.admin',
@@ -488,10 +542,13 @@ BROKER_HEARTBEAT_CHECKRATE = 2
 # See http://celery.readthedocs.org/en/latest/configuration.html#celery-imports.
 CELERY_IMPORTS = (
     'ecommerce_worker.fulfillment.v1.tasks',
+    'ecommerce.courses.tasks',
 )
 
+# Course jobs are run by workers of this service, which should consume the course_jobs queue.
 CELERY_ROUTES = {'ecommerce_worker.fulfillment.v1.tasks.fulfill_order': {'queue': 'fulfillment'},
-                 'ecommerce_worker.sailthru.v1.tasks.update_course_enrollment': {'queue': 'email_marketing'}}
+                 'ecommerce_worker.sailthru.v1.tasks.update_course_enrollment': {'queue': 'email_marketing'},
+                 'ecommerce.courses.tasks.run_course_job': {'queue': 'course_jobs'}}
 
 # Prevent Celery from removing handlers on the root logger. Allows setting custom logging handlers.
 # See http://celery.readthedocs.org/en/latest/configuration.html#celeryd-hijack-root-logger.
@@ -62,6 +62,12 @@ INTERNAL_IPS = ('127.0.0.1',)
 # END TOOLBAR CONFIGURATION
 
 
+# PERFORMANCE INSTRUMENTATION
+PERFORMANCE_INSTRUMENTATION_ENABLED = True
+PERFORMANCE_INSTRUMENTATION_HEADERS = True
+# END PERFORMANCE INSTRUMENTATION
+
+
 # AUTHENTICATION
 JWT_AUTH.update({
     'JWT_SECRET_KEY': 'insecure-secret-key',
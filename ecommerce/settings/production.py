@@ -80,3 +80,15 @@ for __, configs in PAYMENT_PROCESSOR_CONFIG.iteritems():
             'error_path': PAYMENT_PROCESSOR_ERROR_PATH,
         })
 # END PAYMENT PROCESSOR OVERRIDES
+
+
+# CELERY
+# Course jobs, submitted from the course admin tool, are routed to the course_jobs queue (see CELERY_ROUTES
+# in base.py). That queue is not consumed by the ecommerce-worker service: deployments must run a worker of
+# this service for it, e.g.
+#
+#   celery worker --app=ecommerce.celery_app:app --queues=course_jobs
+#
+# CELERY_ROUTES read from the configuration file replace those in base.py, so must also route
+# ecommerce.courses.tasks.run_course_job to the course_jobs queue.
+# END CELERY
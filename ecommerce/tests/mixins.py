@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """Broadly-useful mixins for use in automated tests."""
+from contextlib import contextmanager
 import datetime
 import json
 from decimal import Decimal
@@ -19,6 +20,7 @@ from oscar.test import factories
 from social.apps.django_app.default.models import UserSocialAuth
 from threadlocals.threadlocals import set_thread_variable
 
+from ecommerce.core import performance
 from ecommerce.core.url_utils import get_lms_url
 from ecommerce.courses.utils import mode_for_seat
 from ecommerce.extensions.fulfillment.signals import SHIPPING_EVENT_NAME
@@ -292,6 +294,39 @@ class TestServerUrlMixin(object):
         return 'http://{domain}{path}'.format(domain=site.domain, path=path)
 
 
+class PerformanceBudgetMixin(object):
+    """ Mixin for asserting that code stays within a budget of queries, outbound HTTP requests and cache misses. """
+
+    @contextmanager
+    def assert_performance_budget(self, queries=None, duplicate_queries=None, http_calls=None, cache_misses=None):
+        """
+        Asserts that the block does not exceed any of the given maximums. Limits set to None are not checked.
+
+        Yields:
+            RequestMetrics: The metrics collected for the block.
+        """
+        with performance.instrument() as metrics:
+            yield metrics
+
+        budget = (
+            ('queries', queries),
+            ('duplicate_queries', duplicate_queries),
+            ('http_calls', http_calls),
+            ('cache_misses', cache_misses),
+        )
+        exceeded = [
+            '{name}: {actual} > {limit}'.format(name=name, actual=getattr(metrics, name), limit=limit)
+            for name, limit in budget if limit is not None and getattr(metrics, name) > limit
+        ]
+        if exceeded:
+            duplicates = '\n'.join(
+                '{count}x {sql}'.format(count=count, sql=sql) for sql, count in metrics.duplicated_sql.items()
+            )
+            self.fail('Performance budget exceeded ({exceeded}).\nDuplicate queries:\n{duplicates}'.format(
+                exceeded=', '.join(exceeded), duplicates=duplicates or 'None'
+            ))
+
+
 class ApiMockMixin(object):
     """ Common Mocks for the API responses. """
 